@@ -0,0 +1,136 @@
+"""
+Microbenchmarks do intérprete (`capivara bench`): um conjunto fixo de
+kernels gerados em processo, com warmup e repetições. Reporta bytecodes/s,
+chamadas/s e tempo de parede por kernel, e um score único (média geométrica
+dos bytecodes/s) para comparar builds da VM.
+"""
+from __future__ import annotations
+import math
+import os
+import platform
+import tempfile
+from typing import Callable, Dict, List, Optional
+
+from capivara import __version__
+from capivara.bench import workloads as W
+from capivara.bench.timing import timings, summarize
+from capivara.loader.loader import ClassLoader
+from capivara.interp.loop import Interpreter
+from capivara.interp.counting import CostModel
+
+def _fib_n(scale: float) -> int:
+    # custo de fib cresce ~phi^n: escala o n pelo log
+    return max(2, 17 + round(math.log(scale, (1 + 5 ** 0.5) / 2)))
+
+# nome -> fábrica(scale) (None: kernel ainda não suportado pelo intérprete)
+KERNELS: Dict[str, Optional[Callable[[float], W.Workload]]] = {
+    "int_loop":         lambda s: W.hot_loop(int(50_000 * s)),
+    "static_calls":     lambda s: W.call_chain(depth=8, n=int(2_000 * s)),
+    "recursive_calls":  lambda s: W.recursive_fib(_fib_n(s)),
+    "virtual_dispatch": lambda s: W.virtual_dispatch(int(10_000 * s)),
+    "field_rw":         lambda s: W.field_access(int(10_000 * s)),
+    "allocation":       lambda s: W.alloc_storm(int(10_000 * s)),
+    "synchronized":     lambda s: W.synchronized_access(int(5_000 * s)),
+    "array_scan":       lambda s: W.array_scan(int(20_000 * s)),
+}
+
+def run_kernel(w: W.Workload, classpath: str, warmup: int, repeat: int) -> Dict:
+    W.write_classes(w, classpath)
+    interp = Interpreter(ClassLoader([classpath]))
+
+    def once() -> None:
+        res = interp.execute_static_entry(w.name, w.entry, w.desc)
+        if res.int_value != w.expected:
+            raise RuntimeError(f"{w.name}: resultado {res.int_value}, esperado {w.expected}")
+
+    samples = timings(once, repeat, warmup=warmup)
+    st = summarize(samples)
+    med = st["median_s"]
+    return {
+        **st,
+        "samples_s": samples,
+        "bytecodes": w.bytecodes,
+        "calls": w.calls,
+        "bytecodes_per_sec": w.bytecodes / med if med else 0.0,
+        "calls_per_sec": w.calls / med if med else 0.0,
+    }
+
+def count_kernel(w: W.Workload, classpath: str, cost_model: Optional[CostModel] = None) -> Dict:
+    """Uma execução em modo de contagem: custo determinístico (independe da máquina)."""
+    W.write_classes(w, classpath)
+    interp = Interpreter(ClassLoader([classpath]))
+    counters = interp.enable_counting()
+    res = interp.execute_static_entry(w.name, w.entry, w.desc)
+    interp.disable_counting()
+    if res.int_value != w.expected:
+        raise RuntimeError(f"{w.name}: resultado {res.int_value}, esperado {w.expected}")
+    rep = counters.report(cost_model)
+    return {k: rep[k] for k in ("cost", "bytecodes", "invocations", "allocations", "class_loads")}
+
+def count_kernels(names: Optional[List[str]] = None, scale: float = 1.0,
+                  cost_model: Optional[CostModel] = None) -> Dict:
+    names = names or list(KERNELS)
+    results: List[Dict] = []
+    with tempfile.TemporaryDirectory(prefix="capivara-bench-") as tmp:
+        for name in names:
+            factory = KERNELS[name]
+            if factory is None:
+                results.append({"kernel": name, "skipped": "não suportado pelo intérprete"})
+                continue
+            results.append({"kernel": name, **count_kernel(factory(scale), os.path.join(tmp, name), cost_model)})
+    return {
+        "suite": "interp-count",
+        "capivara_version": __version__,
+        "scale": scale,
+        "total_cost": sum(r.get("cost", 0) for r in results),
+        "results": results,
+    }
+
+def run_kernels(names: Optional[List[str]] = None, warmup: int = 1, repeat: int = 5,
+                scale: float = 1.0) -> Dict:
+    names = names or list(KERNELS)
+    results: List[Dict] = []
+    with tempfile.TemporaryDirectory(prefix="capivara-bench-") as tmp:
+        for name in names:
+            factory = KERNELS[name]
+            if factory is None:
+                results.append({"kernel": name, "skipped": "não suportado pelo intérprete"})
+                continue
+            r = run_kernel(factory(scale), os.path.join(tmp, name), warmup, repeat)
+            results.append({"kernel": name, **r})
+    rates = [r["bytecodes_per_sec"] for r in results if r.get("bytecodes_per_sec")]
+    score = math.exp(sum(math.log(x) for x in rates) / len(rates)) if rates else 0.0
+    return {
+        "suite": "interp",
+        "capivara_version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "warmup": warmup,
+        "repeat": repeat,
+        "scale": scale,
+        "score_bytecodes_per_sec": score,
+        "results": results,
+    }
+
+def format_text(report: Dict) -> str:
+    if report["suite"] == "interp-count":
+        return format_counts_text(report)
+    lines = [f"{'kernel':<17} {'bytecodes/s':>13} {'chamadas/s':>12} {'mediana(s)':>11} {'melhor(s)':>10}"]
+    for r in report["results"]:
+        if "skipped" in r:
+            lines.append(f"{r['kernel']:<17} (pulado: {r['skipped']})")
+            continue
+        lines.append(f"{r['kernel']:<17} {r['bytecodes_per_sec']:>13,.0f} {r['calls_per_sec']:>12,.0f} "
+                     f"{r['median_s']:>11.4f} {r['best_s']:>10.4f}")
+    lines.append(f"score (média geométrica, bytecodes/s): {report['score_bytecodes_per_sec']:,.0f}")
+    return "\n".join(lines)
+
+def format_counts_text(report: Dict) -> str:
+    lines = [f"{'kernel':<17} {'custo':>12} {'bytecodes':>12} {'invocações':>11} {'alocações':>10}"]
+    for r in report["results"]:
+        if "skipped" in r:
+            lines.append(f"{r['kernel']:<17} (pulado: {r['skipped']})")
+            continue
+        lines.append(f"{r['kernel']:<17} {r['cost']:>12,} {r['bytecodes']:>12,} {r['invocations']:>11,} {r['allocations']:>10,}")
+    lines.append(f"custo total: {report['total_cost']:,}")
+    return "\n".join(lines)
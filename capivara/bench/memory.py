@@ -0,0 +1,88 @@
+"""
+Benchmark de memória do modelo de classfile (tracemalloc).
+
+Lê .class de diretórios/arquivos, faz o parse de N cópias de cada um e mede
+quanto fica retido enquanto os ClassFile estão vivos — o custo de manter
+milhares de classes carregadas numa VM de longa duração.
+
+Uso: python -m capivara.bench.memory DIR_OU_CLASS... [--copies N] [--lazy] [--json]
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from typing import Dict, List
+
+from capivara.classfile.reader import read_classfile
+
+def collect_class_bytes(paths: List[str]) -> List[bytes]:
+    out: List[bytes] = []
+    for p in paths:
+        if os.path.isdir(p):
+            for root, _, files in os.walk(p):
+                for fn in sorted(files):
+                    if fn.endswith(".class"):
+                        with open(os.path.join(root, fn), "rb") as f:
+                            out.append(f.read())
+        elif p.endswith(".class"):
+            with open(p, "rb") as f:
+                out.append(f.read())
+    return out
+
+def measure_classfiles(blobs: List[bytes], copies: int = 1, lazy: bool = False) -> Dict[str, float]:
+    """
+    Memória retida pelos ClassFile parseados (os buffers de entrada não contam:
+    já existiam antes do snapshot inicial). Em modo lazy os ClassFile
+    referenciam os buffers, que por isso não aparecem como custo extra.
+    """
+    gc.collect()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        keep = [read_classfile(b, lazy=lazy) for _ in range(copies) for b in blobs]
+        gc.collect()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    n = len(keep)
+    del keep
+    retained = after - before
+    return {
+        "classes": n,
+        "input_bytes": sum(len(b) for b in blobs) * copies,
+        "retained_bytes": retained,
+        "peak_bytes": peak - before,
+        "bytes_per_class": retained / n if n else 0.0,
+    }
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="capivara.bench.memory", description=__doc__.strip().splitlines()[0])
+    ap.add_argument("paths", nargs="+", help="Diretórios ou arquivos .class.")
+    ap.add_argument("--copies", type=int, default=100, help="Cópias parseadas de cada classe (default 100).")
+    ap.add_argument("--lazy", action="store_true", help="Usa read_classfile(lazy=True).")
+    ap.add_argument("--json", action="store_true", help="Saída JSON.")
+    args = ap.parse_args(argv)
+
+    blobs = collect_class_bytes(args.paths)
+    if not blobs:
+        sys.stderr.write("[capivara] ERRO: nenhum .class encontrado\n")
+        return 66
+    res = measure_classfiles(blobs, copies=args.copies, lazy=args.lazy)
+    res["lazy"] = args.lazy
+    if args.json:
+        print(json.dumps(res, sort_keys=True))
+    else:
+        print(f"classes={res['classes']} entrada={res['input_bytes']}B "
+              f"retido={res['retained_bytes']}B pico={res['peak_bytes']}B "
+              f"por_classe={res['bytes_per_class']:.0f}B")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
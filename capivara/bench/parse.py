@@ -0,0 +1,130 @@
+"""
+Benchmark de throughput do carregamento de classes (classes/s e MB/s).
+
+Estágios medidos sobre classfiles sintéticos (ver `synth`):
+- parse       read_classfile(data)
+- parse_lazy  read_classfile(data, lazy=True)
+- link        RuntimeClass(...).link() sobre um ClassFile já parseado
+- load        ClassLoader.load_class (leitura do disco + parse + link)
+
+Uso: python -m capivara.bench.parse [--profile NOME ...] [--classes N] [--repeat R] [--json]
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from capivara import __version__
+from capivara.bench.synth import PROFILES, synthetic_class
+from capivara.bench.timing import timings, summarize
+from capivara.classfile.reader import read_classfile
+from capivara.loader.loader import ClassLoader
+from capivara.runtime.klass import RuntimeClass, _cp_class_name
+
+STAGES = ("parse", "parse_lazy", "link", "load")
+
+def _fresh_classes(cfs) -> List[RuntimeClass]:
+    out = []
+    for cf in cfs:
+        cp = cf.constant_pool
+        out.append(RuntimeClass(name=_cp_class_name(cp, cf.this_class), super_name="java/lang/Object", cf=cf))
+    return out
+
+def bench_profile(profile_name: str, classes: int, repeat: int, workdir: str) -> List[Dict]:
+    p = PROFILES[profile_name]
+    names = [f"bench/{profile_name}/C{i}" for i in range(classes)]
+    blobs = [synthetic_class(n, p) for n in names]
+    total = sum(len(b) for b in blobs)
+
+    cp_dir = os.path.join(workdir, profile_name)
+    for n, b in zip(names, blobs):
+        path = os.path.join(cp_dir, n + ".class")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b)
+
+    def run_parse():
+        for b in blobs:
+            read_classfile(b)
+
+    def run_parse_lazy():
+        for b in blobs:
+            read_classfile(b, lazy=True)
+
+    def run_load():
+        ld = ClassLoader([cp_dir])
+        for n in names:
+            ld.load_class(n)
+
+    # link precisa de RuntimeClass novos a cada repetição (link é idempotente)
+    link_times: List[float] = []
+    for _ in range(repeat):
+        rcs = _fresh_classes([read_classfile(b) for b in blobs])
+        t0 = time.perf_counter()
+        for rc in rcs:
+            rc.link()
+        link_times.append(time.perf_counter() - t0)
+
+    times = {
+        "parse": timings(run_parse, repeat),
+        "parse_lazy": timings(run_parse_lazy, repeat),
+        "link": link_times,
+        "load": timings(run_load, repeat),
+    }
+    out = []
+    for stage in STAGES:
+        st = summarize(times[stage])
+        best = st["best_s"]
+        out.append({
+            "profile": profile_name,
+            "stage": stage,
+            "classes": classes,
+            "bytes": total,
+            "best_s": best,
+            "median_s": st["median_s"],
+            "classes_per_sec": classes / best if best else 0.0,
+            "mb_per_sec": total / best / 1e6 if best else 0.0,
+        })
+    return out
+
+def run_suite(profiles: List[str], classes: int = 20, repeat: int = 5) -> Dict:
+    with tempfile.TemporaryDirectory(prefix="capivara-bench-") as tmp:
+        results: List[Dict] = []
+        for name in profiles:
+            results.extend(bench_profile(name, classes, repeat, tmp))
+    return {
+        "suite": "parse",
+        "capivara_version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "classes": classes,
+        "repeat": repeat,
+        "results": results,
+    }
+
+def format_text(report: Dict) -> str:
+    lines = [f"{'perfil':<14} {'estágio':<11} {'classes/s':>12} {'MB/s':>9} {'melhor(s)':>10}"]
+    for r in report["results"]:
+        lines.append(f"{r['profile']:<14} {r['stage']:<11} {r['classes_per_sec']:>12.1f} "
+                     f"{r['mb_per_sec']:>9.2f} {r['best_s']:>10.4f}")
+    return "\n".join(lines)
+
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="capivara.bench.parse", description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--profile", action="append", choices=sorted(PROFILES), help="Perfil (repetível; default: todos).")
+    ap.add_argument("--classes", type=int, default=20, help="Classes geradas por perfil (default 20).")
+    ap.add_argument("--repeat", type=int, default=5, help="Repetições por estágio (default 5).")
+    ap.add_argument("--json", action="store_true", help="Relatório JSON (uma linha).")
+    args = ap.parse_args(argv)
+
+    report = run_suite(args.profile or list(PROFILES), classes=args.classes, repeat=args.repeat)
+    print(json.dumps(report, sort_keys=True) if args.json else format_text(report))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
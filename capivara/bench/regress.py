@@ -0,0 +1,123 @@
+"""
+Histórico de benchmarks e detecção de regressões.
+
+O histórico é um arquivo JSON lines; cada linha é uma execução do
+`capivara bench`, identificada pela revisão git:
+
+    {"rev": "abc1234", "timestamp": 1700000000.0, "suite": "interp",
+     "kernels": {"int_loop": {"samples_s": [...], "bytecodes": N}, ...}}
+
+A comparação com a baseline usa todas as amostras das execuções da mesma
+revisão (média, IC 95% e teste t de Welch; ver `stats`). Na suíte de
+contagem (`bench --count`) cada kernel grava o custo determinístico, e a
+comparação é direta, sem estatística.
+"""
+from __future__ import annotations
+import json
+import os
+import subprocess
+import time
+from typing import Dict, List, Optional
+
+from capivara.bench.stats import compare_samples
+
+def git_revision(cwd: Optional[str] = None) -> str:
+    """`git rev-parse --short HEAD` (+ sufixo `-dirty`), ou "unknown"."""
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=cwd,
+                             capture_output=True, text=True, timeout=10)
+        if rev.returncode != 0:
+            return "unknown"
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=cwd,
+                               capture_output=True, text=True, timeout=10)
+        return rev.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+def make_entry(report: Dict, rev: str) -> Dict:
+    kernels = {}
+    for r in report["results"]:
+        if "samples_s" in r:
+            kernels[r["kernel"]] = {"samples_s": r["samples_s"], "bytecodes": r.get("bytecodes")}
+        elif "cost" in r:
+            kernels[r["kernel"]] = {"cost": r["cost"], "bytecodes": r["bytecodes"]}
+    return {"rev": rev, "timestamp": time.time(), "suite": report["suite"],
+            "scale": report.get("scale"), "kernels": kernels}
+
+def append_history(path: str, entry: Dict) -> None:
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+def load_history(path: str) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    out: List[Dict] = []
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                out.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{n}: linha de histórico inválida: {e}") from e
+    return out
+
+def baseline_samples(history: List[Dict], rev: str, suite: str = "interp",
+                     scale: Optional[float] = None) -> Optional[Dict[str, List[float]]]:
+    """
+    Junta as amostras por kernel das entradas com revisão `rev` ("last":
+    revisão da entrada mais recente). Só considera entradas da mesma suíte
+    e, se informada, da mesma escala (tempos de escalas diferentes não são
+    comparáveis). None se não houver entrada.
+    """
+    entries = [e for e in history
+               if e.get("suite") == suite and (scale is None or e.get("scale") == scale)]
+    if not entries:
+        return None
+    if rev == "last":
+        rev = entries[-1]["rev"]
+    pooled: Dict[str, List[float]] = {}
+    found = False
+    for e in entries:
+        if e["rev"] != rev:
+            continue
+        found = True
+        for name, k in e["kernels"].items():
+            pooled.setdefault(name, []).extend(k["samples_s"] if "samples_s" in k else [k["cost"]])
+    return pooled if found else None
+
+def compare_costs(base: float, new: float, threshold: float) -> Dict:
+    """Custos determinísticos: qualquer variação acima do limiar conta."""
+    rel = (new - base) / base if base else 0.0
+    verdict = "regression" if rel > threshold else "improvement" if rel < -threshold else "unchanged"
+    return {"base_cost": base, "new_cost": new, "rel_change": rel, "verdict": verdict}
+
+def compare_report(report: Dict, baseline: Dict[str, List[float]],
+                   threshold: float, alpha: float) -> List[Dict]:
+    """Compara cada kernel do relatório com a baseline (kernels ausentes são ignorados)."""
+    out: List[Dict] = []
+    for r in report["results"]:
+        base = baseline.get(r["kernel"])
+        if "cost" in r and base:
+            out.append({"kernel": r["kernel"], **compare_costs(base[-1], r["cost"], threshold)})
+            continue
+        if "samples_s" not in r or not base or len(base) < 2 or len(r["samples_s"]) < 2:
+            continue
+        out.append({"kernel": r["kernel"], **compare_samples(base, r["samples_s"], threshold, alpha)})
+    return out
+
+def format_comparison(rows: List[Dict], baseline_rev: str) -> str:
+    lines = [f"comparação com a baseline {baseline_rev}:",
+             f"{'kernel':<17} {'Δ':>8} {'IC 95%':>18} {'p':>8}  veredito"]
+    for c in rows:
+        if "p_value" not in c:
+            lines.append(f"{c['kernel']:<17} {c['rel_change']:>+8.1%} {'(exato)':>18} {'-':>8}  {c['verdict']}")
+            continue
+        lo, hi = c["rel_change_ci"]
+        lines.append(f"{c['kernel']:<17} {c['rel_change']:>+8.1%} {f'[{lo:+.1%}, {hi:+.1%}]':>18} "
+                     f"{c['p_value']:>8.3g}  {c['verdict']}")
+    return "\n".join(lines)
@@ -0,0 +1,69 @@
+"""
+Benchmark de startup da CLI (`capivara bench --startup`): cada amostra é um
+processo Python novo executando `python -m capivara.cli ...`, medido do
+spawn ao exit. Cobre os comandos baratos (--version, --help) e um `run`
+mínimo (carga da main class + poucos bytecodes), que é o caso dos pipelines
+de shell que disparam a VM milhares de vezes.
+"""
+from __future__ import annotations
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from typing import Callable, Dict, List, Optional
+
+import capivara
+from capivara import __version__
+from capivara.bench import workloads as W
+from capivara.bench.timing import timings, summarize
+
+# raiz que contém o pacote: os processos filhos importam este mesmo capivara
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(capivara.__file__)))
+
+# nome -> argv da CLI (recebe o workload mínimo e o diretório com as classes dele)
+KERNELS: Dict[str, Callable[[W.Workload, str], List[str]]] = {
+    "cli_version": lambda w, cp: ["--version"],
+    "cli_help":    lambda w, cp: ["--help"],
+    "run_entry":   lambda w, cp: ["run", w.name, "--cp", cp, "--entry", w.entry, "--desc", w.desc,
+                                  "--log", "WARNING"],
+}
+
+def run_kernel(argv: List[str], warmup: int, repeat: int) -> Dict:
+    cmd = [sys.executable, "-m", "capivara.cli", *argv]
+
+    def once() -> None:
+        r = subprocess.run(cmd, cwd=_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if r.returncode != 0:
+            raise RuntimeError(f"{' '.join(argv)}: saiu com {r.returncode}: {r.stderr.decode(errors='replace')}")
+
+    samples = timings(once, repeat, warmup=warmup)
+    return {**summarize(samples), "samples_s": samples, "argv": argv}
+
+def run_kernels(names: Optional[List[str]] = None, warmup: int = 1, repeat: int = 5,
+                scale: float = 1.0) -> Dict:
+    """`scale` não altera o startup; é só registrado (o histórico de regressões filtra por ele)."""
+    names = names or list(KERNELS)
+    results: List[Dict] = []
+    with tempfile.TemporaryDirectory(prefix="capivara-startup-") as tmp:
+        w = W.hot_loop(10)
+        W.write_classes(w, tmp)
+        for name in names:
+            results.append({"kernel": name, **run_kernel(KERNELS[name](w, tmp), warmup, repeat)})
+    return {
+        "suite": "startup",
+        "capivara_version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "warmup": warmup,
+        "repeat": repeat,
+        "scale": scale,
+        "results": results,
+    }
+
+def format_text(report: Dict) -> str:
+    lines = [f"{'comando':<17} {'mediana(ms)':>12} {'melhor(ms)':>11} {'desvio(ms)':>11}"]
+    for r in report["results"]:
+        lines.append(f"{r['kernel']:<17} {r['median_s'] * 1e3:>12.1f} {r['best_s'] * 1e3:>11.1f} "
+                     f"{r['stdev_s'] * 1e3:>11.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,118 @@
+"""
+Estatística mínima para comparar amostras de benchmark (sem dependências):
+intervalo de confiança da média (t de Student) e teste t de Welch.
+"""
+from __future__ import annotations
+import math
+import statistics
+from typing import Dict, List, Tuple
+
+def _betacf(a: float, b: float, x: float) -> float:
+    # fração contínua da beta incompleta (Lentz modificado)
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = 1.0
+    d = 1.0 - qab * x / qap
+    d = tiny if abs(d) < tiny else d
+    d = 1.0 / d
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = tiny if abs(d) < tiny else d
+        c = 1.0 + aa / c
+        c = tiny if abs(c) < tiny else c
+        d = 1.0 / d
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = tiny if abs(d) < tiny else d
+        c = 1.0 + aa / c
+        c = tiny if abs(c) < tiny else c
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1e-12:
+            break
+    return h
+
+def betai(a: float, b: float, x: float) -> float:
+    """Função beta incompleta regularizada I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    lbt = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1.0 - x)
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(lbt) * _betacf(a, b, x) / a
+    return 1.0 - math.exp(lbt) * _betacf(b, a, 1.0 - x) / b
+
+def t_sf2(t: float, df: float) -> float:
+    """P(|T| >= |t|) para T ~ t de Student com `df` graus de liberdade."""
+    if math.isinf(t):
+        return 0.0
+    return betai(df / 2.0, 0.5, df / (df + t * t))
+
+def t_quantile(p: float, df: float) -> float:
+    """Quantil bilateral: t tal que P(|T| >= t) = 1 - p (ex.: p=0.95)."""
+    lo, hi = 0.0, 1e6
+    target = 1.0 - p
+    for _ in range(200):
+        mid = (lo + hi) / 2.0
+        if t_sf2(mid, df) > target:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2.0
+
+def mean_ci(xs: List[float], conf: float = 0.95) -> Tuple[float, float, float]:
+    """(média, limite inferior, limite superior)."""
+    m = statistics.fmean(xs)
+    if len(xs) < 2:
+        return m, m, m
+    half = t_quantile(conf, len(xs) - 1) * statistics.stdev(xs) / math.sqrt(len(xs))
+    return m, m - half, m + half
+
+def welch_t_test(a: List[float], b: List[float]) -> Tuple[float, float, float]:
+    """Teste t de Welch (variâncias diferentes): (t, graus de liberdade, p bilateral)."""
+    na, nb = len(a), len(b)
+    if na < 2 or nb < 2:
+        raise ValueError("teste t requer ao menos 2 amostras de cada lado")
+    ma, mb = statistics.fmean(a), statistics.fmean(b)
+    va, vb = statistics.variance(a) / na, statistics.variance(b) / nb
+    se2 = va + vb
+    if se2 == 0.0:
+        return (0.0 if ma == mb else math.copysign(math.inf, mb - ma)), float(na + nb - 2), (1.0 if ma == mb else 0.0)
+    t = (mb - ma) / math.sqrt(se2)
+    df = se2 * se2 / (va * va / (na - 1) + vb * vb / (nb - 1))
+    return t, df, t_sf2(t, df)
+
+def compare_samples(base: List[float], new: List[float], threshold: float = 0.05,
+                    alpha: float = 0.05, conf: float = 0.95) -> Dict:
+    """
+    Compara tempos (menor é melhor). Regressão = aumento relativo da média
+    acima de `threshold` E estatisticamente significativo (p < alpha).
+    """
+    t, df, p = welch_t_test(base, new)
+    mb, blo, bhi = mean_ci(base, conf)
+    mn, nlo, nhi = mean_ci(new, conf)
+    rel = (mn - mb) / mb if mb else 0.0
+    # IC do delta relativo (Welch): (Δ ± t*·se) / média da base
+    se = math.sqrt(statistics.variance(base) / len(base) + statistics.variance(new) / len(new))
+    half = t_quantile(conf, df) * se if se else 0.0
+    significant = p < alpha
+    if significant and rel > threshold:
+        verdict = "regression"
+    elif significant and rel < -threshold:
+        verdict = "improvement"
+    else:
+        verdict = "unchanged"
+    return {
+        "base_mean_s": mb, "base_ci": [blo, bhi], "base_n": len(base),
+        "new_mean_s": mn, "new_ci": [nlo, nhi], "new_n": len(new),
+        "rel_change": rel,
+        "rel_change_ci": [(mn - mb - half) / mb, (mn - mb + half) / mb] if mb else [0.0, 0.0],
+        "t": t, "df": df, "p_value": p,
+        "verdict": verdict,
+    }
@@ -0,0 +1,63 @@
+"""
+Classfiles sintéticos (major 52) gerados em processo, sem javac, para
+estressar o parser: CP enorme, milhares de métodos, Code longo, muitos
+atributos.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict
+
+from capivara.classfile.writer import ClassBuilder
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+@dataclass(frozen=True)
+class Profile:
+    name: str
+    cp_constants: int = 0     # Utf8/Integer/Long/String extras na CP
+    methods: int = 4
+    code_repeat: int = 4      # repetições do bloco de 7 bytes em cada Code
+    fields: int = 4
+    extra_attrs: int = 0      # atributos desconhecidos por método (+ na classe)
+
+PROFILES: Dict[str, Profile] = {
+    "typical":      Profile("typical", cp_constants=64, methods=16, code_repeat=8, fields=8, extra_attrs=0),
+    "huge_cp":      Profile("huge_cp", cp_constants=12000, methods=4, code_repeat=2, fields=4),
+    "many_methods": Profile("many_methods", methods=3000, code_repeat=2, fields=16),
+    "long_code":    Profile("long_code", methods=8, code_repeat=8000, fields=2),
+    "many_attrs":   Profile("many_attrs", methods=200, code_repeat=2, fields=4, extra_attrs=16),
+}
+
+def synthetic_class(name: str, p: Profile) -> bytes:
+    """Gera os bytes de um .class com a forma descrita pelo perfil `p`."""
+    cb = ClassBuilder(name)
+    cp = cb.cp
+    for i in range(p.cp_constants):
+        k = i % 4
+        if k == 0:
+            cp.utf8(f"{name}$const${i}")
+        elif k == 1:
+            cp.integer(i * 7919 - 10**6)
+        elif k == 2:
+            cp.long_(i * 10**12)
+        else:
+            cp.string(f"texto {i}")
+
+    for i in range(p.fields):
+        cb.add_field(f"F{i}", "I", FL.ACC_STATIC | FL.ACC_FINAL, constant_value=i)
+
+    extra = [(f"Bench{i}", b"\x00" * 8) for i in range(p.extra_attrs)]
+    for i in range(p.methods):
+        c = cb.code(max_stack=1, max_locals=1)
+        c.line(i + 1)
+        for _ in range(p.code_repeat):
+            # bloco de 7 bytes válido: iconst_1, istore_0, iinc 0 1, iload_0, pop
+            c.iconst(1).istore(0).iinc(0, 1).iload(0).op(OP.POP)
+        if i > 0:
+            # chama o método anterior (mais entradas Methodref na CP)
+            c.invokestatic(name, f"m{i - 1}", "()V")
+        c.op(OP.RETURN)
+        cb.add_method(f"m{i}", "()V", c, attributes=extra)
+    for a in extra:
+        cb.add_attribute(*a)
+    return cb.to_bytes()
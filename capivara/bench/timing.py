@@ -0,0 +1,23 @@
+from __future__ import annotations
+import statistics
+import time
+from typing import Callable, Dict, List
+
+def timings(fn: Callable[[], object], repeat: int, warmup: int = 0) -> List[float]:
+    """Executa `fn` warmup vezes (descartadas) e devolve `repeat` tempos de parede."""
+    for _ in range(warmup):
+        fn()
+    out: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return out
+
+def summarize(ts: List[float]) -> Dict[str, float]:
+    return {
+        "best_s": min(ts),
+        "median_s": statistics.median(ts),
+        "mean_s": statistics.fmean(ts),
+        "stdev_s": statistics.stdev(ts) if len(ts) > 1 else 0.0,
+    }
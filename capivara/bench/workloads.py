@@ -0,0 +1,257 @@
+"""
+Workloads de benchmark gerados com o ClassBuilder (sem javac): laços
+quentes, cadeias de chamadas, recursão, tempestades de alocação, despacho
+virtual, acesso a campos, locks e varredura de arrays. Cada workload expõe `static int run()`, o valor
+esperado e as contagens exatas de bytecodes executados e de invocações
+(frames), calculadas a partir do código gerado.
+"""
+from __future__ import annotations
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+from capivara.classfile.writer import ClassBuilder, CodeBuilder
+from capivara.runtime.values import as_int32
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+@dataclass(frozen=True)
+class Workload:
+    name: str                                  # classe principal (nome binário)
+    classes: Dict[str, bytes] = field(repr=False)
+    entry: str = "run"
+    desc: str = "()I"
+    expected: Optional[int] = None
+    bytecodes: int = 0                         # bytecodes executados por chamada de run()
+    calls: int = 0                             # frames criados (inclui o próprio run)
+
+def write_classes(w: Workload, out_dir: str) -> str:
+    """Grava as classes do workload num diretório de classpath."""
+    for name, data in w.classes.items():
+        path = os.path.join(out_dir, name + ".class")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    return out_dir
+
+def _push_int(c: CodeBuilder, v: int) -> CodeBuilder:
+    # sem ldc no intérprete: constantes grandes viram q*30000 + r (pilha 2)
+    if -32768 <= v <= 32767:
+        return c.iconst(v)
+    q, r = divmod(v, 30000)
+    c.iconst(30000).iconst(q).op(OP.IMUL)
+    if r:
+        c.iconst(r).op(OP.IADD)
+    return c
+
+def _loop(c: CodeBuilder, n: int, counter: int, limit: int,
+          body: Callable[[CodeBuilder], object], tag: str = "") -> Tuple[int, int]:
+    """
+    for (counter = 0; counter < n; counter++) body(c)
+    Devolve (instruções estáticas do laço, instruções por iteração). `tag`
+    prefixa os rótulos (vários laços no mesmo método).
+    """
+    start = c.insns
+    _push_int(c, n).istore(limit)
+    c.iconst(0).istore(counter)
+    c.label(tag + "loop").iload(counter).iload(limit).branch(OP.IF_ICMPGE, tag + "end")
+    b0 = c.insns
+    body(c)
+    per_iter = c.insns - b0 + 5  # teste (3) + corpo + iinc/goto (2)
+    c.iinc(counter, 1).branch(OP.GOTO, tag + "loop")
+    c.label(tag + "end")
+    return c.insns - start, per_iter
+
+def _loop_dynamic(static_loop: int, per_iter: int, n: int) -> int:
+    # o código estático já contém uma iteração; +3 do teste final que sai do laço
+    return static_loop + (n - 1) * per_iter + 3
+
+def _init(cb: ClassBuilder, super_name: str = "java/lang/Object",
+          body: Optional[Callable[[CodeBuilder], object]] = None) -> int:
+    """Adiciona `<init>()V`; devolve o nº de instruções dele."""
+    c = cb.code(max_stack=2, max_locals=1)
+    c.aload(0).invokespecial(super_name, "<init>", "()V")
+    if body:
+        body(c)
+    c.op(OP.RETURN)
+    cb.add_method("<init>", "()V", c, access=FL.ACC_PUBLIC)
+    return c.insns
+
+def hot_loop(n: int = 100_000, name: str = "bench/HotLoop") -> Workload:
+    """s += i para i em [0, n)."""
+    cb = ClassBuilder(name)
+    _init(cb)
+    c = cb.code(max_stack=3, max_locals=3)  # 0=i 1=s 2=n
+    c.iconst(0).istore(1)
+    lp, it = _loop(c, n, 0, 2, lambda c: c.iload(1).iload(0).op(OP.IADD).istore(1))
+    c.iload(1).op(OP.IRETURN)
+    cb.add_method("run", "()I", c)
+    bc = c.insns - lp + _loop_dynamic(lp, it, n)
+    return Workload(name, {name: cb.to_bytes()}, expected=as_int32(n * (n - 1) // 2),
+                    bytecodes=bc, calls=1)
+
+def call_chain(depth: int = 8, n: int = 10_000, name: str = "bench/CallChain") -> Workload:
+    """n iterações de s = c0(s), onde c0 -> c1 -> ... somam 1 cada."""
+    cb = ClassBuilder(name)
+    _init(cb)
+    chain = 0
+    for k in range(depth):
+        c = cb.code(max_stack=2, max_locals=1)
+        c.iload(0).iconst(1).op(OP.IADD)
+        if k + 1 < depth:
+            c.invokestatic(name, f"c{k + 1}", "(I)I")
+        c.op(OP.IRETURN)
+        cb.add_method(f"c{k}", "(I)I", c, access=FL.ACC_STATIC)
+        chain += c.insns
+    c = cb.code(max_stack=3, max_locals=3)  # 0=i 1=s 2=n
+    c.iconst(0).istore(1)
+    lp, it = _loop(c, n, 0, 2, lambda c: c.iload(1).invokestatic(name, "c0", "(I)I").istore(1))
+    c.iload(1).op(OP.IRETURN)
+    cb.add_method("run", "()I", c)
+    bc = c.insns - lp + _loop_dynamic(lp, it, n) + n * chain
+    return Workload(name, {name: cb.to_bytes()}, expected=as_int32(n * depth),
+                    bytecodes=bc, calls=1 + n * depth)
+
+def recursive_fib(n: int = 18, name: str = "bench/Fib") -> Workload:
+    """fib(n) recursivo (invokestatic)."""
+    cb = ClassBuilder(name)
+    _init(cb)
+    c = cb.code(max_stack=3, max_locals=1)
+    c.iload(0).iconst(2).branch(OP.IF_ICMPGE, "rec")
+    c.iload(0).op(OP.IRETURN)
+    base = c.insns
+    c.label("rec")
+    c.iload(0).iconst(1).op(OP.ISUB).invokestatic(name, "fib", "(I)I")
+    c.iload(0).iconst(2).op(OP.ISUB).invokestatic(name, "fib", "(I)I")
+    c.op(OP.IADD).op(OP.IRETURN)
+    rec = c.insns - 2  # caminho recursivo pula `iload; ireturn` do caso base
+    cb.add_method("fib", "(I)I", c, access=FL.ACC_STATIC)
+
+    r = cb.code(max_stack=1, max_locals=0)
+    _push_int(r, n).invokestatic(name, "fib", "(I)I").op(OP.IRETURN)
+    cb.add_method("run", "()I", r)
+
+    # (fib, bytecodes, frames) por recorrência
+    memo: Dict[int, Tuple[int, int, int]] = {}
+    for k in range(n + 1):
+        memo[k] = (k, base, 1) if k < 2 else (
+            memo[k - 1][0] + memo[k - 2][0],
+            rec + memo[k - 1][1] + memo[k - 2][1],
+            1 + memo[k - 1][2] + memo[k - 2][2],
+        )
+    value, bc, frames = memo[n]
+    return Workload(name, {name: cb.to_bytes()}, expected=as_int32(value),
+                    bytecodes=r.insns + bc, calls=1 + frames)
+
+def alloc_storm(n: int = 20_000, name: str = "bench/AllocStorm") -> Workload:
+    """n objetos `Cell` (construtor grava v=1); soma os campos lidos."""
+    cell = name + "$Cell"
+    cc = ClassBuilder(cell)
+    cc.add_field("v", "I", access=0)
+    init = _init(cc, body=lambda c: c.aload(0).iconst(1).putfield(cell, "v", "I"))
+
+    cb = ClassBuilder(name)
+    _init(cb)
+    c = cb.code(max_stack=3, max_locals=4)  # 0=i 1=s 2=n 3=obj
+
+    def body(c: CodeBuilder) -> None:
+        c.new(cell).op(OP.DUP).invokespecial(cell, "<init>", "()V").astore(3)
+        c.iload(1).aload(3).getfield(cell, "v", "I").op(OP.IADD).istore(1)
+
+    c.iconst(0).istore(1)
+    lp, it = _loop(c, n, 0, 2, body)
+    c.iload(1).op(OP.IRETURN)
+    cb.add_method("run", "()I", c)
+    # Object.<init> é no-op no intérprete (sem frame)
+    bc = c.insns - lp + _loop_dynamic(lp, it, n) + n * init
+    return Workload(name, {name: cb.to_bytes(), cell: cc.to_bytes()}, expected=as_int32(n),
+                    bytecodes=bc, calls=1 + n)
+
+def virtual_dispatch(n: int = 20_000, name: str = "bench/VirtualDispatch") -> Workload:
+    """n chamadas invokevirtual de um método sobrescrito (Base.f=1, Derived.f=2)."""
+    base, derived = name + "$Base", name + "$Derived"
+    classes: Dict[str, bytes] = {}
+    inits = 0
+    f_insns = 0
+    for cls, sup, ret in ((base, "java/lang/Object", 1), (derived, base, 2)):
+        k = ClassBuilder(cls, super_name=sup)
+        inits += _init(k, super_name=sup)
+        c = k.code(max_stack=1, max_locals=1)
+        c.iconst(ret).op(OP.IRETURN)
+        k.add_method("f", "()I", c, access=FL.ACC_PUBLIC)
+        f_insns = c.insns
+        classes[cls] = k.to_bytes()
+
+    cb = ClassBuilder(name)
+    _init(cb)
+    c = cb.code(max_stack=3, max_locals=4)  # 0=i 1=s 2=n 3=obj
+    c.new(derived).op(OP.DUP).invokespecial(derived, "<init>", "()V").astore(3)
+    c.iconst(0).istore(1)
+    lp, it = _loop(c, n, 0, 2, lambda c: c.iload(1).aload(3).invokevirtual(base, "f", "()I").op(OP.IADD).istore(1))
+    c.iload(1).op(OP.IRETURN)
+    cb.add_method("run", "()I", c)
+    classes[name] = cb.to_bytes()
+    bc = c.insns - lp + _loop_dynamic(lp, it, n) + inits + n * f_insns
+    return Workload(name, classes, expected=as_int32(2 * n),
+                    bytecodes=bc, calls=1 + 2 + n)
+
+def field_access(n: int = 20_000, name: str = "bench/FieldAccess") -> Workload:
+    """n incrementos de um estático (getstatic/putstatic) e de um campo de instância."""
+    cb = ClassBuilder(name)
+    cb.add_field("S", "I", access=FL.ACC_STATIC)
+    cb.add_field("x", "I", access=0)
+    init = _init(cb)
+    c = cb.code(max_stack=3, max_locals=4)  # 0=i 2=n 3=obj
+
+    def body(c: CodeBuilder) -> None:
+        c.getstatic(name, "S", "I").iconst(1).op(OP.IADD).putstatic(name, "S", "I")
+        c.aload(3).aload(3).getfield(name, "x", "I").iconst(1).op(OP.IADD).putfield(name, "x", "I")
+
+    c.new(name).op(OP.DUP).invokespecial(name, "<init>", "()V").astore(3)
+    c.iconst(0).putstatic(name, "S", "I")
+    lp, it = _loop(c, n, 0, 2, body)
+    c.getstatic(name, "S", "I").aload(3).getfield(name, "x", "I").op(OP.IADD).op(OP.IRETURN)
+    cb.add_method("run", "()I", c)
+    bc = c.insns - lp + _loop_dynamic(lp, it, n) + init
+    return Workload(name, {name: cb.to_bytes()}, expected=as_int32(2 * n),
+                    bytecodes=bc, calls=2)
+
+def synchronized_access(n: int = 20_000, name: str = "bench/SyncAccess") -> Workload:
+    """field_access dentro de synchronized(obj) e de um método synchronized (custo dos locks sem disputa)."""
+    cb = ClassBuilder(name)
+    cb.add_field("x", "I", access=0)
+    init = _init(cb)
+    inc = cb.code(max_stack=3, max_locals=1)
+    inc.aload(0).aload(0).getfield(name, "x", "I").iconst(1).op(OP.IADD).putfield(name, "x", "I").op(OP.RETURN)
+    cb.add_method("inc", "()V", inc, access=FL.ACC_PUBLIC | FL.ACC_SYNCHRONIZED)
+    c = cb.code(max_stack=3, max_locals=4)  # 0=i 2=n 3=obj
+
+    def body(c: CodeBuilder) -> None:
+        c.aload(3).op(OP.MONITORENTER)
+        c.aload(3).aload(3).getfield(name, "x", "I").iconst(1).op(OP.IADD).putfield(name, "x", "I")
+        c.aload(3).op(OP.MONITOREXIT)
+        c.aload(3).invokevirtual(name, "inc", "()V")
+
+    c.new(name).op(OP.DUP).invokespecial(name, "<init>", "()V").astore(3)
+    lp, it = _loop(c, n, 0, 2, body)
+    c.aload(3).getfield(name, "x", "I").op(OP.IRETURN)
+    cb.add_method("run", "()I", c)
+    bc = c.insns - lp + _loop_dynamic(lp, it, n) + init + n * inc.insns
+    return Workload(name, {name: cb.to_bytes()}, expected=as_int32(2 * n),
+                    bytecodes=bc, calls=2 + n)
+
+def array_scan(n: int = 20_000, name: str = "bench/ArrayScan") -> Workload:
+    """int[n] preenchido com a[i] = i (iastore) e depois somado (iaload)."""
+    cb = ClassBuilder(name)
+    _init(cb)
+    c = cb.code(max_stack=4, max_locals=4)  # 0=i 1=s 2=n 3=a
+    _push_int(c, n).op(OP.NEWARRAY, 10).astore(3)
+    fill, fill_it = _loop(c, n, 0, 2, lambda c: c.aload(3).iload(0).iload(0).op(OP.IASTORE), tag="fill")
+    c.iconst(0).istore(1)
+    scan, scan_it = _loop(c, n, 0, 2,
+                          lambda c: c.iload(1).aload(3).iload(0).op(OP.IALOAD).op(OP.IADD).istore(1), tag="scan")
+    c.iload(1).op(OP.IRETURN)
+    cb.add_method("run", "()I", c)
+    bc = c.insns - fill - scan + _loop_dynamic(fill, fill_it, n) + _loop_dynamic(scan, scan_it, n)
+    return Workload(name, {name: cb.to_bytes()}, expected=as_int32(n * (n - 1) // 2),
+                    bytecodes=bc, calls=1)
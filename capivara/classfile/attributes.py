@@ -1,22 +1,23 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List
-from capivara.util.bytesio import ByteStream
+from dataclasses import dataclass, field
+import struct
+from typing import List, Optional
+from capivara.util.bytesio import ByteStream, U2U2, U2U4
 from capivara.classfile.constant_pool import ConstantPool
 
-@dataclass
+@dataclass(slots=True)
 class AttributeInfo:
     name_index: int
     length: int
 
-@dataclass
+@dataclass(slots=True)
 class ExceptionTableEntry:
     start_pc: int
     end_pc: int
     handler_pc: int
     catch_type: int  # 0 => catch-all (finally)
 
-@dataclass
+@dataclass(slots=True)
 class CodeAttribute(AttributeInfo):
     max_stack: int
     max_locals: int
@@ -24,49 +25,56 @@ class CodeAttribute(AttributeInfo):
     exception_table: List[ExceptionTableEntry]
     attributes: List[AttributeInfo]
 
-@dataclass
+@dataclass(slots=True)
 class LineNumberEntry:
     start_pc: int
     line_number: int
 
-@dataclass
+@dataclass(slots=True)
 class LineNumberTableAttribute(AttributeInfo):
     line_numbers: List[LineNumberEntry]
 
-@dataclass
+@dataclass(slots=True)
 class SourceFileAttribute(AttributeInfo):
     sourcefile_index: int
 
-@dataclass
+@dataclass(slots=True)
 class ConstantValueAttribute(AttributeInfo):
     constantvalue_index: int
 
-@dataclass
+@dataclass(slots=True)
 class UnknownAttribute(AttributeInfo):
-    info: bytes
+    info: bytes  # cópia: uma fatia do buffer prenderia o .class inteiro na memória
+
+@dataclass(slots=True)
+class LazyAttribute(AttributeInfo):
+    """
+    Atributo ainda não parseado: guarda o buffer original (sem cópia) e o
+    offset do cabeçalho (name_index). `resolve` faz o parse completo.
+    """
+    data: bytes = field(repr=False)
+    offset: int = 0
+
+    def resolve(self, cp: ConstantPool) -> AttributeInfo:
+        bs = ByteStream(self.data)
+        bs.seek(self.offset)
+        return parse_attribute(bs, cp)
+
+_CODE_HEADER = struct.Struct(">HHI")    # max_stack, max_locals, code_length
+_EXCEPTION_ENTRY = struct.Struct(">HHHH")
 
 def _parse_LineNumberTable(bs: ByteStream, name_index: int, length: int) -> LineNumberTableAttribute:
     table_len = bs.read_u2()
-    entries: List[LineNumberEntry] = []
-    for _ in range(table_len):
-        entries.append(LineNumberEntry(bs.read_u2(), bs.read_u2()))
+    entries = [LineNumberEntry(*row) for row in bs.iter_table(U2U2, table_len)]
     return LineNumberTableAttribute(name_index, length, entries)
 
 def _parse_Code(bs: ByteStream, cp: ConstantPool, name_index: int, length: int) -> CodeAttribute:
-    max_stack = bs.read_u2()
-    max_locals = bs.read_u2()
-    code_length = bs.read_u4()
+    max_stack, max_locals, code_length = bs.read_struct(_CODE_HEADER)
+    # cópia proposital: o laço do intérprete indexa bytes mais rápido que memoryview
     code = bs.read_bytes(code_length)
 
     ex_len = bs.read_u2()
-    ex_table: List[ExceptionTableEntry] = []
-    for _ in range(ex_len):
-        ex_table.append(ExceptionTableEntry(
-            start_pc=bs.read_u2(),
-            end_pc=bs.read_u2(),
-            handler_pc=bs.read_u2(),
-            catch_type=bs.read_u2(),
-        ))
+    ex_table = [ExceptionTableEntry(*row) for row in bs.iter_table(_EXCEPTION_ENTRY, ex_len)]
 
     attrs_count = bs.read_u2()
     nested: List[AttributeInfo] = []
@@ -80,11 +88,16 @@ def _parse_SourceFile(bs: ByteStream, name_index: int, length: int) -> SourceFil
 def _parse_ConstantValue(bs: ByteStream, name_index: int, length: int) -> ConstantValueAttribute:
     return ConstantValueAttribute(name_index, length, constantvalue_index=bs.read_u2())
 
-def parse_attribute(bs: ByteStream, cp: ConstantPool) -> AttributeInfo:
-    name_index = bs.read_u2()
-    length = bs.read_u4()
+def parse_attribute(bs: ByteStream, cp: ConstantPool, lazy: bool = False) -> AttributeInfo:
+    start = bs.tell()
+    name_index, length = bs.read_struct(U2U4)
     name = cp.get_utf8(name_index)
 
+    if lazy and name not in ("SourceFile", "ConstantValue"):
+        # Code, LineNumberTable, desconhecidos... só registra onde estão
+        bs.skip(length)
+        return LazyAttribute(name_index, length, bs.data, start)
+
     if name == "Code":
         return _parse_Code(bs, cp, name_index, length)
     if name == "LineNumberTable":
@@ -97,5 +110,29 @@ def parse_attribute(bs: ByteStream, cp: ConstantPool) -> AttributeInfo:
     info = bs.read_bytes(length)
     return UnknownAttribute(name_index, length, info)
 
-def parse_attributes(bs: ByteStream, cp: ConstantPool, count: int) -> List[AttributeInfo]:
-    return [parse_attribute(bs, cp) for _ in range(count)]
\ No newline at end of file
+def parse_attributes(bs: ByteStream, cp: ConstantPool, count: int, lazy: bool = False) -> List[AttributeInfo]:
+    return [parse_attribute(bs, cp, lazy) for _ in range(count)]
+
+def find_code_attribute(attributes: List[AttributeInfo], cp: ConstantPool) -> Optional[CodeAttribute]:
+    """
+    Devolve o Code de um método. Um Code ainda lazy é parseado aqui (na
+    primeira invocação) e substitui o placeholder na lista.
+    """
+    for i, a in enumerate(attributes):
+        if isinstance(a, CodeAttribute):
+            return a
+        if isinstance(a, LazyAttribute) and cp.get_utf8(a.name_index) == "Code":
+            code = a.resolve(cp)
+            attributes[i] = code
+            return code
+    return None
+
+def line_number_for_pc(code: CodeAttribute, pc: int) -> Optional[int]:
+    """Linha-fonte de `pc` segundo a LineNumberTable do Code (None se não houver)."""
+    best: Optional[LineNumberEntry] = None
+    for a in code.attributes:
+        if isinstance(a, LineNumberTableAttribute):
+            for e in a.line_numbers:
+                if e.start_pc <= pc and (best is None or e.start_pc >= best.start_pc):
+                    best = e
+    return best.line_number if best is not None else None
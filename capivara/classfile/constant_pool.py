@@ -1,64 +1,66 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Dict, Tuple, NamedTuple
 from capivara.util import opcodes as OP
+from capivara.classfile.symbols import SYMBOLS
 
-@dataclass
+@dataclass(slots=True)
 class CpInfo:
     tag: int
 
-@dataclass
+@dataclass(slots=True)
 class CpUtf8(CpInfo):
-    value: str
+    value: str     # str canônico da SYMBOLS (compartilhado entre classes)
+    sid: int = -1  # id na SYMBOLS
 
-@dataclass
+@dataclass(slots=True)
 class CpInteger(CpInfo):
     value: int  # int32
 
-@dataclass
+@dataclass(slots=True)
 class CpFloat(CpInfo):
     value: float
 
-@dataclass
+@dataclass(slots=True)
 class CpLong(CpInfo):
     value: int  # int64
 
-@dataclass
+@dataclass(slots=True)
 class CpDouble(CpInfo):
     value: float  # float64
 
-@dataclass
+@dataclass(slots=True)
 class CpClass(CpInfo):
     name_index: int
 
-@dataclass
+@dataclass(slots=True)
 class CpString(CpInfo):
     string_index: int
 
-@dataclass
+@dataclass(slots=True)
 class CpNameAndType(CpInfo):
     name_index: int
     descriptor_index: int
 
-@dataclass
+@dataclass(slots=True)
 class CpRef(CpInfo):
     class_index: int
     name_and_type_index: int
 
-@dataclass
+@dataclass(slots=True)
 class CpFieldref(CpRef):
     pass
 
-@dataclass
+@dataclass(slots=True)
 class CpMethodref(CpRef):
     pass
 
-@dataclass
+@dataclass(slots=True)
 class CpInterfaceMethodref(CpRef):
     pass
 
 # Placeholder para entradas 2-slot (Long/Double) — o índice existe mas não contém dado.
-@dataclass
+@dataclass(slots=True)
 class CpPlaceholder(CpInfo):
     pass
 
@@ -71,14 +73,42 @@ CPEntry = Union[
     CpPlaceholder,
 ]
 
+class MemberRef(NamedTuple):
+    """Field/Method/InterfaceMethodref resolvido simbolicamente."""
+    tag: int
+    owner: str
+    name: str
+    desc: str
+    name_id: int
+    desc_id: int
+
+def decode_utf8(raw: Union[bytes, memoryview]) -> str:
+    try:
+        return str(raw, "utf-8")
+    except UnicodeDecodeError:
+        return str(raw, "utf-8", errors="replace")
+
+def make_utf8(raw: Union[bytes, memoryview]) -> CpUtf8:
+    """Decodifica e interna na SYMBOLS."""
+    sid = SYMBOLS.intern(decode_utf8(raw))
+    return CpUtf8(OP.CP_Utf8, SYMBOLS.name(sid), sid)
+
 class ConstantPool:
     """
     Armazena a CP como lista 1-based (índice 0 = None).
     Oferece utilitários de obtenção e busca.
+
+    Em modo lazy, entradas Utf8 guardam só (offset, length) no buffer original
+    e viram CpUtf8 na primeira consulta.
     """
-    def __init__(self, size: int):
+    __slots__ = ("entries", "_data", "_utf8_spans", "_refs")
+
+    def __init__(self, size: int, data: Optional[bytes] = None):
         # Tamanho reportado em file = constant_pool_count (entradas = count-1)
         self.entries: List[CPEntry] = [None] * size
+        self._data = data
+        self._utf8_spans: Dict[int, Tuple[int, int]] = {}
+        self._refs: Dict[int, MemberRef] = {}
 
     def __len__(self) -> int:
         return len(self.entries)
@@ -86,12 +116,34 @@ class ConstantPool:
     def set(self, index: int, entry: CPEntry) -> None:
         self.entries[index] = entry
 
+    def set_lazy_utf8(self, index: int, offset: int, length: int) -> None:
+        """Registra um Utf8 ainda não decodificado (requer `data`)."""
+        self._utf8_spans[index] = (offset, length)
+
+    def _materialize(self, index: int) -> Optional[CpUtf8]:
+        span = self._utf8_spans.pop(index, None)
+        if span is None:
+            return None
+        off, length = span
+        e = make_utf8(memoryview(self._data)[off:off + length])
+        self.entries[index] = e
+        if not self._utf8_spans:
+            self._data = None  # tudo decodificado: solta o buffer
+        return e
+
+    def materialize_all(self) -> None:
+        """Decodifica todos os Utf8 pendentes (para varreduras em `entries`)."""
+        for index in list(self._utf8_spans):
+            self._materialize(index)
+
     def get(self, index: int) -> CPEntry:
         if not (0 < index < len(self.entries)):
             raise IndexError(f"CP index {index} fora do range 1..{len(self.entries)-1}")
         e = self.entries[index]
         if e is None:
-            raise ValueError(f"CP index {index} é None/placeholder")
+            e = self._materialize(index)
+            if e is None:
+                raise ValueError(f"CP index {index} é None/placeholder")
         return e
 
     def get_utf8(self, index: int) -> str:
@@ -100,6 +152,32 @@ class ConstantPool:
             return e.value
         raise TypeError(f"CP index {index} não é Utf8 (tag={e.tag})")
 
+    def get_symbol(self, index: int) -> int:
+        """Id na SYMBOLS do Utf8 em `index`."""
+        e = self.get(index)
+        if isinstance(e, CpUtf8):
+            return e.sid
+        raise TypeError(f"CP index {index} não é Utf8 (tag={e.tag})")
+
+    def resolve_ref(self, index: int) -> MemberRef:
+        """Resolve (com cache) um Fieldref/Methodref/InterfaceMethodref."""
+        r = self._refs.get(index)
+        if r is not None:
+            return r
+        e = self.get(index)
+        if not isinstance(e, CpRef):
+            raise TypeError(f"CP index {index} não é *ref (tag={e.tag})")
+        cls = self.get(e.class_index)
+        assert isinstance(cls, CpClass)
+        nt = self.get(e.name_and_type_index)
+        assert isinstance(nt, CpNameAndType)
+        name = self.get(nt.name_index)
+        desc = self.get(nt.descriptor_index)
+        assert isinstance(name, CpUtf8) and isinstance(desc, CpUtf8)
+        r = MemberRef(e.tag, self.get_utf8(cls.name_index), name.value, desc.value, name.sid, desc.sid)
+        self._refs[index] = r
+        return r
+
     def try_get_utf8(self, index: int) -> Optional[str]:
         try:
             return self.get_utf8(index)
@@ -108,6 +186,7 @@ class ConstantPool:
 
     def find_utf8(self, s: str) -> list[int]:
         """Retorna todos os índices Utf8 com valor == s."""
+        self.materialize_all()
         out: list[int] = []
         for i, e in enumerate(self.entries):
             if isinstance(e, CpUtf8) and e.value == s:
@@ -116,6 +195,7 @@ class ConstantPool:
 
     def as_debug_list(self) -> list[str]:
         """Lista amigável (para depuração/testes)."""
+        self.materialize_all()
         lines = []
         for i, e in enumerate(self.entries):
             if i == 0:
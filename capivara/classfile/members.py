@@ -1,42 +1,39 @@
 from __future__ import annotations
 from dataclasses import dataclass
+import struct
 from typing import List
 from capivara.util.bytesio import ByteStream
 from capivara.classfile.constant_pool import ConstantPool
 from capivara.classfile.attributes import AttributeInfo, parse_attributes
 
-@dataclass
+@dataclass(slots=True)
 class FieldInfo:
     access_flags: int
     name_index: int
     descriptor_index: int
     attributes: List[AttributeInfo]
 
-@dataclass
+@dataclass(slots=True)
 class MethodInfo:
     access_flags: int
     name_index: int
     descriptor_index: int
     attributes: List[AttributeInfo]
 
-def parse_field_info(bs: ByteStream, cp: ConstantPool) -> FieldInfo:
-    af = bs.read_u2()
-    name_index = bs.read_u2()
-    desc_index = bs.read_u2()
-    ac = bs.read_u2()
-    attrs = parse_attributes(bs, cp, ac)
+_MEMBER_HEADER = struct.Struct(">HHHH")  # access_flags, name, descriptor, attributes_count
+
+def parse_field_info(bs: ByteStream, cp: ConstantPool, lazy: bool = False) -> FieldInfo:
+    af, name_index, desc_index, ac = bs.read_struct(_MEMBER_HEADER)
+    attrs = parse_attributes(bs, cp, ac, lazy)
     return FieldInfo(af, name_index, desc_index, attrs)
 
-def parse_method_info(bs: ByteStream, cp: ConstantPool) -> MethodInfo:
-    af = bs.read_u2()
-    name_index = bs.read_u2()
-    desc_index = bs.read_u2()
-    ac = bs.read_u2()
-    attrs = parse_attributes(bs, cp, ac)
+def parse_method_info(bs: ByteStream, cp: ConstantPool, lazy: bool = False) -> MethodInfo:
+    af, name_index, desc_index, ac = bs.read_struct(_MEMBER_HEADER)
+    attrs = parse_attributes(bs, cp, ac, lazy)
     return MethodInfo(af, name_index, desc_index, attrs)
 
-def parse_fields(bs: ByteStream, cp: ConstantPool, count: int) -> List[FieldInfo]:
-    return [parse_field_info(bs, cp) for _ in range(count)]
+def parse_fields(bs: ByteStream, cp: ConstantPool, count: int, lazy: bool = False) -> List[FieldInfo]:
+    return [parse_field_info(bs, cp, lazy) for _ in range(count)]
 
-def parse_methods(bs: ByteStream, cp: ConstantPool, count: int) -> List[MethodInfo]:
-    return [parse_method_info(bs, cp) for _ in range(count)]
\ No newline at end of file
+def parse_methods(bs: ByteStream, cp: ConstantPool, count: int, lazy: bool = False) -> List[MethodInfo]:
+    return [parse_method_info(bs, cp, lazy) for _ in range(count)]
\ No newline at end of file
@@ -1,21 +1,25 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Tuple, List
-from capivara.util.bytesio import ByteStream
+import struct
+from capivara.util.bytesio import ByteStream, S4, S8, U2U2
 from capivara.util import opcodes as OP
 from capivara.classfile.constant_pool import (
     ConstantPool,
     CpUtf8, CpInteger, CpFloat, CpLong, CpDouble,
     CpClass, CpString, CpNameAndType,
     CpFieldref, CpMethodref, CpInterfaceMethodref,
-    CpPlaceholder,
+    CpPlaceholder, make_utf8,
 )
 from capivara.classfile.members import parse_fields, parse_methods, FieldInfo, MethodInfo
 from capivara.classfile.attributes import parse_attributes, AttributeInfo
 
 MAGIC = 0xCAFEBABE
 
-@dataclass
+_HEADER = struct.Struct(">IHHH")      # magic, minor, major, constant_pool_count
+_CLASS_INFO = struct.Struct(">HHHH")  # access_flags, this, super, interfaces_count
+
+@dataclass(slots=True)
 class ClassFile:
     magic: int
     minor_version: int
@@ -36,28 +40,17 @@ def _read_cp_entry(bs: ByteStream) -> Tuple[int, object]:
 
     if tag == OP.CP_Utf8:
         length = bs.read_u2()
-        raw = bs.read_bytes(length)
-        try:
-            s = raw.decode("utf-8")
-        except UnicodeDecodeError:
-            s = raw.decode("utf-8", errors="replace")
-        return tag, CpUtf8(tag, s)
+        return tag, make_utf8(bs.read_view(length))
 
     if tag == OP.CP_Integer:
-        v = bs.read_u4()
-        if v & 0x80000000:
-            v = v - (1 << 32)
-        return tag, CpInteger(tag, v)
+        return tag, CpInteger(tag, bs.read_struct(S4)[0])
 
     if tag == OP.CP_Float:
         v = bs.read_f4()
         return tag, CpFloat(tag, v)
 
     if tag == OP.CP_Long:
-        u = bs.read_u8()
-        if u & 0x8000000000000000:
-            u = u - (1 << 64)
-        return tag, CpLong(tag, u)
+        return tag, CpLong(tag, bs.read_struct(S8)[0])
 
     if tag == OP.CP_Double:
         v = bs.read_f8()
@@ -72,41 +65,46 @@ def _read_cp_entry(bs: ByteStream) -> Tuple[int, object]:
         return tag, CpString(tag, string_index)
 
     if tag == OP.CP_NameAndType:
-        name_index = bs.read_u2()
-        desc_index = bs.read_u2()
+        name_index, desc_index = bs.read_struct(U2U2)
         return tag, CpNameAndType(tag, name_index, desc_index)
 
     if tag == OP.CP_Fieldref:
-        class_index = bs.read_u2()
-        nt_index = bs.read_u2()
+        class_index, nt_index = bs.read_struct(U2U2)
         return tag, CpFieldref(tag, class_index, nt_index)
 
     if tag == OP.CP_Methodref:
-        class_index = bs.read_u2()
-        nt_index = bs.read_u2()
+        class_index, nt_index = bs.read_struct(U2U2)
         return tag, CpMethodref(tag, class_index, nt_index)
 
     if tag == OP.CP_InterfaceMethodref:
-        class_index = bs.read_u2()
-        nt_index = bs.read_u2()
+        class_index, nt_index = bs.read_struct(U2U2)
         return tag, CpInterfaceMethodref(tag, class_index, nt_index)
 
     raise NotImplementedError(f"Tag de Constant Pool não suportada no Passo 2: {tag}")
 
-def read_classfile(data: bytes) -> ClassFile:
+def read_classfile(data: bytes, lazy: bool = False) -> ClassFile:
+    """
+    Parse de um .class. Com lazy=True, Utf8 só são decodificados no primeiro
+    `get_utf8` e atributos de métodos (Code, LineNumberTable, desconhecidos)
+    viram LazyAttribute, parseados sob demanda via `find_code_attribute`.
+    """
     bs = ByteStream(data)
-    magic = bs.read_u4()
+    magic, minor, major, cp_count = bs.read_struct(_HEADER)
     if magic != MAGIC:
         raise ValueError(f"Arquivo .class inválido: magic=0x{magic:08X} (esperado 0xCAFEBABE)")
-    minor = bs.read_u2()
-    major = bs.read_u2()
     if major != 52:
         raise ValueError(f"Versão major não suportada neste passo: {major} (esperado 52)")
 
-    cp_count = bs.read_u2()
-    cp = ConstantPool(cp_count)
+    cp = ConstantPool(cp_count, data if lazy else None)
     i = 1
     while i <= cp_count - 1:
+        if lazy and bs.peek_u1() == OP.CP_Utf8:
+            bs.skip(1)
+            length = bs.read_u2()
+            cp.set_lazy_utf8(i, bs.tell(), length)
+            bs.skip(length)
+            i += 1
+            continue
         tag, entry = _read_cp_entry(bs)
         cp.set(i, entry)
         if tag in (OP.CP_Long, OP.CP_Double):
@@ -115,21 +113,17 @@ def read_classfile(data: bytes) -> ClassFile:
         i += 1
 
     # ===== Restante da estrutura do ClassFile =====
-    access_flags = bs.read_u2()
-    this_class = bs.read_u2()
-    super_class = bs.read_u2()
-
-    interfaces_count = bs.read_u2()
-    interfaces: List[int] = [bs.read_u2() for _ in range(interfaces_count)]
+    access_flags, this_class, super_class, interfaces_count = bs.read_struct(_CLASS_INFO)
+    interfaces: List[int] = bs.read_u2_array(interfaces_count)
 
     fields_count = bs.read_u2()
-    fields = parse_fields(bs, cp, fields_count)
+    fields = parse_fields(bs, cp, fields_count, lazy)
 
     methods_count = bs.read_u2()
-    methods = parse_methods(bs, cp, methods_count)
+    methods = parse_methods(bs, cp, methods_count, lazy)
 
     attributes_count = bs.read_u2()
-    attributes = parse_attributes(bs, cp, attributes_count)
+    attributes = parse_attributes(bs, cp, attributes_count, lazy)
 
     return ClassFile(
         magic=magic,
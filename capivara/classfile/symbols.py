@@ -0,0 +1,44 @@
+from __future__ import annotations
+import threading
+from typing import Dict, List, Optional
+
+from capivara.util.locking import insert_once
+
+class SymbolTable:
+    """
+    Tabela de símbolos da VM: cada Utf8 vira um único `str` canônico com um id
+    inteiro pequeno. Classes diferentes passam a compartilhar o mesmo objeto
+    para "<init>", "()V", "java/lang/Object"..., e tabelas de lookup podem
+    usar (name_id, desc_id) como chave.
+    Seguro entre threads (o loader parseia classes em paralelo): a busca não
+    trava; a inserção é feita sob lock.
+    """
+    __slots__ = ("_ids", "_names", "_lock")
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def intern(self, s: str) -> int:
+        sid = self._ids.get(s)
+        if sid is not None:
+            return sid
+        return insert_once(self._lock, self._ids, s, self._add)
+
+    def _add(self, s: str) -> int:
+        self._names.append(s)
+        return len(self._names) - 1
+
+    def lookup(self, s: str) -> Optional[int]:
+        """Id de `s` sem internar (None: nenhuma classe usa esse símbolo)."""
+        return self._ids.get(s)
+
+    def name(self, sid: int) -> str:
+        return self._names[sid]
+
+# Tabela global (uma por processo)
+SYMBOLS = SymbolTable()
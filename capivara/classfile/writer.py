@@ -0,0 +1,328 @@
+from __future__ import annotations
+import struct
+from typing import Dict, List, Optional, Tuple, Union
+
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+class ConstantPoolWriter:
+    """
+    Monta a constant pool de saída, deduplicando entradas iguais.
+    Os índices devolvidos são 1-based (como na CP lida pelo reader).
+    """
+    def __init__(self):
+        self._index: Dict[tuple, int] = {}
+        self._chunks: List[bytes] = []
+        self._count: int = 1  # constant_pool_count (índice 0 reservado)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _add(self, key: tuple, raw: bytes, slots: int = 1) -> int:
+        idx = self._index.get(key)
+        if idx is not None:
+            return idx
+        idx = self._count
+        if idx + slots > 0xFFFF:
+            raise OverflowError("constant pool excede 65535 entradas")
+        self._chunks.append(raw)
+        self._index[key] = idx
+        self._count += slots
+        return idx
+
+    def utf8(self, s: str) -> int:
+        raw = s.encode("utf-8")
+        if len(raw) > 0xFFFF:
+            raise ValueError("Utf8 excede 65535 bytes")
+        return self._add(("utf8", s), struct.pack(">BH", OP.CP_Utf8, len(raw)) + raw)
+
+    def integer(self, v: int) -> int:
+        v &= 0xFFFFFFFF
+        return self._add(("int", v), struct.pack(">BI", OP.CP_Integer, v))
+
+    def float_(self, v: float) -> int:
+        raw = struct.pack(">Bf", OP.CP_Float, v)
+        return self._add(("float", raw), raw)
+
+    def long_(self, v: int) -> int:
+        v &= 0xFFFFFFFFFFFFFFFF
+        return self._add(("long", v), struct.pack(">BQ", OP.CP_Long, v), slots=2)
+
+    def double(self, v: float) -> int:
+        raw = struct.pack(">Bd", OP.CP_Double, v)
+        return self._add(("double", raw), raw, slots=2)
+
+    def class_(self, internal_name: str) -> int:
+        ni = self.utf8(internal_name)
+        return self._add(("class", ni), struct.pack(">BH", OP.CP_Class, ni))
+
+    def string(self, s: str) -> int:
+        si = self.utf8(s)
+        return self._add(("string", si), struct.pack(">BH", OP.CP_String, si))
+
+    def name_and_type(self, name: str, desc: str) -> int:
+        ni = self.utf8(name)
+        di = self.utf8(desc)
+        return self._add(("nt", ni, di), struct.pack(">BHH", OP.CP_NameAndType, ni, di))
+
+    def _ref(self, tag: int, owner: str, name: str, desc: str) -> int:
+        ci = self.class_(owner)
+        nt = self.name_and_type(name, desc)
+        return self._add(("ref", tag, ci, nt), struct.pack(">BHH", tag, ci, nt))
+
+    def fieldref(self, owner: str, name: str, desc: str) -> int:
+        return self._ref(OP.CP_Fieldref, owner, name, desc)
+
+    def methodref(self, owner: str, name: str, desc: str) -> int:
+        return self._ref(OP.CP_Methodref, owner, name, desc)
+
+    def interface_methodref(self, owner: str, name: str, desc: str) -> int:
+        return self._ref(OP.CP_InterfaceMethodref, owner, name, desc)
+
+    def to_bytes(self) -> bytes:
+        return struct.pack(">H", self._count) + b"".join(self._chunks)
+
+_BRANCHES = frozenset((
+    OP.IFEQ, OP.IFNE, OP.IFLT, OP.IFGE, OP.IFGT, OP.IFLE,
+    OP.IF_ICMPEQ, OP.IF_ICMPNE, OP.IF_ICMPLT, OP.IF_ICMPGE, OP.IF_ICMPGT, OP.IF_ICMPLE,
+    OP.GOTO,
+))
+
+class CodeBuilder:
+    """
+    Assembler mínimo de bytecode. Desvios usam rótulos (str) resolvidos em
+    `assemble()`; referências a membros entram na CP do ClassBuilder dono.
+    """
+    def __init__(self, cp: ConstantPoolWriter, max_stack: int, max_locals: int):
+        self.cp = cp
+        self.max_stack = max_stack
+        self.max_locals = max_locals
+        self.code = bytearray()
+        self._labels: Dict[str, int] = {}
+        self._fixups: List[Tuple[int, str]] = []  # (pc da instrução, rótulo)
+        self.line_numbers: List[Tuple[int, int]] = []  # (start_pc, line)
+        self.insns: int = 0  # instruções emitidas (para contagens analíticas)
+
+    def pc(self) -> int:
+        return len(self.code)
+
+    def op(self, opcode: int, *operands: int) -> "CodeBuilder":
+        self.insns += 1
+        self.code.append(opcode)
+        for b in operands:
+            self.code.append(b & 0xFF)
+        return self
+
+    def _op_u2(self, opcode: int, index: int) -> "CodeBuilder":
+        return self.op(opcode, index >> 8, index)
+
+    def label(self, name: str) -> "CodeBuilder":
+        if name in self._labels:
+            raise ValueError(f"rótulo duplicado: {name}")
+        self._labels[name] = self.pc()
+        return self
+
+    def line(self, line_number: int) -> "CodeBuilder":
+        self.line_numbers.append((self.pc(), line_number))
+        return self
+
+    def branch(self, opcode: int, target: str) -> "CodeBuilder":
+        if opcode not in _BRANCHES:
+            raise ValueError(f"opcode 0x{opcode:02x} não é desvio")
+        self._fixups.append((self.pc(), target))
+        return self.op(opcode, 0, 0)
+
+    # ===== Atalhos =====
+    def iconst(self, v: int) -> "CodeBuilder":
+        if -1 <= v <= 5:
+            return self.op(OP.ICONST_0 + v)
+        if -128 <= v <= 127:
+            return self.op(OP.BIPUSH, v)
+        if -32768 <= v <= 32767:
+            return self.op(OP.SIPUSH, v >> 8, v)
+        raise ValueError("iconst fora de sipush; use a CP (ldc não suportado)")
+
+    @staticmethod
+    def _check_local(idx: int) -> None:
+        # o operando é u1; índices maiores exigem `wide`, que o intérprete não executa
+        if not 0 <= idx <= 255:
+            raise ValueError(f"índice de local fora de 0..255 (wide não suportado): {idx}")
+
+    def _local(self, short_base: int, long_op: int, idx: int) -> "CodeBuilder":
+        self._check_local(idx)
+        if idx <= 3:
+            return self.op(short_base + idx)
+        return self.op(long_op, idx)
+
+    def iload(self, idx: int) -> "CodeBuilder":
+        return self._local(OP.ILOAD_0, OP.ILOAD, idx)
+
+    def istore(self, idx: int) -> "CodeBuilder":
+        return self._local(OP.ISTORE_0, OP.ISTORE, idx)
+
+    def aload(self, idx: int) -> "CodeBuilder":
+        return self._local(OP.ALOAD_0, OP.ALOAD, idx)
+
+    def astore(self, idx: int) -> "CodeBuilder":
+        return self._local(OP.ASTORE_0, OP.ASTORE, idx)
+
+    def iinc(self, idx: int, delta: int) -> "CodeBuilder":
+        self._check_local(idx)
+        if not -128 <= delta <= 127:
+            raise ValueError(f"iinc: constante fora de -128..127 (wide não suportado): {delta}")
+        return self.op(OP.IINC, idx, delta)
+
+    def getstatic(self, owner: str, name: str, desc: str) -> "CodeBuilder":
+        return self._op_u2(OP.GETSTATIC, self.cp.fieldref(owner, name, desc))
+
+    def putstatic(self, owner: str, name: str, desc: str) -> "CodeBuilder":
+        return self._op_u2(OP.PUTSTATIC, self.cp.fieldref(owner, name, desc))
+
+    def getfield(self, owner: str, name: str, desc: str) -> "CodeBuilder":
+        return self._op_u2(OP.GETFIELD, self.cp.fieldref(owner, name, desc))
+
+    def putfield(self, owner: str, name: str, desc: str) -> "CodeBuilder":
+        return self._op_u2(OP.PUTFIELD, self.cp.fieldref(owner, name, desc))
+
+    def invokestatic(self, owner: str, name: str, desc: str) -> "CodeBuilder":
+        return self._op_u2(OP.INVOKESTATIC, self.cp.methodref(owner, name, desc))
+
+    def invokespecial(self, owner: str, name: str, desc: str) -> "CodeBuilder":
+        return self._op_u2(OP.INVOKESPECIAL, self.cp.methodref(owner, name, desc))
+
+    def invokevirtual(self, owner: str, name: str, desc: str) -> "CodeBuilder":
+        return self._op_u2(OP.INVOKEVIRTUAL, self.cp.methodref(owner, name, desc))
+
+    def new(self, class_name: str) -> "CodeBuilder":
+        return self._op_u2(OP.NEW, self.cp.class_(class_name))
+
+    def assemble(self) -> bytes:
+        out = bytearray(self.code)
+        for insn_pc, target in self._fixups:
+            if target not in self._labels:
+                raise ValueError(f"rótulo indefinido: {target}")
+            off = self._labels[target] - insn_pc
+            if not (-32768 <= off <= 32767):
+                raise ValueError(f"desvio para {target} fora do alcance de 16 bits")
+            out[insn_pc + 1:insn_pc + 3] = struct.pack(">h", off)
+        return bytes(out)
+
+class _Member:
+    __slots__ = ("access_flags", "name", "desc", "attributes")
+
+    def __init__(self, access_flags: int, name: str, desc: str):
+        self.access_flags = access_flags
+        self.name = name
+        self.desc = desc
+        self.attributes: List[Tuple[str, bytes]] = []
+
+class ClassBuilder:
+    """
+    Gera um .class (major 52) com campos, métodos e atributos Code — o inverso
+    de `read_classfile`, para gerar workloads e fixtures sem javac.
+    Uso:
+        cb = ClassBuilder("Demo")
+        c = cb.code(max_stack=2, max_locals=0)
+        c.iconst(7).op(OP.IRETURN)
+        cb.add_method("run", "()I", c, access=ACC_PUBLIC | ACC_STATIC)
+        data = cb.to_bytes()
+    """
+    def __init__(self, name: str, super_name: Optional[str] = "java/lang/Object",
+                 access_flags: int = FL.ACC_PUBLIC | FL.ACC_SUPER,
+                 interfaces: Optional[List[str]] = None,
+                 major_version: int = 52, minor_version: int = 0):
+        self.cp = ConstantPoolWriter()
+        self.name = name
+        self.super_name = super_name
+        self.access_flags = access_flags
+        self.interfaces = list(interfaces or [])
+        self.major_version = major_version
+        self.minor_version = minor_version
+        self.fields: List[_Member] = []
+        self.methods: List[_Member] = []
+        self.attributes: List[Tuple[str, bytes]] = []
+
+    def code(self, max_stack: int, max_locals: int) -> CodeBuilder:
+        return CodeBuilder(self.cp, max_stack, max_locals)
+
+    def add_field(self, name: str, desc: str, access: int = FL.ACC_STATIC,
+                  constant_value: Union[int, float, str, None] = None) -> None:
+        m = _Member(access, name, desc)
+        if constant_value is not None:
+            if isinstance(constant_value, str):
+                idx = self.cp.string(constant_value)
+            elif desc == "J":
+                idx = self.cp.long_(int(constant_value))
+            elif desc == "F":
+                idx = self.cp.float_(float(constant_value))
+            elif desc == "D":
+                idx = self.cp.double(float(constant_value))
+            else:
+                idx = self.cp.integer(int(constant_value))
+            m.attributes.append(("ConstantValue", struct.pack(">H", idx)))
+        self.fields.append(m)
+
+    def add_method(self, name: str, desc: str, code: Optional[CodeBuilder],
+                   access: int = FL.ACC_PUBLIC | FL.ACC_STATIC,
+                   attributes: Optional[List[Tuple[str, bytes]]] = None) -> None:
+        """`attributes`: atributos extras (nome, info) além do Code."""
+        m = _Member(access, name, desc)
+        if code is not None:
+            m.attributes.append(("Code", self._code_attribute(code)))
+        m.attributes.extend(attributes or [])
+        self.methods.append(m)
+
+    def add_default_constructor(self) -> None:
+        """`<init>()V` que só chama o construtor da superclasse."""
+        c = self.code(max_stack=1, max_locals=1)
+        c.aload(0).invokespecial(self.super_name or "java/lang/Object", "<init>", "()V").op(OP.RETURN)
+        self.add_method("<init>", "()V", c, access=FL.ACC_PUBLIC)
+
+    def add_attribute(self, name: str, info: bytes) -> None:
+        """Atributo de classe arbitrário (ex.: para estressar o parser)."""
+        self.attributes.append((name, bytes(info)))
+
+    def set_source_file(self, filename: str) -> None:
+        self.attributes.append(("SourceFile", struct.pack(">H", self.cp.utf8(filename))))
+
+    def _code_attribute(self, code: CodeBuilder) -> bytes:
+        body = code.assemble()
+        nested: List[Tuple[str, bytes]] = []
+        if code.line_numbers:
+            lnt = struct.pack(">H", len(code.line_numbers)) + b"".join(
+                struct.pack(">HH", pc, ln) for pc, ln in code.line_numbers
+            )
+            nested.append(("LineNumberTable", lnt))
+        return (
+            struct.pack(">HHI", code.max_stack, code.max_locals, len(body))
+            + body
+            + struct.pack(">H", 0)  # exception_table_length
+            + self._attributes_bytes(nested)
+        )
+
+    def _attributes_bytes(self, attrs: List[Tuple[str, bytes]]) -> bytes:
+        out = [struct.pack(">H", len(attrs))]
+        for name, info in attrs:
+            out.append(struct.pack(">HI", self.cp.utf8(name), len(info)))
+            out.append(info)
+        return b"".join(out)
+
+    def _members_bytes(self, members: List[_Member]) -> bytes:
+        out = [struct.pack(">H", len(members))]
+        for m in members:
+            out.append(struct.pack(">HHH", m.access_flags, self.cp.utf8(m.name), self.cp.utf8(m.desc)))
+            out.append(self._attributes_bytes(m.attributes))
+        return b"".join(out)
+
+    def to_bytes(self) -> bytes:
+        this_idx = self.cp.class_(self.name)
+        super_idx = self.cp.class_(self.super_name) if self.super_name else 0
+        iface_idx = [self.cp.class_(i) for i in self.interfaces]
+        # membros e atributos primeiro: eles ainda podem acrescentar entradas à CP
+        fields = self._members_bytes(self.fields)
+        methods = self._members_bytes(self.methods)
+        attrs = self._attributes_bytes(self.attributes)
+        head = struct.pack(">IHH", 0xCAFEBABE, self.minor_version, self.major_version)
+        mid = struct.pack(">HHHH", self.access_flags, this_idx, super_idx, len(iface_idx))
+        mid += b"".join(struct.pack(">H", i) for i in iface_idx)
+        return head + self.cp.to_bytes() + mid + fields + methods + attrs
@@ -1,18 +1,32 @@
+import time
+
+_T_START = time.perf_counter()
+
 import argparse
+import contextlib
+import json
 import os
 import sys
-from typing import List
+from typing import List, Optional, Tuple
 
 from capivara import __version__
-from capivara.util.logging import configure_logger
-from capivara.loader.loader import ClassLoader
-from capivara.util import flags as FL
-from capivara.interp.loop import Interpreter
+
+# Só o necessário para --help/--version e o parser: intérprete, loader, logging
+# e bench são importados sob demanda pelos subcomandos (a CLI é disparada
+# milhares de vezes em pipelines de shell).
 
 EX_OK = 0
+EX_REGRESSION = 1
 EX_USAGE = 64
+EX_DATAERR = 65
 EX_NOINPUT = 66
 EX_UNAVAILABLE = 69
+EX_SOFTWARE = 70
+
+# (classpath absoluto, lazy, ClassLoader) pré-carregado por `serve`; os filhos do daemon o herdam
+_WARM_LOADER = None
+# True nos filhos do daemon: argv vem de um cliente, não do dono do processo
+_IN_DAEMON = False
 
 def _split_classpath(cp: str) -> List[str]:
     return [p for p in cp.split(":") if p]
@@ -28,29 +42,393 @@ def _validate_classpath(paths: List[str]) -> None:
         )
         sys.exit(EX_NOINPUT)
 
+def _load_cost_model(path: str):
+    from capivara.interp.counting import CostModel
+    try:
+        return CostModel.load(path)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"[capivara] ERRO: modelo de custo: {e}\n")
+        sys.exit(EX_USAGE)
+
+def _write_json(path: str, obj) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, sort_keys=True)
+
+def _check_run_args(args: argparse.Namespace) -> bool:
+    checks = (
+        (bool(args.count or args.count_json or args.cost_model) and bool(args.profile or args.profile_json),
+         "--count e --profile são mutuamente exclusivos"),
+        (args.metrics_interval is not None and args.metrics_interval <= 0, "--metrics-interval > 0"),
+        (args.sample_hz <= 0, "--sample-hz > 0"),
+        (args.profile_top < 1, "--profile-top >= 1"),
+        (args.trace_methods_us is not None and args.trace_methods_us < 0, "--trace-methods-us >= 0"),
+        (args.thread_quantum < 1, "--thread-quantum >= 1"),
+        # restore desserializa o arquivo (pickle): um cliente não escolhe o que o daemon carrega
+        (_IN_DAEMON and bool(args.restore or args.checkpoint), "--restore/--checkpoint não são aceitos via daemon"),
+        (args.trace_methods_us is not None and bool(args.count or args.count_json or args.cost_model
+                                                     or args.profile or args.profile_json),
+         "--trace-methods-us não combina com --count/--profile"),
+        (args.green_threads and bool(args.count or args.count_json or args.cost_model or args.profile
+                                     or args.profile_json or args.trace_methods_us is not None),
+         "--green-threads não combina com --count/--profile/--trace-methods-us"),
+    )
+    for bad, msg in checks:
+        if bad:
+            sys.stderr.write(f"[capivara] ERRO: {msg}\n")
+            return False
+    return True
+
+class _Phases:
+    """
+    Fases de startup da CLI: alimentam o --startup-report (nome, duração) e,
+    com --trace-out, viram spans "cli" na timeline.
+    """
+    def __init__(self, tracer=None):
+        self.tracer = tracer
+        self.rows: List[Tuple[str, float]] = []
+        self.first_bytecode: Optional[float] = None
+
+    def add(self, name: str, t0: float, t1: float) -> None:
+        self.rows.append((name, t1 - t0))
+        if self.tracer is not None:
+            self.tracer.complete(name, "cli", t0, t1)
+
+    def detail(self, name: str, dt: float) -> None:
+        """Subdivisão da fase anterior (só no relatório; o tracer já tem os spans do loader)."""
+        self.rows.append(("  " + name, dt))
+
+    @contextlib.contextmanager
+    def __call__(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, t0, time.perf_counter())
+
+    def format(self) -> str:
+        lines = ["[capivara] startup (ms):"]
+        for name, dt in self.rows:
+            lines.append(f"  {name:<24} {dt * 1e3:>9.3f}")
+        if self.first_bytecode is not None:
+            lines.append(f"  {'1º bytecode (acumulado)':<24} {(self.first_bytecode - _T_START) * 1e3:>9.3f}")
+        return "\n".join(lines)
+
 def _cmd_run(args: argparse.Namespace) -> int:
-    logger = configure_logger(args.loglevel)
+    if args.daemon:
+        from capivara.cli.daemon import run_client
+        return run_client(args.daemon, _without_daemon(args.argv))
+    tracer = None
+    if args.trace_out:
+        from capivara.util.trace import Tracer
+        tracer = Tracer(origin=_T_START)
+    phase = _Phases(tracer)
+    phase.add("cli_import", _T_START, args.t_main)
+    phase.add("parse_args", args.t_main, args.t_parsed)
+
+    try:
+        with phase("configure_logger"):
+            from capivara.util.logging import configure_logger
+            logger = configure_logger(args.loglevel)
+        with phase("validate_classpath"):
+            classpath = _split_classpath(args.classpath)
+            _validate_classpath(classpath)
+
+        main_bin = _normalize_main(args.main_class)
+        logger.info("CapivaraVM %s bootstrap OK.", __version__)
+        logger.info("Main class requisitada: %s", main_bin)
+        logger.info("Classpath: %s", classpath)
+
+        if args.entry and args.desc:
+            if not _check_run_args(args):
+                return EX_USAGE
+            return _run_entry(args, classpath, main_bin, logger, tracer, phase)
+
+        sys.stderr.write(
+            "CapivaraVM: interpretador ainda não implementado para 'main' padrão "
+            "(sem --entry/--desc neste passo). Argumentos aceitos e validados.\n"
+        )
+        return EX_UNAVAILABLE
+    finally:
+        if tracer is not None:
+            tracer.write(args.trace_out)
+        if args.startup_report:
+            sys.stderr.write(phase.format() + "\n")
+
+def _format_result(res, heap) -> str:
+    """Texto do `RET:`: primitivos como valor; arrays convertidos (ver `capivara.interp.convert`); objetos como classe@id."""
+    if res.kind == "int":
+        return str(res.int_value)
+    if res.kind != "ref":
+        return str(res.value)
+    if res.value is None:
+        return "null"
+    from capivara.interp.convert import array_to_python
+    from capivara.runtime.heap import VMArray
+    obj = heap.get(res.value)
+    if isinstance(obj, VMArray):
+        return repr(array_to_python(heap, res.value))
+    return f"{obj.class_name}@{res.value:x}"
+
+def _run_entry(args: argparse.Namespace, classpath: List[str], main_bin: str, logger, tracer, phase: _Phases) -> int:
+    cost_model = _load_cost_model(args.cost_model) if args.cost_model else None
+    counting = args.count or args.count_json or cost_model is not None
+    profiling = args.profile or args.profile_json
+
+    with phase("interpreter_import"):
+        from capivara.loader.loader import ClassLoader
+        from capivara.interp.loop import Interpreter
+
+    with phase("setup"):
+        ld = _warm_loader(classpath, args) or ClassLoader(classpath, lazy=args.lazy)
+        ld.tracer = tracer
+        interp = Interpreter(ld)
+        if args.green_threads:
+            interp.enable_green_threads(args.thread_quantum)
+        counters = interp.enable_counting() if counting else None
+        profiler = interp.enable_profiling() if profiling else None
+        if tracer is not None and args.trace_methods_us is not None:
+            from capivara.util.trace import trace_invocations
+            trace_invocations(interp, tracer, args.trace_methods_us / 1e6)
+        exporter = None
+        if args.metrics_out:
+            from capivara.interp.metrics import MetricsExporter
+            if not (counting or profiling or interp.hooks):
+                interp.enable_metrics()
+            exporter = MetricsExporter(interp, args.metrics_out, args.metrics_format,
+                                       args.metrics_interval).start()
+        sampler = None
+        if args.sample_out:
+            from capivara.interp.sampler import SamplingProfiler
+            sampler = SamplingProfiler(hz=args.sample_hz).start()
+
+    try:
+        if args.restore:
+            from capivara.loader.snapshot import restore_snapshot
+            try:
+                with phase("restore"):
+                    n = restore_snapshot(ld, args.restore)
+            except OSError as e:
+                sys.stderr.write(f"[capivara] ERRO: snapshot: {e}\n")
+                return EX_NOINPUT
+            except ValueError as e:
+                sys.stderr.write(f"[capivara] ERRO: {e}\n")
+                return EX_DATAERR
+            logger.info("Snapshot restaurado: %d classes <- %s", n, args.restore)
+        # carga da main class (com superclasses): leitura+parse e link vêm de ld.stats
+        st = ld.stats
+        t0, io0, link0 = time.perf_counter(), st.read_s + st.parse_s, st.link_s
+        rc = ld.load_class(main_bin)
+        t1 = time.perf_counter()
+        phase.add("main_class_load", t0, t1)
+        phase.detail("leitura+parse", st.read_s + st.parse_s - io0)
+        phase.detail("link", st.link_s - link0)
+        with phase("initialize"):
+            interp.initialize_class(rc)
+        if args.checkpoint:
+            from capivara.loader.snapshot import save_snapshot
+            with phase("checkpoint"):
+                size = save_snapshot(ld, args.checkpoint)
+            logger.info("Snapshot gravado: %d classes, %d bytes -> %s", len(ld.loaded), size, args.checkpoint)
+        with phase("prepare_entry"):
+            code, frame = interp.prepare_method(rc, args.entry, args.desc)
+        phase.first_bytecode = time.perf_counter()
+        with phase("execute"):
+            res = interp.execute_frame(rc, code, frame)
+    finally:
+        if exporter is not None:
+            exporter.stop()
+        if sampler is not None:
+            sampler.stop()
+            sampler.write_collapsed(args.sample_out)
+            logger.info("Amostras: %d (%.1f ms amostrando) -> %s",
+                        sampler.samples, sampler.sample_time_s * 1e3, args.sample_out)
+    if res.kind != "void":
+        print(f"RET: {_format_result(res, ld.heap)}")
+
+    with phase("reports"):
+        if counters is not None:
+            from capivara.interp.counting import format_counts
+            interp.disable_counting()
+            report = counters.report(cost_model)
+            if args.count_json:
+                _write_json(args.count_json, report)
+            if args.count:
+                sys.stderr.write(format_counts(report) + "\n")
+        if profiler is not None:
+            from capivara.interp.profiler import format_profile
+            interp.disable_profiling()
+            report = profiler.report(top=args.profile_top)
+            if args.profile_json:
+                _write_json(args.profile_json, report)
+            if args.profile:
+                sys.stderr.write(format_profile(report) + "\n")
+    return EX_OK
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    from capivara.bench import regress
+    if args.startup:
+        from capivara.bench import startup as bench
+    else:
+        from capivara.bench import interp as bench
+
+    if args.startup and (args.count or args.cost_model):
+        sys.stderr.write("[capivara] ERRO: --startup e --count são mutuamente exclusivos\n")
+        return EX_USAGE
+    unknown = [k for k in args.kernels or () if k not in bench.KERNELS]
+    if unknown:
+        sys.stderr.write(f"[capivara] ERRO: kernel desconhecido: {', '.join(unknown)} "
+                         f"(válidos: {', '.join(bench.KERNELS)})\n")
+        return EX_USAGE
+    if args.scale <= 0 or args.repeat < 1 or args.warmup < 0:
+        sys.stderr.write("[capivara] ERRO: --scale > 0, --repeat >= 1 e --warmup >= 0\n")
+        return EX_USAGE
+    if args.threshold < 0 or not 0 < args.alpha < 1:
+        sys.stderr.write("[capivara] ERRO: --threshold >= 0 e 0 < --alpha < 1\n")
+        return EX_USAGE
+    if args.baseline and not args.history:
+        sys.stderr.write("[capivara] ERRO: --baseline requer --history\n")
+        return EX_USAGE
+    if args.baseline and args.repeat < 2 and not (args.count or args.cost_model):
+        sys.stderr.write("[capivara] ERRO: comparação com baseline requer --repeat >= 2\n")
+        return EX_USAGE
+    cost_model = _load_cost_model(args.cost_model) if args.cost_model else None
+    count = args.count or cost_model is not None
+
+    baseline = None
+    if args.baseline:
+        try:
+            history = regress.load_history(args.history)
+        except ValueError as e:
+            sys.stderr.write(f"[capivara] ERRO: {e}\n")
+            return EX_NOINPUT
+        suite = "startup" if args.startup else "interp-count" if count else "interp"
+        baseline = regress.baseline_samples(history, args.baseline, suite=suite, scale=args.scale)
+        if baseline is None:
+            sys.stderr.write(f"[capivara] ERRO: baseline '{args.baseline}' não encontrada em {args.history}\n")
+            return EX_NOINPUT
+
+    if count:
+        report = bench.count_kernels(args.kernels, scale=args.scale, cost_model=cost_model)
+    else:
+        report = bench.run_kernels(args.kernels, warmup=args.warmup, repeat=args.repeat, scale=args.scale)
+
+    rows = []
+    if baseline is not None:
+        rows = regress.compare_report(report, baseline, args.threshold, args.alpha)
+        report["comparison"] = {"baseline": args.baseline, "threshold": args.threshold,
+                                "alpha": args.alpha, "kernels": rows}
+    print(json.dumps(report, sort_keys=True) if args.json else bench.format_text(report))
+    if rows and not args.json:
+        print(regress.format_comparison(rows, args.baseline))
+
+    if args.history:
+        regress.append_history(args.history, regress.make_entry(report, args.rev or regress.git_revision()))
+
+    regressed = [c["kernel"] for c in rows if c["verdict"] == "regression"]
+    if regressed:
+        sys.stderr.write(f"[capivara] REGRESSÃO acima de {args.threshold:.0%} em: {', '.join(regressed)}\n")
+        return EX_REGRESSION
+    return EX_OK
+
+def _without_daemon(argv: List[str]) -> List[str]:
+    out, skip = [], False
+    for a in argv:
+        if skip:
+            skip = False
+        elif a == "--daemon":
+            skip = True
+        elif not a.startswith("--daemon="):
+            out.append(a)
+    return out
+
+def _warm_loader(classpath: List[str], args: argparse.Namespace):
+    """Loader pré-carregado pelo daemon, se servir para esta execução (só no filho do fork)."""
+    if _WARM_LOADER is None or args.restore:
+        return None
+    cp, lazy, ld = _WARM_LOADER
+    if lazy != args.lazy or cp != [os.path.abspath(p) for p in classpath]:
+        return None
+    return ld
+
+def _daemon_run(argv: List[str]) -> int:
+    # roda num filho do daemon: o "import da CLI" desta execução é o fork
+    global _T_START, _IN_DAEMON
+    _T_START = time.perf_counter()
+    _IN_DAEMON = True
+    try:
+        main(argv)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else EX_USAGE)
+    return EX_OK
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    global _WARM_LOADER
     classpath = _split_classpath(args.classpath)
     _validate_classpath(classpath)
+    if args.workers is not None and args.workers < 1:
+        sys.stderr.write("[capivara] ERRO: --workers >= 1\n")
+        return EX_USAGE
+    from capivara.cli import daemon
+    from capivara.interp.batch import default_workers
+    from capivara.interp.loop import Interpreter  # noqa: F401  (importado antes do fork)
+    from capivara.loader.loader import ClassLoader
 
-    main_bin = _normalize_main(args.main_class)
-    logger.info("CapivaraVM %s bootstrap OK.", __version__)
-    logger.info("Main class requisitada: %s", main_bin)
-    logger.info("Classpath: %s", classpath)
+    ld = ClassLoader(classpath, lazy=args.lazy)
+    for name in args.preload or ():
+        try:
+            ld.load_class(_normalize_main(name))
+        except (FileNotFoundError, ValueError) as e:
+            sys.stderr.write(f"[capivara] ERRO: --preload {name}: {e}\n")
+            return EX_NOINPUT
+    _WARM_LOADER = ([os.path.abspath(p) for p in classpath], args.lazy, ld)
+    return daemon.serve(args.socket, args.workers or default_workers(), _daemon_run)
 
-    if args.entry and args.desc:
-        ld = ClassLoader(classpath)
-        interp = Interpreter(ld)
-        res = interp.execute_static_entry(main_bin, args.entry, args.desc)
-        if res.kind == "int":
-            print(f"RET: {res.int_value}")
-        return EX_OK
-
-    sys.stderr.write(
-        "CapivaraVM: interpretador ainda não implementado para 'main' padrão "
-        "(sem --entry/--desc neste passo). Argumentos aceitos e validados.\n"
-    )
-    return EX_UNAVAILABLE
+def _cmd_run_batch(args: argparse.Namespace) -> int:
+    classpath = _split_classpath(args.classpath)
+    _validate_classpath(classpath)
+    if (args.workers is not None and args.workers < 1) or args.chunksize < 1:
+        sys.stderr.write("[capivara] ERRO: --workers >= 1 e --chunksize >= 1\n")
+        return EX_USAGE
+    from capivara.interp.batch import parse_arg_lines, run_batch
+
+    try:
+        src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    except OSError as e:
+        sys.stderr.write(f"[capivara] ERRO: entrada: {e}\n")
+        return EX_NOINPUT
+    failed = 0
+    with src:
+        try:
+            results = run_batch(classpath, _normalize_main(args.main_class), args.entry, args.desc,
+                                parse_arg_lines(src), workers=args.workers, chunksize=args.chunksize,
+                                lazy=args.lazy)
+        except ValueError as e:
+            sys.stderr.write(f"[capivara] ERRO: {e}\n")
+            return EX_USAGE
+        except (FileNotFoundError, LookupError) as e:
+            sys.stderr.write(f"[capivara] ERRO: {e}\n")
+            return EX_NOINPUT
+        out = sys.stdout
+        try:
+            for r in results:
+                if r.error is not None:
+                    failed += 1
+                if args.json:
+                    row = {"args": list(r.args)}
+                    row.update({"error": r.error} if r.error is not None else {"ret": r.value})
+                    out.write(json.dumps(row) + "\n")
+                elif r.error is not None:
+                    out.write(f"ERRO: {r.error}\n")
+                else:
+                    out.write(f"{'void' if r.value is None else r.value}\n")
+        except ValueError as e:
+            out.flush()
+            sys.stderr.write(f"[capivara] ERRO: {e}\n")
+            return EX_DATAERR
+    if failed:
+        sys.stderr.write(f"[capivara] {failed} chamada(s) falharam\n")
+        return EX_SOFTWARE
+    return EX_OK
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -71,13 +449,112 @@ def build_parser() -> argparse.ArgumentParser:
     p_run.add_argument("--log", dest="loglevel", default=None, help="Nível de log.")
     p_run.add_argument("--entry", help="Nome do método a executar (ex.: run).")
     p_run.add_argument("--desc", help="Descritor do método (ex.: ()I, (I)I, ()V).")
+    p_run.add_argument("--lazy", action="store_true", help="Parse lazy dos .class (Code/Utf8 sob demanda).")
+    p_run.add_argument("--count", action="store_true",
+                       help="Modo de contagem determinística: bytecodes, invocações, alocações e cargas por método (stderr).")
+    p_run.add_argument("--count-json", metavar="ARQ", help="Grava o relatório de contagem em JSON (implica --count).")
+    p_run.add_argument("--cost-model", metavar="ARQ",
+                       help='Modelo de custo JSON por opcode (ex.: {"default": 1, "invokestatic": 10}); implica contagem.')
+    p_run.add_argument("--profile", action="store_true",
+                       help="Profiler por método: invocações, tempo self/inclusivo, opcodes e offsets mais quentes (stderr).")
+    p_run.add_argument("--profile-json", metavar="ARQ", help="Grava o relatório do profiler em JSON (implica --profile).")
+    p_run.add_argument("--profile-top", type=int, default=10, metavar="N", help="Métodos mais quentes no relatório (default 10).")
+    p_run.add_argument("--sample-out", metavar="ARQ",
+                       help="Profiler por amostragem: grava pilhas Java no formato collapsed (flamegraph.pl/speedscope).")
+    p_run.add_argument("--sample-hz", type=float, default=100.0, help="Frequência de amostragem (default 100 Hz).")
+    p_run.add_argument("--metrics-out", metavar="ARQ",
+                       help="Grava métricas de runtime (classes, parse/link, bytecodes, invocações, heap, GC) ao sair.")
+    p_run.add_argument("--metrics-format", choices=("json", "prometheus"), default="json",
+                       help="Formato das métricas (default json).")
+    p_run.add_argument("--metrics-interval", type=float, metavar="SEG",
+                       help="Regrava as métricas a cada SEG segundos durante a execução.")
+    p_run.add_argument("--trace-out", metavar="ARQ",
+                       help="Timeline Chrome trace-event (Perfetto/chrome://tracing): fases da CLI, load_class, read_classfile, link.")
+    p_run.add_argument("--trace-methods-us", type=float, metavar="US",
+                       help="Com --trace-out, inclui invocações Java que durarem pelo menos US microssegundos.")
+    p_run.add_argument("--green-threads", action="store_true",
+                       help="Habilita java/lang/Thread: threads verdes com preempção por quantum de bytecodes.")
+    p_run.add_argument("--thread-quantum", type=int, default=10_000, metavar="N",
+                       help="Bytecodes por fatia de tempo de cada thread verde (default 10000).")
+    p_run.add_argument("--checkpoint", metavar="ARQ",
+                       help="Depois da carga e do <clinit> da main class, grava um snapshot (classes, estáticos, heap, strings).")
+    p_run.add_argument("--restore", metavar="ARQ",
+                       help="Restaura um snapshot de --checkpoint antes de rodar: pula carga, link e inicialização estática. "
+                            "Só aceita snapshots assinados com a chave local (ver capivara.loader.snapshot).")
+    p_run.add_argument("--daemon", metavar="SOCKET",
+                       help="Executa no daemon de `capivara serve` escutando em SOCKET (classes já carregadas).")
+    p_run.add_argument("--startup-report", action="store_true",
+                       help="Tempo (stderr) de cada fase de startup: import do intérprete, classpath, carga/link/<clinit> da main class, 1º bytecode.")
     p_run.set_defaults(func=_cmd_run)
+
+    p_serve = subparsers.add_parser(
+        "serve",
+        help="Daemon com classes pré-carregadas para `run --daemon`.",
+        description="Carrega as classes de --preload uma vez e atende `capivara run --daemon SOCKET`: "
+                    "cada execução roda num processo filho (fork) com stdout/stderr e código de saída "
+                    "repassados ao cliente. Termina com SIGTERM/SIGINT.",
+    )
+    p_serve.add_argument("--socket", required=True, metavar="CAMINHO", help="Socket Unix a escutar.")
+    p_serve.add_argument("--cp", "--classpath", dest="classpath", default=".", help="Classpath (dirs/jars separados por ':').")
+    p_serve.add_argument("--preload", action="append", metavar="CLASSE",
+                         help="Classe a carregar e linkar antes de atender (repetível; superclasses vêm junto).")
+    p_serve.add_argument("--lazy", action="store_true", help="Parse lazy dos .class.")
+    p_serve.add_argument("--workers", type=int, metavar="N", help="Execuções simultâneas (default: nº de CPUs).")
+    p_serve.set_defaults(func=_cmd_serve)
+
+    p_batch = subparsers.add_parser(
+        "run-batch",
+        help="Chama uma entrada static para cada linha de argumentos, em processos paralelos.",
+        description="Carrega e inicializa a classe uma vez, faz fork de N workers e chama o método "
+                    "para cada linha da entrada (ints separados por espaço ou vírgula). "
+                    "Os resultados saem na ordem da entrada, um por linha.",
+    )
+    p_batch.add_argument("main_class", help="Nome da classe (ex.: pkg.Main).")
+    p_batch.add_argument("--cp", "--classpath", dest="classpath", default=".", help="Classpath (dirs/jars separados por ':').")
+    p_batch.add_argument("--entry", required=True, help="Método static a chamar.")
+    p_batch.add_argument("--desc", required=True, help="Descritor (params int; retorno int ou void), ex.: (II)I.")
+    p_batch.add_argument("--input", default="-", metavar="ARQ", help="Arquivo de argumentos (default '-': stdin).")
+    p_batch.add_argument("--workers", type=int, metavar="N", help="Processos worker (default: nº de CPUs).")
+    p_batch.add_argument("--chunksize", type=int, default=64, metavar="N",
+                         help="Linhas enviadas por vez a cada worker (default 64).")
+    p_batch.add_argument("--lazy", action="store_true", help="Parse lazy dos .class.")
+    p_batch.add_argument("--json", action="store_true", help='Uma linha JSON por chamada: {"args": [...], "ret"|"error": ...}.')
+    p_batch.set_defaults(func=_cmd_run_batch)
+
+    p_bench = subparsers.add_parser(
+        "bench",
+        help="Microbenchmarks do intérprete.",
+        description="Roda kernels fixos (laços, chamadas, despacho, campos, alocação) e reporta bytecodes/s, chamadas/s e tempo.",
+    )
+    p_bench.add_argument("--kernel", dest="kernels", action="append",
+                         help="Kernel a rodar (repetível; default: todos).")
+    p_bench.add_argument("--warmup", type=int, default=1, help="Execuções de aquecimento descartadas (default 1).")
+    p_bench.add_argument("--repeat", type=int, default=5, help="Repetições medidas (default 5).")
+    p_bench.add_argument("--scale", type=float, default=1.0, help="Multiplicador do tamanho dos kernels (default 1.0).")
+    p_bench.add_argument("--json", action="store_true", help="Saída JSON (uma linha).")
+    p_bench.add_argument("--count", action="store_true",
+                         help="Custo determinístico (contagem de bytecodes) em vez de tempo de parede.")
+    p_bench.add_argument("--cost-model", metavar="ARQ", help="Modelo de custo JSON por opcode (implica --count).")
+    p_bench.add_argument("--startup", action="store_true",
+                         help="Mede o startup da CLI (--version, --help, run mínimo) em processos novos.")
+    p_bench.add_argument("--history", help="Histórico JSON lines: a execução é anexada, chaveada pela revisão git.")
+    p_bench.add_argument("--rev", help="Revisão gravada no histórico (default: git rev-parse --short HEAD).")
+    p_bench.add_argument("--baseline", metavar="REV",
+                         help="Compara com as amostras da revisão REV do histórico ('last': a mais recente); sai com 1 se houver regressão.")
+    p_bench.add_argument("--threshold", type=float, default=0.05,
+                         help="Aumento relativo de tempo tolerado antes de acusar regressão (default 0.05).")
+    p_bench.add_argument("--alpha", type=float, default=0.05,
+                         help="Nível de significância do teste t de Welch (default 0.05).")
+    p_bench.set_defaults(func=_cmd_bench)
     return parser
 
 def main(argv: List[str] | None = None) -> None:
+    t_main = time.perf_counter()
     parser = build_parser()
     try:
         args = parser.parse_args(argv)
+        args.t_main, args.t_parsed = t_main, time.perf_counter()
+        args.argv = list(sys.argv[1:] if argv is None else argv)
         exit_code = args.func(args)
         sys.exit(exit_code)
     except AttributeError:
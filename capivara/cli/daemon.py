@@ -0,0 +1,185 @@
+"""
+Daemon da CLI (`capivara serve`) e cliente de `capivara run --daemon`.
+
+O daemon importa o intérprete e carrega (lê, parseia e linka) as classes
+pedidas em `--preload` uma vez, e então escuta num socket Unix. Cada pedido
+roda num processo filho criado por fork: o filho herda o loader aquecido
+(copy-on-write, como em `capivara.interp.batch`), executa o `run` com a argv
+e o diretório do cliente, e morre. Nada do que uma execução faz (estáticos,
+<clinit>, heap) vaza para a seguinte, e pedidos simultâneos rodam em
+paralelo, até `--workers` filhos.
+
+Protocolo: o cliente manda uma linha JSON `{"argv": [...], "cwd": "..."}`;
+o daemon responde com quadros `canal (1 byte) + tamanho (u4 big-endian) +
+dados`, canais b"1" (stdout), b"2" (stderr) e b"x" (código de saída, texto).
+"""
+from __future__ import annotations
+import gc
+import io
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+import traceback
+from typing import Callable, List
+
+EX_UNAVAILABLE = 69
+EX_SOFTWARE = 70
+
+OUT, ERR, EXIT = b"1", b"2", b"x"
+
+def _send(sock: socket.socket, chan: bytes, data: bytes) -> None:
+    sock.sendall(chan + len(data).to_bytes(4, "big") + data)
+
+def _recv_exact(f, n: int) -> bytes:
+    data = f.read(n)
+    if len(data) != n:
+        raise EOFError("conexão com o daemon fechada no meio de um quadro")
+    return data
+
+class _FrameWriter(io.RawIOBase):
+    """Saída de um canal: cada write vira um quadro no socket."""
+    def __init__(self, sock: socket.socket, chan: bytes):
+        self.sock = sock
+        self.chan = chan
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        _send(self.sock, self.chan, bytes(b))
+        return len(b)
+
+def _text_stream(sock: socket.socket, chan: bytes) -> io.TextIOWrapper:
+    return io.TextIOWrapper(io.BufferedWriter(_FrameWriter(sock, chan)), encoding="utf-8",
+                            line_buffering=True)
+
+# ===== cliente =====
+def run_client(path: str, argv: List[str]) -> int:
+    """Manda `argv` (sem --daemon) ao daemon em `path` e repassa stdout/stderr; devolve o código de saída."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError as e:
+        sys.stderr.write(f"[capivara] ERRO: daemon indisponível em {path}: {e}\n")
+        return EX_UNAVAILABLE
+    with sock:
+        sock.sendall(json.dumps({"argv": argv, "cwd": os.getcwd()}).encode("utf-8") + b"\n")
+        f = sock.makefile("rb")
+        out, err = sys.stdout.buffer, sys.stderr.buffer
+        while True:
+            head = f.read(5)
+            if len(head) < 5:
+                sys.stderr.write("[capivara] ERRO: daemon fechou a conexão sem código de saída\n")
+                return EX_SOFTWARE
+            chan = head[:1]
+            data = _recv_exact(f, int.from_bytes(head[1:], "big"))
+            if chan == EXIT:
+                out.flush()
+                err.flush()
+                return int(data)
+            (out if chan == OUT else err).write(data)
+            if chan == ERR:
+                err.flush()
+
+# ===== servidor =====
+def _serve_one(conn: socket.socket, run: Callable[[List[str]], int]) -> int:
+    """No filho: lê o pedido, roda com stdout/stderr no socket e devolve o código de saída."""
+    code = EX_SOFTWARE
+    out = err = None
+    try:
+        req = json.loads(conn.makefile("rb").readline())
+        argv = req["argv"]
+        os.chdir(req["cwd"])
+        out, err = _text_stream(conn, OUT), _text_stream(conn, ERR)
+        sys.stdout, sys.stderr = out, err
+        if not argv or argv[0] != "run":
+            err.write("[capivara] ERRO: o daemon só executa 'run'\n")
+            code = 64
+        else:
+            code = run(argv)
+    except Exception:
+        stream = err or _text_stream(conn, ERR)
+        stream.write(traceback.format_exc())
+        stream.flush()
+    finally:
+        for s in (out, err):
+            if s is not None:
+                s.flush()
+        try:
+            _send(conn, EXIT, str(code).encode())
+        except OSError:
+            pass
+    return code
+
+def serve(path: str, workers: int, run: Callable[[List[str]], int], log=sys.stderr) -> int:
+    """Aceita pedidos em `path` até SIGTERM/SIGINT; cada um roda `run(argv)` num filho."""
+    if os.path.lexists(path):
+        st = os.lstat(path)
+        if st.st_uid != os.getuid() or not stat.S_ISSOCK(st.st_mode):
+            # não apagamos nem reusamos o caminho de outro usuário (ou que não é socket)
+            log.write(f"[capivara] ERRO: {path} existe e não é um socket deste usuário\n")
+            return EX_UNAVAILABLE
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)  # socket órfão de um daemon que morreu
+        else:
+            probe.close()
+            log.write(f"[capivara] ERRO: já há um daemon escutando em {path}\n")
+            return EX_UNAVAILABLE
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # só o dono conecta: quem conecta executa classes com os privilégios do daemon
+    old_umask = os.umask(0o177)  # sem janela com as permissões do umask entre bind e chmod
+    try:
+        listener.bind(path)
+    finally:
+        os.umask(old_umask)
+    os.chmod(path, 0o600)
+    listener.listen(max(16, workers))
+    children = set()
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    old = {s: signal.signal(s, stop) for s in (signal.SIGTERM, signal.SIGINT)}
+    gc.freeze()  # metadados pré-carregados ficam compartilhados com os filhos
+    log.write(f"[capivara] serve: escutando em {path} (até {workers} execuções simultâneas)\n")
+    log.flush()
+    try:
+        while True:
+            while children:  # recolhe filhos que já terminaram
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+                if pid == 0:
+                    break
+                children.discard(pid)
+            if len(children) >= workers:
+                pid, _ = os.wait()
+                children.discard(pid)
+            conn, _ = listener.accept()
+            pid = os.fork()
+            if pid == 0:
+                for s in old:
+                    signal.signal(s, signal.SIG_DFL)
+                listener.close()
+                os._exit(_serve_one(conn, run))
+            children.add(pid)
+            conn.close()
+    except SystemExit:
+        return 0
+    finally:
+        for s, h in old.items():
+            signal.signal(s, h)
+        listener.close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
@@ -0,0 +1,138 @@
+"""
+Modo asyncio do intérprete (`Interpreter.enable_async`).
+
+As threads verdes (ver `capivara.interp.threads`) já guardam a pilha Java em
+geradores que cedem a cada `quantum` bytecodes; aqui o escalonador roda como
+uma tarefa do event loop e faz `await asyncio.sleep(0)` depois de cada
+fatia. Uma chamada Java longa custa latência às outras tarefas do serviço,
+mas não as congela, e não é preciso uma thread do SO por VM.
+
+Cada `execute_*_async` vira uma thread verde: chamadas simultâneas no mesmo
+Interpreter se intercalam e compartilham estáticos, heap e locks, como
+threads de uma JVM. Cancelar quem espera não interrompe o código Java, que
+roda até o fim.
+
+Nativos bloqueantes (Thread.sleep, capivara/io/Channel) estacionam só a
+thread Java corrente: a operação roda como tarefa asyncio (`aread`/`awrite`
+do canal ou, sem elas, `read`/`write` num executor) e, ao terminar, a thread
+volta à fila. O <clinit> continua síncrono e atômico.
+
+    interp.enable_async(quantum=2_000)
+    res = await interp.execute_static_entry_async("pkg/Main", "run", "()I")
+"""
+from __future__ import annotations
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterator, Optional
+
+from capivara.interp.threads import GreenScheduler, GreenThread
+
+class AsyncScheduler(GreenScheduler):
+    """Escalonador das threads verdes dirigido por uma tarefa do event loop."""
+    def __init__(self, interp, quantum: int = 10_000):
+        super().__init__(interp, quantum)
+        self.io_pending = 0         # nativos bloqueantes em andamento
+        self.io_waits = 0           # nativos que estacionaram uma thread
+        self._futures: Dict[int, asyncio.Future] = {}  # tid -> resultado de um execute_*_async
+        self._driver: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Future] = None
+
+    def run_main(self, rc, code, frame):
+        raise RuntimeError("modo asyncio: use execute_frame_async / execute_method_async")
+
+    async def run_main_async(self, rc, code, frame):
+        """Roda o frame como uma nova thread verde e espera o seu ExecResult."""
+        loop = asyncio.get_running_loop()
+        t = self.spawn(self.interp._green_run_frame(rc, code, frame), f"async-{self.threads}")
+        fut = self._futures[t.tid] = loop.create_future()
+        if self._driver is None or self._driver.done():
+            self._driver = loop.create_task(self._drive())
+        else:
+            self._poke()
+        return await fut
+
+    def sleep(self, seconds: float) -> Iterator:
+        # o prazo fica com o event loop: sem timers próprios no escalonador
+        return self.block_on(lambda: time.sleep(seconds), lambda: asyncio.sleep(seconds))
+
+    def block_on(self, call: Callable[[], object], acall: Optional[Callable[[], Awaitable]]) -> Iterator:
+        t = self.current
+        aw = acall() if acall is not None else asyncio.get_running_loop().run_in_executor(None, call)
+        task = asyncio.ensure_future(aw)
+        self.io_pending += 1
+        self.io_waits += 1
+
+        def done(_) -> None:
+            self.io_pending -= 1
+            self.unpark(t)
+        task.add_done_callback(done)  # roda no loop, sempre depois do park abaixo
+        yield from self.park()
+        return task.result()
+
+    def unpark(self, t: GreenThread) -> None:
+        super().unpark(t)
+        self._poke()
+
+    def _poke(self) -> None:
+        w = self._wake
+        if w is not None and not w.done():
+            w.set_result(None)
+
+    def _finish(self, t: GreenThread, result, exc: Optional[BaseException]) -> None:
+        super()._finish(t, result, exc)
+        fut = self._futures.pop(t.tid, None)
+        if fut is not None and not fut.done():
+            if exc is None:
+                fut.set_result(result)
+            else:
+                fut.set_exception(exc)
+
+    async def _drive(self) -> None:
+        loop = asyncio.get_running_loop()
+        ready = self.ready
+        try:
+            while True:
+                if ready:
+                    self._slice(ready.popleft())
+                    await asyncio.sleep(0)  # cede ao event loop a cada fatia
+                elif self.io_pending:
+                    self._wake = loop.create_future()
+                    await self._wake
+                    self._wake = None
+                else:
+                    break
+        finally:
+            self._wake = None
+        if self.blocked:
+            # ninguém pode acordá-las: falha quem espera, como `run` levanta no modo síncrono
+            err = self._deadlock()
+            try:
+                for t in self.blocked.values():
+                    fut = self._futures.pop(t.tid, None)
+                    if fut is not None and not fut.done():
+                        fut.set_exception(err)
+            finally:
+                # descartadas: o próximo execute_*_async não as herda nem acusa deadlock de novo
+                for t in self.blocked.values():
+                    t.state = "terminated"
+                    t.gen = None
+                self.blocked.clear()
+
+class StreamChannel:
+    """Canal de capivara/io/Channel sobre um par (StreamReader, StreamWriter) do asyncio."""
+    def __init__(self, reader: Optional[asyncio.StreamReader], writer: Optional[asyncio.StreamWriter] = None):
+        self.reader = reader
+        self.writer = writer
+
+    async def aread(self, n: int) -> bytes:
+        return await self.reader.read(n)
+
+    async def awrite(self, b: bytes) -> int:
+        self.writer.write(b)
+        await self.writer.drain()
+        return len(b)
+
+    def read(self, n: int) -> bytes:
+        raise RuntimeError("StreamChannel só funciona no modo asyncio")
+
+    write = read
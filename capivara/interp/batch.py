@@ -0,0 +1,135 @@
+"""
+Execução em lote de uma entrada static (`capivara run-batch`): o mesmo
+método Java chamado com muitos conjuntos de argumentos int, espalhados por
+processos worker.
+
+O processo pai carrega e inicializa a classe (e as que o <clinit> puxar),
+resolve o método e só então faz fork dos workers: cada worker herda o
+loader já aquecido e nunca relê um .class. Antes do fork, `gc.freeze()` move
+os objetos existentes (metadados de classe, pool de constantes, código) para
+a geração permanente: o coletor dos workers não os percorre, e as páginas
+deles não são copiadas só porque uma coleta escreveu nos cabeçalhos de GC.
+
+Cada worker é uma VM independente: estáticos e heap alterados por uma
+chamada são vistos pelas chamadas seguintes do mesmo worker, nunca pelos
+outros. Resultados voltam na ordem da entrada (`Pool.imap`), conforme ficam
+prontos. Sem fork (ou com workers=1), o lote roda no próprio processo.
+"""
+from __future__ import annotations
+import gc
+import multiprocessing
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+from capivara.interp.loop import Interpreter
+from capivara.loader.loader import ClassLoader
+from capivara.runtime.frame import Frame
+from capivara.util.descriptors import BaseType, parse_method_descriptor
+
+@dataclass(slots=True)
+class BatchResult:
+    args: Tuple[int, ...]
+    value: Optional[int] = None   # retorno int (None se void ou erro)
+    error: Optional[str] = None
+
+class BatchEntry:
+    """Método static resolvido uma vez e chamado por `call` com argumentos int."""
+    def __init__(self, interp: Interpreter, main_bin: str, name: str, desc: str):
+        params, ret = parse_method_descriptor(desc)
+        if not all(isinstance(p, BaseType) and p.code == "I" for p in params):
+            raise ValueError(f"run-batch aceita só parâmetros int: {desc}")
+        if not (isinstance(ret, BaseType) and ret.code in ("I", "V")):
+            raise ValueError(f"run-batch aceita só retorno int ou void: {desc}")
+        self.interp = interp
+        self.nparams = len(params)
+        self.rc = interp.loader.load_class(main_bin)
+        interp.initialize_class(self.rc)
+        self.code, _ = interp.prepare_method(self.rc, name, desc)
+
+    def call(self, args: Tuple[int, ...]) -> BatchResult:
+        if len(args) != self.nparams:
+            return BatchResult(args, error=f"esperava {self.nparams} argumento(s), recebeu {len(args)}")
+        code = self.code
+        frame = Frame(max_locals=code.max_locals, max_stack=code.max_stack)
+        for i, v in enumerate(args):
+            frame.set_local_int(i, v)
+        try:
+            res = self.interp.execute_frame(self.rc, code, frame)
+        except Exception as e:
+            return BatchResult(args, error=f"{type(e).__name__}: {e}")
+        return BatchResult(args, value=res.int_value)
+
+_SEP = re.compile(r"[\s,]+")
+
+def parse_arg_lines(lines: Iterable[str]) -> Iterator[Tuple[int, ...]]:
+    """
+    Um conjunto de argumentos por linha: ints separados por espaço ou vírgula
+    (`1 2`, `1,2`, `[1, 2]`); linhas vazias e `#` são ignoradas.
+    """
+    for lineno, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            yield tuple(int(tok, 0) for tok in _SEP.split(line.strip("[]")) if tok)
+        except ValueError:
+            raise ValueError(f"linha {lineno}: argumentos inválidos: {line!r}") from None
+
+# estado herdado pelos workers no fork (não é serializado)
+_entry: Optional[BatchEntry] = None
+
+def _call(args: Tuple[int, ...]) -> BatchResult:
+    return _entry.call(args)
+
+def default_workers() -> int:
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+
+def run_batch(classpath: Sequence[str], main_bin: str, name: str, desc: str,
+              arg_sets: Iterable[Tuple[int, ...]], workers: Optional[int] = None,
+              chunksize: int = 64, lazy: bool = False) -> Iterator[BatchResult]:
+    """
+    Chama `main_bin.name(desc)` para cada conjunto de `arg_sets`; devolve um
+    iterador dos resultados na ordem da entrada. Erros de carga/resolução
+    sobem aqui, antes da primeira chamada; erros de uma chamada viram
+    `BatchResult.error`; um ValueError de `arg_sets` sobe na sua posição.
+    """
+    if workers is None:
+        workers = default_workers()
+    if workers < 1 or chunksize < 1:
+        raise ValueError("workers e chunksize devem ser >= 1")
+    entry = BatchEntry(Interpreter(ClassLoader(list(classpath), lazy=lazy)), main_bin, name, desc)
+    if workers == 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return map(entry.call, arg_sets)
+    return _run_forked(entry, arg_sets, workers, chunksize)
+
+def _run_forked(entry: BatchEntry, arg_sets: Iterable[Tuple[int, ...]],
+                workers: int, chunksize: int) -> Iterator[BatchResult]:
+    global _entry
+    _entry = entry
+    # receita do gc.freeze: nada de coleta entre o freeze e o fork; os filhos religam o gc
+    gc.disable()
+    gc.freeze()
+    try:
+        pool = multiprocessing.get_context("fork").Pool(workers, initializer=gc.enable)
+    finally:
+        gc.unfreeze()
+        gc.enable()
+    failure = []
+
+    def guarded() -> Iterator[Tuple[int, ...]]:
+        # o Pool lê a entrada numa thread e, num erro, perderia o chunk inteiro:
+        # aqui a entrada só termina, e o erro sobe depois dos resultados anteriores
+        try:
+            yield from arg_sets
+        except Exception as e:
+            failure.append(e)
+
+    try:
+        with pool:
+            yield from pool.imap(_call, guarded(), chunksize)
+        if failure:
+            raise failure[0]
+    finally:
+        _entry = None  # mantido até aqui: o Pool pode refazer workers que morrerem
@@ -0,0 +1,164 @@
+"""
+Conversão entre valores Python e valores Java guiada pelo descritor do
+método (usada por `capivara.interp.vm.VM`).
+
+    Java                      Python (argumento)                Python (retorno)
+    int/short/byte/long       int (faixa verificada)             int
+    char                      int ou str de 1 caractere          str
+    boolean                   bool                               bool
+    float/double              float ou int                       float
+    byte[]                    bytes/bytearray                    bytes
+    char[]                    str (unidades UTF-16)              str
+    outros arrays primitivos  list/tuple                         list
+    qualquer referência       None (null)                        None
+
+Ainda não há java/lang/String no heap: texto atravessa como char[].
+A conversão de cada parâmetro é resolvida uma vez por `Signature`; a
+chamada só aplica as funções já escolhidas.
+"""
+from __future__ import annotations
+import struct
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from capivara.runtime.frame import Frame
+from capivara.runtime.heap import Heap
+from capivara.util.descriptors import ArrayType, BaseType, TypeLike, parse_method_descriptor
+
+_INT_RANGES = {
+    "I": (-(1 << 31), (1 << 31) - 1),
+    "J": (-(1 << 63), (1 << 63) - 1),
+    "S": (-(1 << 15), (1 << 15) - 1),
+    "B": (-128, 127),
+    "C": (0, 0xFFFF),
+    "Z": (0, 1),
+}
+
+def _int(code: str, v) -> int:
+    if code == "Z":
+        if not isinstance(v, bool):
+            raise TypeError(f"boolean espera bool, recebeu {type(v).__name__}")
+        return int(v)
+    if code == "C" and isinstance(v, str) and len(v) == 1:
+        return ord(v)
+    if isinstance(v, bool) or not isinstance(v, int):
+        raise TypeError(f"'{code}' espera int, recebeu {type(v).__name__}")
+    lo, hi = _INT_RANGES[code]
+    if not lo <= v <= hi:
+        raise OverflowError(f"{v} fora da faixa de '{code}' [{lo}, {hi}]")
+    return v
+
+def _float(v) -> float:
+    if isinstance(v, bool) or not isinstance(v, (int, float)):
+        raise TypeError(f"float/double espera float, recebeu {type(v).__name__}")
+    return float(v)
+
+def _elements(elem: str, v) -> list:
+    if elem == "C":
+        if not isinstance(v, str):
+            raise TypeError(f"char[] espera str, recebeu {type(v).__name__}")
+        # char Java é unidade UTF-16: fora do BMP vira par substituto
+        units = v.encode("utf-16-le", "surrogatepass")
+        return list(struct.unpack(f"<{len(units) // 2}H", units))
+    if elem == "B" and isinstance(v, (bytes, bytearray)):
+        return [((b ^ 0x80) - 0x80) for b in v]
+    if not isinstance(v, (list, tuple)):
+        raise TypeError(f"[{elem} espera list/tuple, recebeu {type(v).__name__}")
+    if elem in ("F", "D"):
+        return [_float(x) for x in v]
+    return [_int(elem, x) for x in v]
+
+def array_from_python(heap: Heap, elem: str, v) -> Optional[int]:
+    """Aloca um array `[elem` com os valores de `v` (None -> null); devolve o id."""
+    if v is None:
+        return None
+    data = _elements(elem, v)
+    oid = heap.new_array(elem, 0)
+    heap.get(oid).data = data
+    return oid
+
+def array_to_python(heap: Heap, oid: Optional[int]):
+    if oid is None:
+        return None
+    arr = heap.get(oid)
+    elem = arr.elem
+    if elem == "B":
+        return bytes(b & 0xFF for b in arr.data)
+    if elem == "C":
+        data = arr.data
+        return struct.pack(f"<{len(data)}H", *data).decode("utf-16-le", "surrogatepass")
+    if elem == "Z":
+        return [bool(x) for x in arr.data]
+    return list(arr.data)
+
+Setter = Callable[[Frame, Heap, object], None]
+
+def _setter(t: TypeLike, slot: int) -> Setter:
+    if isinstance(t, BaseType):
+        code = t.code
+        if code == "J":
+            return lambda f, h, v: f.set_local_long(slot, _int("J", v))
+        if code == "F":
+            return lambda f, h, v: f.set_local_float(slot, _float(v))
+        if code == "D":
+            return lambda f, h, v: f.set_local_double(slot, _float(v))
+        if code == "I":  # o caso comum, sem despacho extra
+            lo, hi = _INT_RANGES["I"]
+
+            def put_int(f: Frame, h: Heap, v) -> None:
+                if v.__class__ is not int or not lo <= v <= hi:
+                    v = _int("I", v)
+                f.set_local_int(slot, v)
+            return put_int
+        return lambda f, h, v: f.set_local_int(slot, _int(code, v))
+    if isinstance(t, ArrayType) and t.dims == 1 and isinstance(t.component, BaseType):
+        elem = t.component.code
+        return lambda f, h, v: f.set_local_ref(slot, array_from_python(h, elem, v))
+
+    def put_null(f: Frame, h: Heap, v) -> None:
+        if v is not None:
+            raise TypeError(f"parâmetro {t} só aceita None (null) por enquanto")
+        f.set_local_ref(slot, None)
+    return put_null
+
+def _result(t: TypeLike) -> Callable[[Heap, object], object]:
+    if isinstance(t, BaseType):
+        code = t.code
+        if code == "V":
+            return lambda h, r: None
+        if code == "Z":
+            return lambda h, r: bool(r.int_value)
+        if code == "C":
+            return lambda h, r: chr(r.int_value & 0xFFFF)
+        if code in ("J", "F", "D"):
+            return lambda h, r: r.value
+        return lambda h, r: r.int_value
+    if isinstance(t, ArrayType) and t.dims == 1 and isinstance(t.component, BaseType):
+        return lambda h, r: array_to_python(h, r.value)
+
+    def ref(h: Heap, r) -> object:
+        if r.value is not None:
+            raise TypeError(f"retorno {t} ainda não é convertido para Python")
+        return None
+    return ref
+
+class Signature:
+    """Conversores dos parâmetros (com o slot de cada um) e do retorno de um descritor static."""
+    __slots__ = ("desc", "setters", "result")
+
+    def __init__(self, desc: str):
+        params, ret = parse_method_descriptor(desc)
+        setters: List[Setter] = []
+        slot = 0
+        for p in params:
+            setters.append(_setter(p, slot))
+            slot += p.width()
+        self.desc = desc
+        self.setters: Tuple[Setter, ...] = tuple(setters)
+        self.result = _result(ret)
+
+    def load(self, frame: Frame, heap: Heap, args: Sequence) -> None:
+        setters = self.setters
+        if len(args) != len(setters):
+            raise TypeError(f"{self.desc} espera {len(setters)} argumento(s), recebeu {len(args)}")
+        for put, v in zip(setters, args):
+            put(frame, heap, v)
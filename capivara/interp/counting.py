@@ -0,0 +1,158 @@
+"""
+Modo de contagem determinística do intérprete.
+
+Conta, por método, bytecodes executados (por opcode), invocações,
+alocações e carregamentos de classe. Com um modelo de custo por opcode isso
+dá um "custo" da execução que não depende da máquina nem do ruído do
+relógio — útil para CI.
+
+O modo é ligado com `Interpreter.enable_counting()`, que troca o laço de
+despacho da instância por uma variante com contagem (ver `variants`); com
+ele desligado o intérprete roda exatamente o laço normal.
+"""
+from __future__ import annotations
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional
+
+from capivara.util import opcodes as OP
+
+# opcodes que alocam no heap
+ALLOC_OPS = (OP.NEW, OP.NEWARRAY)
+
+class CostModel:
+    """Custo por opcode (default: 1 por bytecode, i.e. custo == bytecodes)."""
+    __slots__ = ("table",)
+
+    def __init__(self, costs: Optional[Mapping[int, int]] = None, default: int = 1):
+        self.table: List[int] = [default] * 256
+        for op, c in (costs or {}).items():
+            self.table[op] = c
+
+    @classmethod
+    def from_mnemonics(cls, costs: Mapping[str, int]) -> "CostModel":
+        """`{"default": 1, "INVOKESTATIC": 10, ...}` (mnemônicos sem distinção de caixa)."""
+        by_name = {v: k for k, v in OP.OPCODE_NAMES.items()}
+        table: Dict[int, int] = {}
+        default = 1
+        for name, c in costs.items():
+            if not isinstance(c, int) or c < 0:
+                raise ValueError(f"custo inválido para {name}: {c!r}")
+            if name.lower() == "default":
+                default = c
+                continue
+            op = by_name.get(name.upper())
+            if op is None:
+                raise ValueError(f"opcode desconhecido no modelo de custo: {name}")
+            table[op] = c
+        return cls(table, default)
+
+    @classmethod
+    def load(cls, path: str) -> "CostModel":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: modelo de custo deve ser um objeto JSON")
+        return cls.from_mnemonics(data)
+
+    def cost(self, ops: List[int]) -> int:
+        t = self.table
+        return sum(n * t[op] for op, n in enumerate(ops) if n)
+
+@dataclass(slots=True)
+class MethodCounts:
+    method: str
+    invocations: int = 0
+    class_loads: int = 0
+    ops: List[int] = field(default_factory=lambda: [0] * 256, repr=False)
+
+    @property
+    def bytecodes(self) -> int:
+        return sum(self.ops)
+
+    @property
+    def allocations(self) -> int:
+        return sum(self.ops[op] for op in ALLOC_OPS)
+
+class ExecutionCounters:
+    """
+    Contadores de uma sessão de contagem. `current` é o método em execução
+    (atualizado a cada frame); cargas de classe fora de qualquer método (ex.:
+    a classe de entrada) vão para o pseudo-método `<vm>`.
+    """
+    def __init__(self):
+        self.vm = MethodCounts("<vm>")
+        self.current: MethodCounts = self.vm
+        self.methods: Dict[str, MethodCounts] = {}
+        self._by_code: Dict[int, MethodCounts] = {}
+
+    def method_counts(self, rc, code) -> MethodCounts:
+        mc = self._by_code.get(id(code))
+        if mc is None:
+            label = rc.method_label(code)
+            mc = self.methods.get(label)
+            if mc is None:
+                mc = self.methods[label] = MethodCounts(label)
+            self._by_code[id(code)] = mc
+        return mc
+
+    def _all(self) -> List[MethodCounts]:
+        return [self.vm, *self.methods.values()]
+
+    @property
+    def bytecodes(self) -> int:
+        return sum(m.bytecodes for m in self.methods.values())
+
+    @property
+    def invocations(self) -> int:
+        return sum(m.invocations for m in self.methods.values())
+
+    @property
+    def allocations(self) -> int:
+        return sum(m.allocations for m in self.methods.values())
+
+    @property
+    def class_loads(self) -> int:
+        return sum(m.class_loads for m in self._all())
+
+    def opcode_counts(self) -> List[int]:
+        total = [0] * 256
+        for m in self.methods.values():
+            for op, k in enumerate(m.ops):
+                total[op] += k
+        return total
+
+    def report(self, cost_model: Optional[CostModel] = None) -> Dict:
+        cm = cost_model or CostModel()
+        methods = []
+        for m in self._all():
+            if m is self.vm and not m.class_loads:
+                continue
+            methods.append({
+                "method": m.method,
+                "invocations": m.invocations,
+                "bytecodes": m.bytecodes,
+                "allocations": m.allocations,
+                "class_loads": m.class_loads,
+                "cost": cm.cost(m.ops),
+            })
+        methods.sort(key=lambda r: (-r["cost"], r["method"]))
+        ops = self.opcode_counts()
+        return {
+            "bytecodes": self.bytecodes,
+            "invocations": self.invocations,
+            "allocations": self.allocations,
+            "class_loads": self.class_loads,
+            "cost": cm.cost(ops),
+            "opcodes": {OP.OPCODE_NAMES.get(op, f"0x{op:02x}"): k for op, k in enumerate(ops) if k},
+            "methods": methods,
+        }
+
+def format_counts(report: Dict, top: int = 20) -> str:
+    lines = [f"custo {report['cost']:,} | bytecodes {report['bytecodes']:,} | invocações {report['invocations']:,} | "
+             f"alocações {report['allocations']:,} | classes carregadas {report['class_loads']:,}",
+             f"{'custo':>12} {'bytecodes':>12} {'invoc.':>9} {'aloc.':>8} {'cargas':>6}  método"]
+    for r in report["methods"][:top]:
+        lines.append(f"{r['cost']:>12,} {r['bytecodes']:>12,} {r['invocations']:>9,} {r['allocations']:>8,} "
+                     f"{r['class_loads']:>6}  {r['method']}")
+    return "\n".join(lines)
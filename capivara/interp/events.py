@@ -0,0 +1,60 @@
+"""
+API de eventos para instrumentação (tracing, métricas) sem forkar o intérprete.
+
+Callbacks são registrados por tipo de evento:
+
+    interp.add_hook("method_entry", cb)
+
+Eventos e assinaturas dos callbacks:
+
+- method_entry(rc, code, frame)          antes do primeiro bytecode do frame
+- method_exit(rc, code, result, exc)     ao sair (exc != None se saiu por exceção)
+- exception_throw(rc, code, pc, exc)     uma vez, no frame Java onde a exceção surgiu
+- allocation(rc, obj_id)                 após `new`/`newarray` alocar (rc None para arrays)
+- class_load(rc)                         classe lida e registrada no loader (antes do link)
+- class_link(rc)                         após o link
+
+`rc.method_label(code)` dá o nome legível do método. Eventos de classe são
+do ClassLoader (`loader.hooks`); os demais do Interpreter, que só troca o
+laço de despacho por uma variante instrumentada enquanto houver callbacks —
+sem callbacks o caminho é exatamente o laço normal.
+"""
+from __future__ import annotations
+from typing import Callable, Dict, List
+
+INTERP_EVENTS = ("method_entry", "method_exit", "exception_throw", "allocation")
+LOADER_EVENTS = ("class_load", "class_link")
+EVENTS = INTERP_EVENTS + LOADER_EVENTS
+
+class EventHooks:
+    """Registro de callbacks por tipo de evento."""
+    __slots__ = ("callbacks",)
+
+    def __init__(self, events=EVENTS):
+        self.callbacks: Dict[str, List[Callable]] = {e: [] for e in events}
+
+    def _list(self, event: str) -> List[Callable]:
+        try:
+            return self.callbacks[event]
+        except KeyError:
+            raise ValueError(f"evento desconhecido: {event} (válidos: {', '.join(self.callbacks)})") from None
+
+    def add(self, event: str, callback: Callable) -> Callable:
+        self._list(event).append(callback)
+        return callback
+
+    def remove(self, event: str, callback: Callable) -> None:
+        cbs = self._list(event)
+        if callback not in cbs:
+            raise ValueError(f"callback não registrado para {event}")
+        cbs.remove(callback)
+
+    def has(self, event: str) -> bool:
+        return bool(self.callbacks.get(event))
+
+    def __bool__(self) -> bool:
+        return any(self.callbacks.values())
+
+    def emit(self, event: str, *args) -> None:
+        for cb in tuple(self.callbacks[event]):  # callbacks podem se remover
+            cb(*args)
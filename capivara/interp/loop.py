@@ -1,6 +1,8 @@
 from __future__ import annotations
+import time
+import types
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from typing import Callable, Dict, Optional, Sequence, Tuple
 
 from capivara.util import opcodes as OP
 from capivara.runtime.frame import Frame
@@ -8,16 +10,58 @@ from capivara.util.descriptors import parse_method_descriptor, parse_field_descr
 from capivara.loader.loader import ClassLoader
 from capivara.runtime.klass import RuntimeClass
 from capivara.runtime.heap import VMObject
+from capivara.runtime.values import VMValue
 from capivara.classfile.constant_pool import (
-    ConstantPool, CpMethodref, CpClass, CpNameAndType, CpFieldref
+    ConstantPool, CpClass, MemberRef
 )
-from capivara.classfile.attributes import CodeAttribute
+from capivara.classfile.attributes import CodeAttribute, find_code_attribute
 from capivara.util import flags as FL
+from capivara.interp.counting import ExecutionCounters
+from capivara.interp.profiler import Profiler
+from capivara.interp.events import EventHooks, INTERP_EVENTS, LOADER_EVENTS
+from capivara.interp.metrics import ExecMetrics
+from capivara.interp.variants import specialize
+from capivara.interp.threads import GreenScheduler
+from capivara.loader import boot as BOOT
+
+# descritor de método -> (slots dos parâmetros, código do retorno: "V", "I", "J"... ou "L" para refs)
+_CALL_SHAPES: Dict[str, Tuple[int, str]] = {}
+
+def _call_shape(desc: str) -> Tuple[int, str]:
+    shape = _CALL_SHAPES.get(desc)
+    if shape is None:
+        params, ret = parse_method_descriptor(desc)
+        shape = _CALL_SHAPES[desc] = (sum(p.width() for p in params),
+                                      ret.code if isinstance(ret, BaseType) else "L")
+    return shape
+
+def _push_return(frame: Frame, ret: str, res: ExecResult) -> None:
+    """Empilha no chamador o retorno `res` de um método cujo descritor retorna `ret` (não-void)."""
+    if ret == "J":
+        frame.push_long(res.value)
+    elif ret == "F":
+        frame.push_float(res.value)
+    elif ret == "D":
+        frame.push_double(res.value)
+    elif ret == "L":
+        frame.push_ref(res.value)
+    else:  # int, boolean, byte, char, short: IRETURN
+        frame.push_int(res.int_value if res.int_value is not None else 0)
+
+def _throw_pc(tb, loop_code) -> int:
+    """pc da instrução que lançou, a partir do frame mais interno do laço no traceback."""
+    pc = -1
+    while tb is not None:
+        if tb.tb_frame.f_code is loop_code:
+            pc = tb.tb_frame.f_locals.get("_ipc", -1)
+        tb = tb.tb_next
+    return pc
 
 @dataclass
 class ExecResult:
-    kind: str          # "void" | "int"
+    kind: str          # "void" | "int" | "long" | "float" | "double" | "ref"
     int_value: Optional[int] = None
+    value: object = None   # long/float/double; em "ref", o id do objeto (None = null)
 
 class Interpreter:
     """
@@ -25,6 +69,14 @@ class Interpreter:
     """
     def __init__(self, loader: ClassLoader):
         self.loader = loader
+        self.counters: Optional[ExecutionCounters] = None
+        self.profiler: Optional[Profiler] = None
+        self.metrics: Optional[ExecMetrics] = None
+        self.hooks = EventHooks(INTERP_EVENTS)
+        self._hooked = False
+        self.green: Optional[GreenScheduler] = None
+        self.channels: Dict[int, object] = {}  # capivara/io/Channel: id -> objeto do hospedeiro
+        self._next_channel = 1
 
     # ===== utils numéricas =====
     @staticmethod
@@ -49,94 +101,268 @@ class Interpreter:
         return a - int(a / b) * b
 
     # ===== resolução CP =====
-    def _resolve_methodref(self, cp: ConstantPool, index: int) -> Tuple[str, str, str]:
-        e = cp.get(index)
-        if not isinstance(e, CpMethodref):
+    def _resolve_methodref(self, cp: ConstantPool, index: int) -> MemberRef:
+        ref = cp.resolve_ref(index)
+        if ref.tag != OP.CP_Methodref:
             raise TypeError("índice não é Methodref")
-        cls = cp.get(e.class_index)
-        assert isinstance(cls, CpClass)
-        owner = cp.get_utf8(cls.name_index)
-        nt = cp.get(e.name_and_type_index)
-        assert isinstance(nt, CpNameAndType)
-        name = cp.get_utf8(nt.name_index)
-        desc = cp.get_utf8(nt.descriptor_index)
-        return owner, name, desc
-
-    def _resolve_fieldref(self, cp: ConstantPool, index: int) -> Tuple[str, str, str]:
-        e = cp.get(index)
-        if not isinstance(e, CpFieldref):
+        return ref
+
+    def _resolve_fieldref(self, cp: ConstantPool, index: int) -> MemberRef:
+        ref = cp.resolve_ref(index)
+        if ref.tag != OP.CP_Fieldref:
             raise TypeError("índice não é Fieldref")
-        cls = cp.get(e.class_index)
-        assert isinstance(cls, CpClass)
-        owner = cp.get_utf8(cls.name_index)
-        nt = cp.get(e.name_and_type_index)
-        assert isinstance(nt, CpNameAndType)
-        name = cp.get_utf8(nt.name_index)
-        desc = cp.get_utf8(nt.descriptor_index)
-        return owner, name, desc
-
-    def _lookup_static_in_hierarchy(self, owner_name: str, name: str, desc: str) -> Tuple[RuntimeClass, CodeAttribute]:
-        rc = self.loader.load_class(owner_name)
+        return ref
+
+    def _lookup_static_in_hierarchy(self, ref: MemberRef) -> Tuple[RuntimeClass, CodeAttribute, bool]:
+        """(classe declarante, Code, é synchronized)."""
+        rc = self.loader.load_class(ref.owner)
         while True:
-            m = rc.find_method(name, desc)
+            m = rc.find_method_sym(ref.name_id, ref.desc_id)
             if m and (m.access_flags & FL.ACC_STATIC):
-                code: CodeAttribute | None = None
-                for a in m.attributes:
-                    if isinstance(a, CodeAttribute):
-                        code = a
-                        break
+                code = find_code_attribute(m.attributes, rc.cf.constant_pool)
                 if not code:
                     raise RuntimeError("método alvo sem atributo Code")
-                return rc, code
+                return rc, code, bool(m.access_flags & FL.ACC_SYNCHRONIZED)
             if not rc.super_name:
                 break
             rc = self.loader.load_class(rc.super_name)
-        raise LookupError(f"método não encontrado (static): {owner_name}.{name}{desc}")
+        raise LookupError(f"método não encontrado (static): {ref.owner}.{ref.name}{ref.desc}")
 
-    def _lookup_instance_in_hierarchy(self, rc: RuntimeClass, name: str, desc: str) -> Tuple[RuntimeClass, CodeAttribute]:
+    def _lookup_instance_in_hierarchy(self, rc: RuntimeClass, ref: MemberRef) -> Tuple[RuntimeClass, CodeAttribute, bool]:
+        """(classe declarante, Code, é synchronized)."""
         cur = rc
         while True:
-            m = cur.find_method(name, desc)
+            m = cur.find_method_sym(ref.name_id, ref.desc_id)
             if m and (m.access_flags & FL.ACC_STATIC) == 0:
-                code: CodeAttribute | None = None
-                for a in m.attributes:
-                    if isinstance(a, CodeAttribute):
-                        code = a
-                        break
+                code = find_code_attribute(m.attributes, cur.cf.constant_pool)
                 if not code:
                     raise RuntimeError("método alvo sem atributo Code")
-                return cur, code
+                return cur, code, bool(m.access_flags & FL.ACC_SYNCHRONIZED)
             if not cur.super_name:
                 break
             cur = self.loader.load_class(cur.super_name)
-        raise LookupError(f"método não encontrado (instance): {rc.name}.{name}{desc}")
+        raise LookupError(f"método não encontrado (instance): {rc.name}.{ref.name}{ref.desc}")
 
-    def _lookup_field_in_hierarchy(self, owner_name: str, name: str, desc: str, expect_static: bool) -> Tuple[RuntimeClass, bool]:
-        rc = self.loader.load_class(owner_name)
+    def _lookup_field_in_hierarchy(self, ref: MemberRef, expect_static: bool) -> Tuple[RuntimeClass, bool]:
+        rc = self.loader.load_class(ref.owner)
         while True:
-            cp = rc.cf.constant_pool
-            for f in rc.cf.fields:
-                is_static = (f.access_flags & FL.ACC_STATIC) != 0
-                if is_static != expect_static:
-                    continue
-                if cp.get_utf8(f.name_index) == name and cp.get_utf8(f.descriptor_index) == desc:
-                    return rc, is_static
+            f = rc.find_field_sym(ref.name_id, ref.desc_id)
+            if f is not None and ((f.access_flags & FL.ACC_STATIC) != 0) == expect_static:
+                return rc, expect_static
             if not rc.super_name:
                 break
             rc = self.loader.load_class(rc.super_name)
         kind = "static" if expect_static else "instance"
-        raise LookupError(f"campo não encontrado ({kind}): {owner_name}.{name}{desc}")
+        raise LookupError(f"campo não encontrado ({kind}): {ref.owner}.{ref.name}{ref.desc}")
+
+    # ===== Inicialização de classes (JVMS §5.5) =====
+    def initialize_class(self, rc: RuntimeClass) -> None:
+        """
+        Roda o <clinit> de `rc` (superclasse primeiro) no primeiro uso ativo.
+        Um pedido recursivo durante a própria inicialização retorna sem fazer
+        nada; se o <clinit> falhar, a classe fica "erroneous".
+        """
+        status = rc.status
+        if status == "initialized" or status == "initializing":
+            return
+        if status == "erroneous":
+            raise RuntimeError(f"NoClassDefFoundError: inicialização de {rc.name} falhou antes")
+        rc.status = "initializing"
+        try:
+            if rc.super_name and rc.super_name != "java/lang/Object":
+                self.initialize_class(self.loader.load_class(rc.super_name))
+            code = rc.clinit_code
+            if code is not None:
+                self._run_frame(rc, code, Frame(max_locals=code.max_locals, max_stack=code.max_stack))
+        except Exception as e:
+            rc.status = "erroneous"
+            raise RuntimeError(f"ExceptionInInitializerError: {rc.name}") from e
+        rc.status = "initialized"
+
+    # ===== Sítios resolvidos (cache em RuntimeClass.sites) =====
+    def _static_field_site(self, rc: RuntimeClass, idx: int) -> Tuple[VMValue, bool]:
+        """GETSTATIC/PUTSTATIC: (célula do estático, é int)."""
+        fref = self._resolve_fieldref(rc.cf.constant_pool, idx)
+        decl_rc, _ = self._lookup_field_in_hierarchy(fref, expect_static=True)
+        self.initialize_class(decl_rc)
+        t = parse_field_descriptor(fref.desc)
+        site = (decl_rc.statics[(fref.name, fref.desc)], isinstance(t, BaseType) and t.code == "I")
+        if decl_rc.status == "initialized":
+            rc.sites[idx] = site
+        return site
+
+    def _invokestatic_site(self, rc: RuntimeClass, idx: int) -> Tuple[RuntimeClass, CodeAttribute, int, str, bool]:
+        """
+        INVOKESTATIC: (classe alvo, Code, nº de args, código do retorno, é
+        synchronized). Só com parâmetros int o nº de args é positivo; com
+        outros tipos é -(slots dos parâmetros), movidos crus da pilha. O
+        retorno segue `_call_shape` ("L" para refs e arrays).
+        """
+        ref = self._resolve_methodref(rc.cf.constant_pool, idx)
+        target_rc, code_attr, sync = self._lookup_static_in_hierarchy(ref)
+        self.initialize_class(target_rc)
+        params, _ = parse_method_descriptor(ref.desc)
+        slots, ret = _call_shape(ref.desc)
+        nargs = len(params) if all(isinstance(p, BaseType) and p.code == "I" for p in params) else -slots
+        site = (target_rc, code_attr, nargs, ret, sync)
+        if target_rc.status == "initialized":
+            rc.sites[idx] = site
+        return site
+
+    def _new_site(self, rc: RuntimeClass, idx: int) -> RuntimeClass:
+        cp = rc.cf.constant_pool
+        e = cp.get(idx); assert isinstance(e, CpClass)
+        rc_new = self.loader.load_class(cp.get_utf8(e.name_index))
+        self.initialize_class(rc_new)
+        if rc_new.status == "initialized":
+            rc.sites[idx] = rc_new
+        return rc_new
+
+    # ===== Intrínsecos das classes de boot (ver `capivara.loader.boot`) =====
+    def _intrinsic(self, rc: RuntimeClass, iid: int, frame: Frame) -> None:
+        green = self.green
+        if iid == BOOT.THREAD_START:
+            oid = frame.pop_ref()
+            if green is None:
+                raise RuntimeError("java/lang/Thread.start requer threads verdes (enable_green_threads / run --green-threads)")
+            green.start(oid)
+        elif iid == BOOT.THREAD_JOIN:
+            oid = frame.pop_ref()
+            if green is not None and not green.is_done(oid):
+                # só o laço gerador pode estacionar a thread (p.ex. não dentro de um <clinit>)
+                raise RuntimeError("Thread.join bloquearia fora de uma thread verde")
+        elif iid == BOOT.THREAD_YIELD:
+            pass
+        elif iid in BOOT.BLOCKING:
+            call, _, done = self._blocking_native(iid, frame)
+            done(call())
+        else:
+            raise NotImplementedError(f"intrínseco desconhecido: {iid}")
+
+    def _green_intrinsic(self, rc: RuntimeClass, iid: int, frame: Frame):
+        """Versão geradora usada pelo laço das threads verdes: pode estacionar a thread."""
+        if iid == BOOT.THREAD_JOIN:
+            yield from self.green.join(frame.pop_ref())
+        elif iid == BOOT.THREAD_YIELD:
+            yield
+        elif iid == BOOT.THREAD_SLEEP:
+            yield from self.green.sleep(self._sleep_ms(frame) / 1000)
+        elif iid in BOOT.BLOCKING:
+            call, acall, done = self._blocking_native(iid, frame)
+            done((yield from self.green.block_on(call, acall)))
+        else:
+            self._intrinsic(rc, iid, frame)
+
+    @staticmethod
+    def _sleep_ms(frame: Frame) -> int:
+        ms = frame.pop_long()
+        if ms < 0:
+            raise RuntimeError("IllegalArgumentException: timeout negativo")
+        return ms
+
+    def _blocking_native(self, iid: int, frame: Frame):
+        """
+        Desempilha os argumentos de um intrínseco bloqueante e devolve
+        `(call, acall, done)`: a chamada síncrona, a fábrica da corrotina
+        equivalente (None: o escalonador asyncio roda `call` num executor) e a
+        conclusão, que recebe o resultado e empilha o retorno.
+        """
+        if iid == BOOT.THREAD_SLEEP:
+            ms = self._sleep_ms(frame)  # com threads verdes, ver GreenScheduler.sleep
+            return (lambda: time.sleep(ms / 1000)), None, lambda r: None
+        if iid == BOOT.CHANNEL_READ:
+            arr = self._byte_array(frame.pop_ref())
+            ch = self._channel(frame.pop_int())
+            n = len(arr.data)
+
+            def got(b) -> None:
+                if not b:
+                    frame.push_int(-1 if n else 0)
+                    return
+                arr.data[:len(b)] = [((x ^ 0x80) - 0x80) for x in b]
+                frame.push_int(len(b))
+            aread = getattr(ch, "aread", None)
+            return (lambda: ch.read(n)), (aread and (lambda: aread(n))), got
+        if iid == BOOT.CHANNEL_WRITE:
+            n = frame.pop_int()
+            arr = self._byte_array(frame.pop_ref())
+            ch = self._channel(frame.pop_int())
+            if not 0 <= n <= len(arr.data):
+                raise RuntimeError(f"IndexOutOfBoundsException: {n} (tamanho {len(arr.data)})")
+            payload = bytes(b & 0xFF for b in arr.data[:n])
+            awrite = getattr(ch, "awrite", None)
+            return ((lambda: ch.write(payload)), (awrite and (lambda: awrite(payload))),
+                    lambda r: frame.push_int(n if r is None else r))
+        raise NotImplementedError(f"intrínseco desconhecido: {iid}")
+
+    def _byte_array(self, ref: Optional[int]):
+        if ref is None:
+            raise RuntimeError("NullPointerException (array)")
+        arr = self.loader.heap.get(ref)
+        if getattr(arr, "elem", None) != "B":
+            raise RuntimeError("ClassCastException: esperado byte[]")
+        return arr
+
+    def _channel(self, cid: int):
+        ch = self.channels.get(cid)
+        if ch is None:
+            raise RuntimeError(f"IOException: canal {cid} não está aberto")
+        return ch
+
+    # ===== Monitores (só com threads verdes; ver `capivara.interp.threads`) =====
+    def _monitor_enter(self, h) -> None:
+        green = self.green
+        if green.current is None:
+            return  # fora do escalonador (p.ex. <clinit> antes da main): uma thread só
+        if not green.try_lock(h):
+            raise RuntimeError("monitorenter bloquearia fora de uma thread verde")
+
+    def _monitor_exit(self, h) -> None:
+        green = self.green
+        if green.current is not None:
+            green.unlock(h)
+
+    def _run_synchronized(self, rc: RuntimeClass, code: CodeAttribute, frame: Frame, h) -> ExecResult:
+        """Método ACC_SYNCHRONIZED: `h` é o objeto receptor ou, se static, a RuntimeClass."""
+        self._monitor_enter(h)
+        try:
+            return self._run_frame(rc, code, frame)
+        finally:
+            self._monitor_exit(h)
+
+    def _green_monitor_enter(self, h):
+        green = self.green
+        if not green.try_lock(h):
+            yield from green.lock(h)
+
+    def _green_run_synchronized(self, rc: RuntimeClass, code: CodeAttribute, frame: Frame, h):
+        yield from self._green_monitor_enter(h)
+        try:
+            return (yield from self._green_run_frame(rc, code, frame))
+        finally:
+            self.green.unlock(h)
+
+    def _array_data(self, ref: Optional[int], i: int) -> list:
+        if ref is None:
+            raise RuntimeError("NullPointerException (array)")
+        data = self.loader.heap.get(ref).data
+        if not 0 <= i < len(data):
+            raise RuntimeError(f"ArrayIndexOutOfBoundsException: {i} (tamanho {len(data)})")
+        return data
 
     # ===== Execução de um método (frame) =====
     def _run_frame(self, rc: RuntimeClass, code: CodeAttribute, frame: Frame) -> ExecResult:
         cp = rc.cf.constant_pool
+        sites = rc.sites
         code_bytes = code.code
         pc = 0
         n = len(code_bytes)
+        # @hook: enter
 
         while pc < n:
             op = code_bytes[pc]
             pc += 1
+            # @hook: op
 
             # ===== Constantes / refs =====
             if op == OP.NOP:
@@ -169,6 +395,24 @@ class Interpreter:
                 v = frame.pop_int()
                 frame.set_local_int(idx, v)
 
+            elif op == OP.LLOAD:
+                idx = code_bytes[pc]; pc += 1
+                frame.push_long(frame.get_local_long(idx))
+            elif op == OP.FLOAD:
+                idx = code_bytes[pc]; pc += 1
+                frame.push_float(frame.get_local_float(idx))
+            elif op == OP.DLOAD:
+                idx = code_bytes[pc]; pc += 1
+                frame.push_double(frame.get_local_double(idx))
+            elif OP.LLOAD_0 <= op <= OP.DLOAD_3:
+                kind, idx = divmod(op - OP.LLOAD_0, 4)
+                if kind == 0:
+                    frame.push_long(frame.get_local_long(idx))
+                elif kind == 1:
+                    frame.push_float(frame.get_local_float(idx))
+                else:
+                    frame.push_double(frame.get_local_double(idx))
+
             elif op == OP.ALOAD:
                 idx = code_bytes[pc]; pc += 1
                 frame.push_ref(frame.get_local_ref(idx))
@@ -233,6 +477,7 @@ class Interpreter:
                 )
                 if cond:
                     pc = pc + off - 3
+                    # @hook: backedge
             elif op in (OP.IF_ICMPEQ, OP.IF_ICMPNE, OP.IF_ICMPLT, OP.IF_ICMPGE, OP.IF_ICMPGT, OP.IF_ICMPLE):
                 hi = code_bytes[pc]; lo = code_bytes[pc+1]; pc += 2
                 off = self._s2(hi, lo)
@@ -247,44 +492,45 @@ class Interpreter:
                 )
                 if cond:
                     pc = pc + off - 3
+                    # @hook: backedge
 
             # ===== Goto =====
             elif op == OP.GOTO:
                 hi = code_bytes[pc]; lo = code_bytes[pc+1]; pc += 2
                 off = self._s2(hi, lo)
                 pc = pc + off - 3
+                # @hook: backedge
 
             # ===== Campos estáticos =====
+            # sítio no cache => classe já inicializada, sem verificação
             elif op == OP.GETSTATIC:
                 idx = (code_bytes[pc] << 8) | code_bytes[pc+1]; pc += 2
-                owner, name, desc = self._resolve_fieldref(cp, idx)
-                decl_rc, _ = self._lookup_field_in_hierarchy(owner, name, desc, expect_static=True)
-                val = decl_rc.statics[(name, desc)]
-                t = parse_field_descriptor(desc)
-                if isinstance(t, BaseType) and t.code == "I":
-                    frame.push_int(val.value)
+                site = sites.get(idx)
+                if site is None:
+                    site = self._static_field_site(rc, idx)
+                cell, is_int = site
+                if is_int:
+                    frame.push_int(cell.value)
                 else:
-                    frame.push_ref(val.value)
+                    frame.push_ref(cell.value)
             elif op == OP.PUTSTATIC:
                 idx = (code_bytes[pc] << 8) | code_bytes[pc+1]; pc += 2
-                owner, name, desc = self._resolve_fieldref(cp, idx)
-                decl_rc, _ = self._lookup_field_in_hierarchy(owner, name, desc, expect_static=True)
-                t = parse_field_descriptor(desc)
-                if isinstance(t, BaseType) and t.code == "I":
-                    v = frame.pop_int()
-                else:
-                    v = frame.pop_ref()
-                decl_rc.statics[(name, desc)].value = v
+                site = sites.get(idx)
+                if site is None:
+                    site = self._static_field_site(rc, idx)
+                cell, is_int = site
+                cell.value = frame.pop_int() if is_int else frame.pop_ref()
 
             # ===== Campos de instância =====
             elif op == OP.GETFIELD:
                 idx = (code_bytes[pc] << 8) | code_bytes[pc+1]; pc += 2
-                owner, name, desc = self._resolve_fieldref(cp, idx)
+                fref = self._resolve_fieldref(cp, idx)
+                name, desc = fref.name, fref.desc
                 ref = frame.pop_ref()
                 if ref is None:
                     raise RuntimeError("NullPointerException (getfield)")
                 obj = self.loader.heap.get(ref)
-                decl_rc, _ = self._lookup_field_in_hierarchy(owner, name, desc, expect_static=False)
+                decl_rc, _ = self._lookup_field_in_hierarchy(fref, expect_static=False)
                 val = obj.fields[(decl_rc.name, name, desc)]
                 t = parse_field_descriptor(desc)
                 if isinstance(t, BaseType) and t.code == "I":
@@ -293,7 +539,8 @@ class Interpreter:
                     frame.push_ref(val.value)
             elif op == OP.PUTFIELD:
                 idx = (code_bytes[pc] << 8) | code_bytes[pc+1]; pc += 2
-                owner, name, desc = self._resolve_fieldref(cp, idx)
+                fref = self._resolve_fieldref(cp, idx)
+                name, desc = fref.name, fref.desc
                 t = parse_field_descriptor(desc)
                 if isinstance(t, BaseType) and t.code == "I":
                     v = frame.pop_int()
@@ -303,137 +550,511 @@ class Interpreter:
                 if ref is None:
                     raise RuntimeError("NullPointerException (putfield)")
                 obj = self.loader.heap.get(ref)
-                decl_rc, _ = self._lookup_field_in_hierarchy(owner, name, desc, expect_static=False)
+                decl_rc, _ = self._lookup_field_in_hierarchy(fref, expect_static=False)
                 obj.fields[(decl_rc.name, name, desc)].value = v
 
             # ===== Invocações =====
             elif op == OP.INVOKESTATIC:
+                # @hook: invoke
                 idx_hi = code_bytes[pc]; idx_lo = code_bytes[pc+1]; pc += 2
                 index = (idx_hi << 8) | idx_lo
-                owner, name, desc = self._resolve_methodref(cp, index)
-                target_rc, code_attr = self._lookup_static_in_hierarchy(owner, name, desc)
-                params, ret = parse_method_descriptor(desc)
-                arg_vals: List[int] = []
-                for p in reversed(params):
-                    if isinstance(p, BaseType) and p.code == "I":
-                        arg_vals.append(frame.pop_int())
-                    else:
-                        raise NotImplementedError("apenas parâmetros int neste passo")
-                arg_vals.reverse()
+                site = sites.get(index)
+                if site is None:
+                    site = self._invokestatic_site(rc, index)
+                target_rc, code_attr, nargs, ret, sync = site
                 callee = Frame(max_locals=code_attr.max_locals, max_stack=code_attr.max_stack)
-                for i, v in enumerate(arg_vals):
-                    callee.set_local_int(i, v)
-                res = self._run_frame(target_rc, code_attr, callee)
-                if isinstance(ret, BaseType) and ret.code == "I":
-                    frame.push_int(res.int_value if res.int_value is not None else 0)
-                elif isinstance(ret, BaseType) and ret.code == "V":
-                    pass
+                if nargs >= 0:
+                    for i in range(nargs - 1, -1, -1):
+                        callee.set_local_int(i, frame.pop_int())
+                else:
+                    # long/double ocupam valor + TOP na pilha e nos locals: mesma disposição
+                    callee.locals[:-nargs] = frame.ostack[nargs:]
+                    del frame.ostack[nargs:]
+                if sync and self.green is not None:
+                    res = self._run_synchronized(target_rc, code_attr, callee, target_rc)
                 else:
-                    raise NotImplementedError("retornos não-int/void virão depois")
+                    res = self._run_frame(target_rc, code_attr, callee)
+                if ret == "I":
+                    frame.push_int(res.int_value if res.int_value is not None else 0)
+                elif ret != "V":
+                    _push_return(frame, ret, res)
 
             elif op == OP.INVOKESPECIAL:
+                # @hook: invoke
                 idx = (code_bytes[pc] << 8) | code_bytes[pc+1]; pc += 2
-                owner, name, desc = self._resolve_methodref(cp, idx)
-
-                params, ret = parse_method_descriptor(desc)
-                # coletar args (direita->esquerda) e 'this'
-                arg_vals: List[int] = []
-                for p in reversed(params):
-                    if isinstance(p, BaseType) and p.code == "I":
-                        arg_vals.append(frame.pop_int())
-                    else:
-                        raise NotImplementedError("apenas parâmetros int neste passo")
-                arg_vals.reverse()
+                ref = self._resolve_methodref(cp, idx)
+
+                # args (slots crus, long/double com TOP) e 'this'
+                slots, ret = _call_shape(ref.desc)
+                arg_slots = frame.ostack[len(frame.ostack) - slots:]
+                del frame.ostack[len(frame.ostack) - slots:]
                 this_ref = frame.pop_ref()
                 if this_ref is None:
                     raise RuntimeError("NullPointerException (invokespecial)")
 
                 # Caso especial: java/lang/Object.<init>()V -> no-op
-                if owner == "java/lang/Object" and name == "<init>" and isinstance(ret, BaseType) and ret.code == "V" and len(arg_vals) == 0:
+                if ref.owner == "java/lang/Object" and ref.name == "<init>" and ret == "V" and slots == 0:
                     # nada a fazer além de consumir 'this'
                     pass
                 else:
                     # localizar Code do método na hierarquia do owner
-                    target_rc = self.loader.load_class(owner)
-                    _, code_attr = self._lookup_instance_in_hierarchy(target_rc, name, desc)
+                    target_rc = self.loader.load_class(ref.owner)
+                    target_rc, code_attr, sync = self._lookup_instance_in_hierarchy(target_rc, ref)
 
                     callee = Frame(max_locals=code_attr.max_locals, max_stack=code_attr.max_stack)
                     callee.set_local_ref(0, this_ref)
-                    for i, v in enumerate(arg_vals, start=1):
-                        callee.set_local_int(i, v)
+                    callee.locals[1:1 + slots] = arg_slots
 
-                    _ = self._run_frame(target_rc, code_attr, callee)
-                # construtor/void -> nada a empilhar
+                    if sync and self.green is not None:
+                        res = self._run_synchronized(target_rc, code_attr, callee, self.loader.heap.get(this_ref))
+                    else:
+                        res = self._run_frame(target_rc, code_attr, callee)
+                    if ret != "V":
+                        _push_return(frame, ret, res)
 
             elif op == OP.INVOKEVIRTUAL:
+                # @hook: invoke
                 idx = (code_bytes[pc] << 8) | code_bytes[pc+1]; pc += 2
-                owner, name, desc = self._resolve_methodref(cp, idx)
-                params, ret = parse_method_descriptor(desc)
-                arg_vals: List[int] = []
-                for p in reversed(params):
-                    if isinstance(p, BaseType) and p.code == "I":
-                        arg_vals.append(frame.pop_int())
-                    else:
-                        raise NotImplementedError("apenas parâmetros int neste passo")
-                arg_vals.reverse()
+                ref = self._resolve_methodref(cp, idx)
+                slots, ret = _call_shape(ref.desc)
+                arg_slots = frame.ostack[len(frame.ostack) - slots:]
+                del frame.ostack[len(frame.ostack) - slots:]
                 this_ref = frame.pop_ref()
                 if this_ref is None:
                     raise RuntimeError("NullPointerException (invokevirtual)")
                 this_obj = self.loader.heap.get(this_ref)
                 dyn_rc = self.loader.load_class(this_obj.class_name)
 
-                # despacho dinâmico
-                _, code_attr = self._lookup_instance_in_hierarchy(dyn_rc, name, desc)
+                # despacho dinâmico (o frame usa a CP da classe que declara o método)
+                dyn_rc, code_attr, sync = self._lookup_instance_in_hierarchy(dyn_rc, ref)
 
                 callee = Frame(max_locals=code_attr.max_locals, max_stack=code_attr.max_stack)
                 callee.set_local_ref(0, this_ref)
-                for i, v in enumerate(arg_vals, start=1):
-                    callee.set_local_int(i, v)
+                callee.locals[1:1 + slots] = arg_slots
 
-                res = self._run_frame(dyn_rc, code_attr, callee)
-                if isinstance(ret, BaseType) and ret.code == "I":
-                    frame.push_int(res.int_value if res.int_value is not None else 0)
-                elif isinstance(ret, BaseType) and ret.code == "V":
-                    pass
+                if sync and self.green is not None:
+                    res = self._run_synchronized(dyn_rc, code_attr, callee, this_obj)
                 else:
-                    raise NotImplementedError("retornos não-int/void virão depois")
+                    res = self._run_frame(dyn_rc, code_attr, callee)
+                if ret == "I":
+                    frame.push_int(res.int_value if res.int_value is not None else 0)
+                elif ret != "V":
+                    _push_return(frame, ret, res)
 
             # ===== Alocação =====
             elif op == OP.NEW:
                 idx = (code_bytes[pc] << 8) | code_bytes[pc+1]; pc += 2
-                e = cp.get(idx); assert isinstance(e, CpClass)
-                class_name = cp.get_utf8(e.name_index)
-                rc_new = self.loader.load_class(class_name)
+                rc_new = sites.get(idx)
+                if rc_new is None:
+                    rc_new = self._new_site(rc, idx)
                 oid = self.loader.heap.new_object(rc_new, self.loader)
+                # @hook: new
                 frame.push_ref(oid)
 
+            # ===== Monitores (sem threads verdes só há uma thread Java: lock elidido) =====
+            elif op == OP.MONITORENTER:
+                oid = frame.pop_ref()
+                if oid is None:
+                    raise RuntimeError("NullPointerException (monitorenter)")
+                if self.green is not None:
+                    self._monitor_enter(self.loader.heap.get(oid))
+            elif op == OP.MONITOREXIT:
+                oid = frame.pop_ref()
+                if oid is None:
+                    raise RuntimeError("NullPointerException (monitorexit)")
+                if self.green is not None:
+                    self._monitor_exit(self.loader.heap.get(oid))
+
             # ===== Retornos =====
             elif op == OP.IRETURN:
                 v = frame.pop_int()
                 return ExecResult("int", v)
             elif op == OP.RETURN:
                 return ExecResult("void")
+            elif op == OP.ARETURN:
+                return ExecResult("ref", value=frame.pop_ref())
+            elif op == OP.LRETURN:
+                return ExecResult("long", value=frame.pop_long())
+            elif op == OP.FRETURN:
+                return ExecResult("float", value=frame.pop_float())
+            elif op == OP.DRETURN:
+                return ExecResult("double", value=frame.pop_double())
+
+            # ===== Arrays primitivos =====
+            elif op == OP.NEWARRAY:
+                atype = code_bytes[pc]; pc += 1
+                oid = self.loader.heap.new_array(OP.NEWARRAY_TYPES[atype], frame.pop_int())
+                rc_new = None  # arrays não têm RuntimeClass
+                # @hook: new
+                frame.push_ref(oid)
+            elif op == OP.ARRAYLENGTH:
+                ref = frame.pop_ref()
+                if ref is None:
+                    raise RuntimeError("NullPointerException (arraylength)")
+                frame.push_int(len(self.loader.heap.get(ref).data))
+            elif OP.IALOAD <= op <= OP.SALOAD:
+                i = frame.pop_int()
+                data = self._array_data(frame.pop_ref(), i)
+                kind = op - OP.IALOAD
+                if kind == 1:
+                    frame.push_long(data[i])
+                elif kind == 2:
+                    frame.push_float(data[i])
+                elif kind == 3:
+                    frame.push_double(data[i])
+                elif kind == 4:
+                    frame.push_ref(data[i])
+                else:
+                    frame.push_int(data[i])
+            elif OP.IASTORE <= op <= OP.SASTORE:
+                kind = op - OP.IASTORE
+                if kind == 1:
+                    v = frame.pop_long()
+                elif kind == 2:
+                    v = frame.pop_float()
+                elif kind == 3:
+                    v = frame.pop_double()
+                elif kind == 4:
+                    v = frame.pop_ref()
+                else:
+                    v = frame.pop_int()
+                    if kind == 5:    # bastore (byte[] e boolean[])
+                        v = ((v & 0xFF) ^ 0x80) - 0x80
+                    elif kind == 6:  # castore
+                        v &= 0xFFFF
+                    elif kind == 7:  # sastore
+                        v = ((v & 0xFFFF) ^ 0x8000) - 0x8000
+                i = frame.pop_int()
+                ref = frame.pop_ref()
+                data = self._array_data(ref, i)
+                if kind == 5 and self.loader.heap.get(ref).class_name == "[Z":
+                    v &= 1  # boolean[] guarda só o bit baixo (JVMS bastore)
+                data[i] = v
+
+            # ===== Intrínsecos (impdep1 <id>, só nas classes de boot) =====
+            elif op == OP.IMPDEP1:
+                iid = code_bytes[pc]; pc += 1
+                self._intrinsic(rc, iid, frame)
 
             else:
                 raise NotImplementedError(f"Opcode 0x{op:02x} não suportado neste passo")
 
         return ExecResult("void")
 
+    # ===== Modos de despacho alternativos (contagem / profiling) =====
+    def _install_dispatch(self, run_frame, load_class=None) -> None:
+        # atributos de instância sombreiam os métodos: desligado, nada muda no laço normal
+        if "_run_frame" in self.__dict__:
+            raise RuntimeError("um modo de despacho alternativo já está ativo")
+        if self.green is not None:
+            raise RuntimeError("modos de despacho alternativos não rodam com threads verdes")
+        self._run_frame = run_frame
+        if load_class is not None:
+            self.loader.load_class = load_class
+
+    def _restore_dispatch(self) -> None:
+        self.__dict__.pop("_run_frame", None)
+        self.loader.__dict__.pop("load_class", None)
+
+    def enable_counting(self) -> ExecutionCounters:
+        """
+        Liga a contagem determinística (ver `capivara.interp.counting`):
+        `_run_frame` e `loader.load_class` desta instância passam a ser
+        variantes com contagem. Devolve os contadores (também em `self.counters`).
+        """
+        counters = ExecutionCounters()
+        loop = specialize(Interpreter._run_frame, {
+            "enter": "_ops = self.counters.current.ops",
+            "op": "_ops[op] += 1",
+        })
+        loaded = self.loader.loaded
+        base_load = self.loader.load_class
+
+        def run_frame(rc: RuntimeClass, code: CodeAttribute, frame: Frame) -> ExecResult:
+            mc = counters.method_counts(rc, code)
+            mc.invocations += 1
+            prev = counters.current
+            counters.current = mc
+            try:
+                return loop(self, rc, code, frame)
+            finally:
+                counters.current = prev
+
+        def load_class(binary_name: str) -> RuntimeClass:
+            if binary_name in loaded:
+                return loaded[binary_name]
+            rc = base_load(binary_name)
+            counters.current.class_loads += 1  # superclasses contam na chamada aninhada
+            return rc
+
+        self._install_dispatch(run_frame, load_class)
+        self.counters = counters
+        return counters
+
+    def disable_counting(self) -> Optional[ExecutionCounters]:
+        """Volta ao laço normal; devolve os contadores da sessão (ou None)."""
+        counters = self.counters
+        if counters is not None:
+            self._restore_dispatch()
+            self.counters = None
+        return counters
+
+    def enable_profiling(self) -> Profiler:
+        """
+        Liga o profiler por método (ver `capivara.interp.profiler`): conta
+        opcodes e offsets e mede tempo próprio/inclusivo de cada frame.
+        """
+        prof = Profiler()
+        loop = specialize(Interpreter._run_frame, {
+            "enter": "_prof = self.profiler.current; _opc = _prof.ops; _offc = _prof.offsets",
+            "op": "_opc[op] += 1; _offc[pc - 1] += 1",
+        })
+        clock = prof.clock
+
+        def run_frame(rc: RuntimeClass, code: CodeAttribute, frame: Frame) -> ExecResult:
+            mp = prof.method_profile(rc, code)
+            mp.invocations += 1
+            mp.active += 1
+            parent, parent_child = prof.current, prof.child_s
+            prof.current, prof.child_s = mp, 0.0
+            t0 = clock()
+            try:
+                return loop(self, rc, code, frame)
+            finally:
+                dt = clock() - t0
+                mp.self_s += dt - prof.child_s
+                mp.active -= 1
+                if mp.active == 0:
+                    mp.inclusive_s += dt
+                prof.current, prof.child_s = parent, parent_child + dt
+
+        self._install_dispatch(run_frame)
+        self.profiler = prof
+        return prof
+
+    def disable_profiling(self) -> Optional[Profiler]:
+        """Volta ao laço normal; devolve o profiler da sessão (ou None)."""
+        prof = self.profiler
+        if prof is not None:
+            self._restore_dispatch()
+            self.profiler = None
+        return prof
+
+    def enable_metrics(self) -> ExecMetrics:
+        """
+        Contagem global de bytecodes e invocações para `capivara.interp.metrics`
+        (variante do laço sem wrapper por frame: mais barata que `enable_counting`).
+        Com threads verdes, os contadores entram no laço gerador delas.
+        """
+        metrics = ExecMetrics()
+        if self.green is not None:
+            if self.metrics is not None:
+                raise RuntimeError("métricas já estão ligadas")
+            self.metrics = metrics
+            self._green_loop()
+            return metrics
+        loop = specialize(Interpreter._run_frame, {
+            "enter": "_m = self.metrics; _m.invocations += 1",
+            "op": "_m.bytecodes += 1",
+        })
+        self._install_dispatch(types.MethodType(loop, self))
+        self.metrics = metrics
+        return metrics
+
+    def disable_metrics(self) -> Optional[ExecMetrics]:
+        metrics = self.metrics
+        if metrics is not None:
+            self.metrics = None
+            if self.green is not None:
+                self._green_loop()
+            else:
+                self._restore_dispatch()
+        return metrics
+
+    def enable_green_threads(self, quantum: int = 10_000) -> GreenScheduler:
+        """
+        Liga as threads verdes (ver `capivara.interp.threads`): `execute_*`
+        passam a rodar a entrada como thread "main" de um escalonador que
+        preempta cada thread a cada `quantum` bytecodes.
+        """
+        return self._install_green(GreenScheduler(self, quantum))
+
+    def enable_async(self, quantum: int = 10_000):
+        """
+        Modo asyncio (ver `capivara.interp.aio`): threads verdes cujo
+        escalonador roda dentro do event loop, cedendo a ele a cada `quantum`
+        bytecodes e em nativos bloqueantes. Use os `execute_*_async`.
+        """
+        from capivara.interp.aio import AsyncScheduler  # asyncio só para quem usa
+        return self._install_green(AsyncScheduler(self, quantum))
+
+    def _install_green(self, sched: GreenScheduler) -> GreenScheduler:
+        if "_run_frame" in self.__dict__:
+            raise RuntimeError("threads verdes não combinam com outro modo de despacho ativo")
+        if self.green is not None:
+            raise RuntimeError("threads verdes já estão ligadas")
+        self.green = sched
+        self._green_loop()
+        return sched
+
+    def _green_loop(self) -> None:
+        """(Re)compila o laço gerador das threads verdes, com os contadores de `enable_metrics` se ligados."""
+        hooks = {
+            "enter": "_gt = self.green.current",
+            "op": "_gt.left -= 1",
+            "backedge": "if off < 0 and _gt.left <= 0: yield",
+            "invoke": "if _gt.left <= 0: yield",
+        }
+        if self.metrics is not None:
+            hooks["enter"] += "; _m = self.metrics; _m.invocations += 1"
+            hooks["op"] += "; _m.bytecodes += 1"
+        loop = specialize(Interpreter._run_frame, hooks, calls={
+            "self._run_frame": "self._green_run_frame", "self._intrinsic": "self._green_intrinsic",
+            "self._run_synchronized": "self._green_run_synchronized",
+            "self._monitor_enter": "self._green_monitor_enter"})
+        self._green_run_frame = types.MethodType(loop, self)
+
+    def disable_green_threads(self) -> Optional[GreenScheduler]:
+        sched = self.green
+        if sched is not None:
+            self.__dict__.pop("_green_run_frame", None)
+            self.green = None
+        return sched
+
+    # ===== Eventos (ver `capivara.interp.events`) =====
+    def add_hook(self, event: str, callback: Callable) -> Callable:
+        """
+        Registra `callback` para `event`; eventos de classe vão para o loader.
+
+        Eventos do intérprete usam uma variante própria do laço e não se
+        combinam com os outros modos: com contagem, profiling ou métricas
+        ligados, ou com threads verdes/asyncio (que rodam `_green_run_frame`),
+        levantam RuntimeError em vez de nunca disparar.
+        """
+        if event in LOADER_EVENTS:
+            return self.loader.hooks.add(event, callback)
+        if self.green is not None:
+            raise RuntimeError(f"evento '{event}' não dispara com threads verdes/asyncio ligados")
+        if "_run_frame" in self.__dict__ and not self._hooked:
+            raise RuntimeError(f"evento '{event}' não combina com contagem/profiling/métricas ligados")
+        self.hooks.add(event, callback)
+        self._select_hooked_dispatch()
+        return callback
+
+    def remove_hook(self, event: str, callback: Callable) -> None:
+        if event in LOADER_EVENTS:
+            self.loader.hooks.remove(event, callback)
+            return
+        self.hooks.remove(event, callback)
+        self._select_hooked_dispatch()
+
+    def _select_hooked_dispatch(self) -> None:
+        # a variante depende de quais eventos têm callbacks; sem nenhum, laço normal
+        if self._hooked:
+            self._restore_dispatch()
+            self._hooked = False
+        if self.hooks:
+            self._install_dispatch(self._hooked_run_frame())
+            self._hooked = True
+
+    def _hooked_run_frame(self):
+        hooks = self.hooks
+        loop_hooks = {}
+        if hooks.has("allocation"):
+            loop_hooks["new"] = 'self.hooks.emit("allocation", rc_new, oid)'
+        if hooks.has("exception_throw"):
+            loop_hooks["op"] = "_ipc = pc - 1"  # início da instrução corrente, lido no traceback
+        loop = specialize(Interpreter._run_frame, loop_hooks)
+        entry = hooks.callbacks["method_entry"]
+        exit_ = hooks.callbacks["method_exit"]
+        throw = hooks.callbacks["exception_throw"]
+
+        def run_frame(rc: RuntimeClass, code: CodeAttribute, frame: Frame) -> ExecResult:
+            for cb in entry:
+                cb(rc, code, frame)
+            try:
+                res = loop(self, rc, code, frame)
+            except Exception as e:
+                if throw and not getattr(e, "_capivara_thrown", False):
+                    e._capivara_thrown = True
+                    for cb in throw:
+                        cb(rc, code, _throw_pc(e.__traceback__, loop.__code__), e)
+                for cb in exit_:
+                    cb(rc, code, None, e)
+                raise
+            for cb in exit_:
+                cb(rc, code, res, None)
+            return res
+
+        return run_frame
+
     # ===== API externa =====
-    def execute_method(self, rc: RuntimeClass, name: str, desc: str) -> ExecResult:
+    def prepare_method(self, rc: RuntimeClass, name: str, desc: str) -> Tuple[CodeAttribute, Frame]:
+        """Resolve o método e cria o frame de entrada, sem executar."""
         m = rc.find_method(name, desc)
         if not m:
             raise LookupError(f"método não encontrado: {rc.name}.{name}{desc}")
-        code: CodeAttribute | None = None
-        for a in m.attributes:
-            if isinstance(a, CodeAttribute):
-                code = a
-                break
+        code = find_code_attribute(m.attributes, rc.cf.constant_pool)
         if not code:
             raise RuntimeError("método sem atributo Code")
-        frame = Frame(max_locals=code.max_locals, max_stack=code.max_stack)
+        return code, Frame(max_locals=code.max_locals, max_stack=code.max_stack)
+
+    def execute_frame(self, rc: RuntimeClass, code: CodeAttribute, frame: Frame) -> ExecResult:
+        """Executa um frame preparado por `prepare_method` (como thread "main" se houver threads verdes)."""
+        if self.green is not None:
+            return self.green.run_main(rc, code, frame)
         return self._run_frame(rc, code, frame)
 
-    def execute_static_entry(self, main_bin: str, name: str, desc: str) -> ExecResult:
+    def execute_method(self, rc: RuntimeClass, name: str, desc: str, args: Sequence[int] = ()) -> ExecResult:
+        """Executa um método static; `args` são os parâmetros int, na ordem do descritor."""
+        return self.execute_frame(rc, *self._entry_frame(rc, name, desc, args))
+
+    def execute_static_entry(self, main_bin: str, name: str, desc: str, args: Sequence[int] = ()) -> ExecResult:
+        rc = self.loader.load_class(main_bin)
+        return self.execute_method(rc, name, desc, args)
+
+    async def execute_frame_async(self, rc: RuntimeClass, code: CodeAttribute, frame: Frame) -> ExecResult:
+        """`execute_frame` como corrotina (requer `enable_async`); chamadas simultâneas viram threads verdes."""
+        run = getattr(self.green, "run_main_async", None)
+        if run is None:
+            raise RuntimeError("execute_*_async requer o modo asyncio (enable_async)")
+        return await run(rc, code, frame)
+
+    async def execute_method_async(self, rc: RuntimeClass, name: str, desc: str,
+                                   args: Sequence[int] = ()) -> ExecResult:
+        return await self.execute_frame_async(rc, *self._entry_frame(rc, name, desc, args))
+
+    async def execute_static_entry_async(self, main_bin: str, name: str, desc: str,
+                                         args: Sequence[int] = ()) -> ExecResult:
         rc = self.loader.load_class(main_bin)
-        return self.execute_method(rc, name, desc)
+        return await self.execute_method_async(rc, name, desc, args)
+
+    def _entry_frame(self, rc: RuntimeClass, name: str, desc: str, args: Sequence[int]) -> Tuple[CodeAttribute, Frame]:
+        self.initialize_class(rc)
+        code, frame = self.prepare_method(rc, name, desc)
+        if args or desc[1] != ")":
+            params, _ = parse_method_descriptor(desc)
+            if not all(isinstance(p, BaseType) and p.code == "I" for p in params):
+                raise NotImplementedError("apenas parâmetros int neste passo")
+            if len(args) != len(params):
+                raise ValueError(f"{name}{desc} espera {len(params)} argumento(s), recebeu {len(args)}")
+            for i, v in enumerate(args):
+                frame.set_local_int(i, v)
+        return code, frame
+
+    # ===== Canais de E/S (capivara/io/Channel) =====
+    def open_channel(self, obj) -> int:
+        """
+        Registra `obj` como canal e devolve o id que o Java passa a
+        capivara/io/Channel. Síncrono: `read(n) -> bytes` e `write(b)`; no modo
+        asyncio, `aread`/`awrite` (corrotinas) se houver, senão `read`/`write`
+        rodam num executor sem travar o event loop.
+        """
+        cid = self._next_channel
+        self._next_channel += 1
+        self.channels[cid] = obj
+        return cid
+
+    def close_channel(self, cid: int):
+        """Remove o canal `cid` (o objeto não é fechado) e o devolve."""
+        return self.channels.pop(cid)
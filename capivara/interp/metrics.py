@@ -0,0 +1,167 @@
+"""
+Métricas de runtime da VM, exportáveis como JSON ou no formato texto do
+Prometheus.
+
+Fontes (todas baratas):
+- ClassLoader.stats: classes carregadas, bytes lidos, tempo de leitura/parse/link
+- Heap: objetos alocados e vivos
+- bytecodes/invocações: contagem global feita por uma variante do laço
+  (`Interpreter.enable_metrics`) ou, se ativos, pelos modos de contagem/profiling
+- pausas de GC: o heap da VM ainda não tem coletor; registramos as coletas do
+  GC do Python (gc.callbacks), que são as pausas que a VM sofre de fato
+
+`snapshot(interp)` devolve um dicionário plano; `MetricsExporter` grava no
+fim da execução e/ou periodicamente (escrita atômica via arquivo temporário).
+"""
+from __future__ import annotations
+import gc
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+@dataclass(slots=True)
+class ExecMetrics:
+    """Atualizado pela variante de métricas do laço de despacho."""
+    bytecodes: int = 0
+    invocations: int = 0
+
+class GCMonitor:
+    """Conta coletas do GC do Python e o tempo total de pausa."""
+    def __init__(self):
+        self.collections = 0
+        self.pause_s = 0.0
+        self.max_pause_s = 0.0
+        self._t0: Optional[float] = None
+
+    def _callback(self, phase: str, info: Dict) -> None:
+        if phase == "start":
+            self._t0 = time.perf_counter()
+        elif self._t0 is not None:
+            dt = time.perf_counter() - self._t0
+            self._t0 = None
+            self.collections += 1
+            self.pause_s += dt
+            self.max_pause_s = max(self.max_pause_s, dt)
+
+    def start(self) -> "GCMonitor":
+        if self._callback not in gc.callbacks:
+            gc.callbacks.append(self._callback)
+        return self
+
+    def stop(self) -> None:
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+# nome -> (tipo Prometheus, ajuda)
+METRICS: Dict[str, Tuple[str, str]] = {
+    "uptime_seconds":            ("gauge",   "Tempo desde o início da coleta de métricas."),
+    "classes_loaded":            ("counter", "Classes carregadas pelo ClassLoader."),
+    "class_bytes_read":          ("counter", "Bytes de .class lidos."),
+    "class_read_seconds":        ("counter", "Tempo lendo bytes de .class."),
+    "class_parse_seconds":       ("counter", "Tempo em read_classfile."),
+    "class_link_seconds":        ("counter", "Tempo de link das classes."),
+    "bytecodes_executed":        ("counter", "Bytecodes executados."),
+    "method_invocations":        ("counter", "Frames Java executados."),
+    "heap_allocations":          ("counter", "Objetos alocados no heap."),
+    "heap_live_objects":         ("gauge",   "Objetos vivos no heap."),
+    "gc_collections":            ("counter", "Coletas do GC do Python durante a execução."),
+    "gc_pause_seconds":          ("counter", "Tempo total de pausa do GC do Python."),
+    "gc_max_pause_seconds":      ("gauge",   "Maior pausa do GC do Python."),
+}
+
+def snapshot(interp, gc_monitor: Optional[GCMonitor] = None, started: Optional[float] = None) -> Dict[str, float]:
+    ld = interp.loader
+    st = ld.stats
+    out: Dict[str, float] = {
+        "classes_loaded": st.classes_loaded,
+        "class_bytes_read": st.bytes_read,
+        "class_read_seconds": st.read_s,
+        "class_parse_seconds": st.parse_s,
+        "class_link_seconds": st.link_s,
+        "heap_allocations": ld.heap.allocated,
+        "heap_live_objects": len(ld.heap),
+    }
+    if started is not None:
+        out["uptime_seconds"] = time.perf_counter() - started
+    if interp.counters is not None:
+        out["bytecodes_executed"] = interp.counters.bytecodes
+        out["method_invocations"] = interp.counters.invocations
+    elif interp.profiler is not None:
+        rep_methods = interp.profiler.methods.values()
+        out["bytecodes_executed"] = sum(m.bytecodes for m in rep_methods)
+        out["method_invocations"] = sum(m.invocations for m in rep_methods)
+    elif interp.metrics is not None:
+        out["bytecodes_executed"] = interp.metrics.bytecodes
+        out["method_invocations"] = interp.metrics.invocations
+    if gc_monitor is not None:
+        out["gc_collections"] = gc_monitor.collections
+        out["gc_pause_seconds"] = gc_monitor.pause_s
+        out["gc_max_pause_seconds"] = gc_monitor.max_pause_s
+    return out
+
+def to_json(snap: Dict[str, float]) -> str:
+    return json.dumps(snap, sort_keys=True)
+
+def to_prometheus(snap: Dict[str, float], prefix: str = "capivara_") -> str:
+    lines = []
+    for name, (kind, help_) in METRICS.items():
+        if name not in snap:
+            continue
+        full = prefix + name + ("_total" if kind == "counter" else "")
+        lines.append(f"# HELP {full} {help_}")
+        lines.append(f"# TYPE {full} {kind}")
+        lines.append(f"{full} {snap[name]}")
+    return "\n".join(lines) + "\n"
+
+FORMATS = {"json": to_json, "prometheus": to_prometheus}
+
+class MetricsExporter:
+    """
+    Grava métricas de `interp` em `path` no `fmt` pedido: `write()` a qualquer
+    momento, e a cada `interval` segundos entre `start()` e `stop()` (que grava
+    uma última vez).
+    """
+    def __init__(self, interp, path: str, fmt: str = "json", interval: Optional[float] = None):
+        if fmt not in FORMATS:
+            raise ValueError(f"formato de métricas desconhecido: {fmt}")
+        if interval is not None and interval <= 0:
+            raise ValueError("intervalo deve ser > 0")
+        self.interp = interp
+        self.path = path
+        self.render = FORMATS[fmt]
+        self.interval = interval
+        self.gc = GCMonitor()
+        self.started = time.perf_counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self) -> None:
+        data = self.render(snapshot(self.interp, self.gc, self.started))
+        tmp = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def start(self) -> "MetricsExporter":
+        self.gc.start()
+        self.started = time.perf_counter()
+        if self.interval:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="capivara-metrics", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.gc.stop()
+        self.write()
@@ -0,0 +1,107 @@
+"""
+Profiler instrumentado por método (`capivara run --profile`).
+
+Por método Java: invocações, bytecodes por opcode e por offset, tempo
+próprio (self) e inclusivo. O tempo inclusivo de métodos recursivos conta só
+a ativação mais externa, para não contar a mesma janela de tempo duas vezes.
+Os tempos incluem o custo da própria instrumentação; servem para comparar
+métodos entre si, não como valores absolutos.
+
+Como a contagem (`counting`), o profiler troca o laço de despacho da
+instância por uma variante (`Interpreter.enable_profiling`).
+"""
+from __future__ import annotations
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from capivara.classfile.attributes import CodeAttribute, line_number_for_pc
+from capivara.util import opcodes as OP
+
+@dataclass(slots=True)
+class MethodProfile:
+    method: str
+    code: CodeAttribute = field(repr=False)
+    invocations: int = 0
+    self_s: float = 0.0
+    inclusive_s: float = 0.0
+    active: int = 0                   # ativações em andamento (recursão)
+    ops: List[int] = field(default_factory=lambda: [0] * 256, repr=False)
+    offsets: List[int] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        if not self.offsets:
+            self.offsets = [0] * len(self.code.code)
+
+    @property
+    def bytecodes(self) -> int:
+        return sum(self.ops)
+
+    def hot_offsets(self, n: int) -> List[Dict]:
+        ranked = sorted(((c, pc) for pc, c in enumerate(self.offsets) if c), key=lambda t: (-t[0], t[1]))
+        out = []
+        for c, pc in ranked[:n]:
+            op = self.code.code[pc]
+            out.append({"pc": pc, "opcode": OP.OPCODE_NAMES.get(op, f"0x{op:02x}"),
+                        "count": c, "line": line_number_for_pc(self.code, pc)})
+        return out
+
+class Profiler:
+    """Estado de uma sessão de profiling (ver `Interpreter.enable_profiling`)."""
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(self):
+        self.methods: Dict[str, MethodProfile] = {}
+        self.current: Optional[MethodProfile] = None
+        self.child_s = 0.0                # tempo gasto em chamadas do frame corrente
+        self._by_code: Dict[int, MethodProfile] = {}
+
+    def method_profile(self, rc, code: CodeAttribute) -> MethodProfile:
+        mp = self._by_code.get(id(code))
+        if mp is None:
+            label = rc.method_label(code)
+            mp = self.methods.get(label)
+            if mp is None:
+                mp = self.methods[label] = MethodProfile(label, code)
+            self._by_code[id(code)] = mp
+        return mp
+
+    def report(self, top: int = 10, offsets: int = 5) -> Dict:
+        ops = [0] * 256
+        for m in self.methods.values():
+            for op, k in enumerate(m.ops):
+                ops[op] += k
+        total_s = sum(m.self_s for m in self.methods.values())
+        ranked = sorted(self.methods.values(), key=lambda m: (-m.self_s, m.method))
+        return {
+            "total_s": total_s,
+            "bytecodes": sum(ops),
+            "invocations": sum(m.invocations for m in self.methods.values()),
+            "opcodes": dict(sorted(((OP.OPCODE_NAMES.get(op, f"0x{op:02x}"), k) for op, k in enumerate(ops) if k),
+                                   key=lambda kv: (-kv[1], kv[0]))),
+            "methods": [{
+                "method": m.method,
+                "invocations": m.invocations,
+                "bytecodes": m.bytecodes,
+                "self_s": m.self_s,
+                "inclusive_s": m.inclusive_s,
+                "self_pct": 100.0 * m.self_s / total_s if total_s else 0.0,
+                "hot_offsets": m.hot_offsets(offsets),
+            } for m in ranked[:top]],
+        }
+
+def format_profile(report: Dict, opcodes: int = 15) -> str:
+    lines = [f"tempo total {report['total_s']:.4f}s | bytecodes {report['bytecodes']:,} | "
+             f"invocações {report['invocations']:,}",
+             "",
+             f"{'self%':>6} {'self(s)':>9} {'incl.(s)':>9} {'invoc.':>9} {'bytecodes':>11}  método"]
+    for m in report["methods"]:
+        lines.append(f"{m['self_pct']:>6.1f} {m['self_s']:>9.4f} {m['inclusive_s']:>9.4f} "
+                     f"{m['invocations']:>9,} {m['bytecodes']:>11,}  {m['method']}")
+        for h in m["hot_offsets"]:
+            line = f" linha {h['line']}" if h["line"] is not None else ""
+            lines.append(f"{'':>49}pc {h['pc']:>5} {h['opcode']:<14} {h['count']:>10,}{line}")
+    lines += ["", f"{'opcode':<14} {'execuções':>12}"]
+    for name, k in list(report["opcodes"].items())[:opcodes]:
+        lines.append(f"{name:<14} {k:>12,}")
+    return "\n".join(lines)
@@ -0,0 +1,120 @@
+"""
+Profiler por amostragem (flamegraphs em nível Java).
+
+Uma thread de timer acorda `hz` vezes por segundo e inspeciona a pilha
+Python da thread que executa o intérprete (`sys._current_frames`): cada
+frame de `Interpreter._run_frame` é um frame Java, e seus locais `rc`,
+`code` e `pc` dão classe, método e linha (via LineNumberTable). O laço de
+despacho não é instrumentado; o custo fica só na thread de amostragem
+(contabilizado em `sample_time_s`).
+
+A saída é o formato "collapsed stacks" (`raiz;...;folha contagem`),
+aceito por flamegraph.pl, speedscope, inferno etc.:
+
+    with SamplingProfiler(hz=100) as sp:
+        interp.execute_static_entry(...)
+    sp.write_collapsed("out.folded")
+"""
+from __future__ import annotations
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from capivara.classfile.attributes import line_number_for_pc
+
+_LOOP_NAME = "_run_frame"
+
+class SamplingProfiler:
+    def __init__(self, hz: float = 100.0, thread_id: Optional[int] = None):
+        if hz <= 0:
+            raise ValueError("hz deve ser > 0")
+        self.interval = 1.0 / hz
+        self.thread_id = thread_id           # default: a thread que chama start()
+        self.stacks: Counter = Counter()     # tupla de frames (raiz primeiro) -> amostras
+        self.samples = 0
+        self.empty_samples = 0               # thread fora de código Java (ex.: carregando classes)
+        self.sample_time_s = 0.0             # tempo gasto amostrando (overhead)
+        self._labels: Dict[int, Tuple[object, str]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop_file: Optional[str] = None
+
+    # ===== ciclo de vida =====
+    def start(self) -> "SamplingProfiler":
+        if self._thread is not None:
+            raise RuntimeError("amostragem já iniciada")
+        from capivara.interp.loop import Interpreter
+        self._loop_file = Interpreter._run_frame.__code__.co_filename
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="capivara-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        clock = time.perf_counter
+        next_t = clock()
+        while not self._stop.is_set():
+            next_t += self.interval
+            delay = next_t - clock()
+            if delay > 0:
+                if self._stop.wait(delay):
+                    break
+            else:
+                next_t = clock()  # atrasado (GIL ocupado): não acumula amostras em rajada
+            t0 = clock()
+            self.sample()
+            self.sample_time_s += clock() - t0
+
+    # ===== amostragem =====
+    def _label(self, rc, code, pc: int) -> str:
+        cached = self._labels.get(id(code))
+        if cached is None or cached[0] is not code:
+            m = rc.method_for_code(code)
+            name = rc.cf.constant_pool.get_utf8(m.name_index) if m is not None else "?"
+            cached = self._labels[id(code)] = (code, f"{rc.name.replace('/', '.')}.{name}")
+        line = line_number_for_pc(code, max(pc - 1, 0))
+        return f"{cached[1]}:{line}" if line is not None else cached[1]
+
+    def sample(self) -> None:
+        """Captura uma amostra da pilha Java da thread alvo."""
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            co = frame.f_code
+            if co.co_name == _LOOP_NAME and co.co_filename == self._loop_file:
+                loc = frame.f_locals
+                rc, code = loc.get("rc"), loc.get("code")
+                if rc is not None and code is not None:
+                    stack.append(self._label(rc, code, loc.get("pc", 0)))
+            frame = frame.f_back
+        self.samples += 1
+        if not stack:
+            self.empty_samples += 1
+            return
+        stack.reverse()
+        self.stacks[tuple(stack)] += 1
+
+    # ===== saída =====
+    def collapsed(self) -> str:
+        return "".join(f"{';'.join(s)} {n}\n" for s, n in sorted(self.stacks.items()))
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
@@ -0,0 +1,253 @@
+"""
+Threads verdes para java/lang/Thread: todas as threads Java rodam numa única
+thread Python, cada uma com a sua pilha de frames.
+
+Com `Interpreter.enable_green_threads`, o laço de despacho é recompilado como
+gerador (ver `capivara.interp.variants`): cada invocação Java vira
+`yield from` do frame chamado, então a pilha Java de uma thread é uma cadeia
+de geradores suspensa no heap, não na pilha Python. O laço conta bytecodes
+num orçamento da thread corrente (`quantum`) e, esgotado, cede o controle em
+desvios para trás e invocações; operações bloqueantes (join, monitores)
+estacionam a thread até alguém chamar `unpark`. Thread.sleep estaciona só a
+thread que dorme, com um prazo: o escalonador a acorda quando ele vence e,
+sem nenhuma thread pronta, dorme até o prazo mais próximo.
+
+Locks (monitorenter/monitorexit, métodos synchronized) são thin locks no
+cabeçalho do objeto (`lock_owner`/`lock_count` em VMObject e RuntimeClass):
+adquirir um lock livre ou reentrar é só atribuir dois campos. Só quando uma
+thread encontra o lock com outro dono ele infla para um `Monitor` com fila de
+espera; o último `monitorexit` sem ninguém na fila desinfla. Sem threads
+verdes a VM só tem uma thread Java e o laço normal elide os locks.
+
+O <clinit> continua rodando no laço normal, sem preempção: a inicialização de
+uma classe é atômica para as demais threads.
+"""
+from __future__ import annotations
+import heapq
+import sys
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from capivara.classfile.constant_pool import MemberRef
+from capivara.classfile.symbols import SYMBOLS
+from capivara.runtime.frame import Frame
+from capivara.util import opcodes as OP
+
+PARK = object()  # valor cedido ao escalonador: thread bloqueada (não volta para a fila)
+
+class GreenThread:
+    __slots__ = ("tid", "name", "oid", "gen", "left", "state", "joiners", "result", "exc")
+
+    def __init__(self, tid: int, name: str, oid: Optional[int], gen: Iterator):
+        self.tid = tid
+        self.name = name
+        self.oid = oid              # objeto java/lang/Thread (None para a main)
+        self.gen = gen
+        self.left = 0               # bytecodes restantes no quantum corrente
+        self.state = "runnable"     # runnable | blocked | terminated
+        self.joiners: List[GreenThread] = []
+        self.result = None
+        self.exc: Optional[BaseException] = None
+
+    def __repr__(self) -> str:
+        return f"<GreenThread {self.tid} {self.name!r} {self.state}>"
+
+class Monitor:
+    """Lock inflado: threads estacionadas esperando o dono soltar."""
+    __slots__ = ("waiters",)
+
+    def __init__(self):
+        self.waiters: Deque[GreenThread] = deque()
+
+class GreenScheduler:
+    """Escalonador round-robin das threads verdes de um Interpreter."""
+    def __init__(self, interp, quantum: int = 10_000):
+        if quantum < 1:
+            raise ValueError("quantum deve ser >= 1")
+        self.interp = interp
+        self.quantum = quantum
+        self.ready: Deque[GreenThread] = deque()
+        self.by_oid: Dict[int, GreenThread] = {}
+        self.current: Optional[GreenThread] = None
+        self.blocked: Dict[int, GreenThread] = {}  # tid -> thread estacionada
+        self.threads = 0            # threads criadas (inclui a main)
+        self.switches = 0           # preempções por quantum/yield
+        self.parks = 0              # bloqueios
+        self.inflations = 0         # locks que viraram Monitor por disputa
+        self.uncaught: List[GreenThread] = []
+        self._timers: List[Tuple[float, int, GreenThread]] = []  # heap (prazo, tid, thread) de Thread.sleep
+        self._run_ref = MemberRef(OP.CP_Methodref, "java/lang/Thread", "run", "()V",
+                                  SYMBOLS.intern("run"), SYMBOLS.intern("()V"))
+
+    # ===== criação =====
+    def spawn(self, gen: Iterator, name: str, oid: Optional[int] = None) -> GreenThread:
+        t = GreenThread(self.threads, name, oid, gen)
+        self.threads += 1
+        if oid is not None:
+            self.by_oid[oid] = t
+        self.ready.append(t)
+        return t
+
+    def start(self, oid: int) -> GreenThread:
+        """Thread.start(): agenda `run()` do objeto `oid`."""
+        if oid is None:
+            raise RuntimeError("NullPointerException (Thread.start)")
+        if oid in self.by_oid:
+            raise RuntimeError("IllegalThreadStateException: thread já iniciada")
+        interp = self.interp
+        ld = interp.loader
+        rc = ld.load_class(ld.heap.get(oid).class_name)
+        decl_rc, code, sync = interp._lookup_instance_in_hierarchy(rc, self._run_ref)
+        frame = Frame(max_locals=code.max_locals, max_stack=code.max_stack)
+        frame.set_local_ref(0, oid)
+        if sync:
+            gen = interp._green_run_synchronized(decl_rc, code, frame, ld.heap.get(oid))
+        else:
+            gen = interp._green_run_frame(decl_rc, code, frame)
+        return self.spawn(gen, f"Thread-{self.threads - 1}", oid)
+
+    # ===== bloqueio =====
+    def park(self) -> Iterator:
+        """`yield from sched.park()`: suspende a thread corrente até `unpark`."""
+        self.parks += 1
+        yield PARK
+
+    def unpark(self, t: GreenThread) -> None:
+        if t.state == "blocked":
+            t.state = "runnable"
+            del self.blocked[t.tid]
+            self.ready.append(t)
+
+    def join(self, oid: Optional[int]) -> Iterator:
+        if oid is None:
+            raise RuntimeError("NullPointerException (Thread.join)")
+        t = self.by_oid.get(oid)  # nunca iniciada: retorna na hora, como na JVM
+        while t is not None and t.state != "terminated":
+            t.joiners.append(self.current)
+            yield from self.park()
+
+    def sleep(self, seconds: float) -> Iterator:
+        """`yield from sched.sleep(s)`: Thread.sleep; estaciona só a thread corrente até o prazo."""
+        t = self.current
+        heapq.heappush(self._timers, (time.monotonic() + seconds, t.tid, t))
+        yield from self.park()
+
+    def _wake_sleepers(self) -> None:
+        timers = self._timers
+        now = time.monotonic()
+        while timers and timers[0][0] <= now:
+            self.unpark(heapq.heappop(timers)[2])
+
+    def block_on(self, call: Callable[[], object], acall: Optional[Callable[[], Awaitable]]) -> Iterator:
+        """
+        `yield from sched.block_on(call, acall)`: operação nativa bloqueante
+        (I/O de canal). Aqui roda `call()` na hora e bloqueia todas as threads
+        verdes; o escalonador asyncio (`capivara.interp.aio`) estaciona só a
+        thread corrente enquanto `acall()` (ou `call` num executor) roda.
+        """
+        return call()
+        yield  # gerador, para o `yield from` do laço
+
+    def is_done(self, oid: Optional[int]) -> bool:
+        t = self.by_oid.get(oid)
+        return t is None or t.state == "terminated"
+
+    # ===== locks (cabeçalho: VMObject ou RuntimeClass) =====
+    def try_lock(self, h) -> bool:
+        """Caminho rápido do thin lock: lock livre ou reentrada da própria thread."""
+        tid = self.current.tid
+        owner = h.lock_owner
+        if owner is None:
+            h.lock_owner = tid
+            h.lock_count = 1
+            return True
+        if owner == tid:
+            h.lock_count += 1
+            return True
+        return False
+
+    def lock(self, h) -> Iterator:
+        """`yield from sched.lock(h)` depois de um `try_lock` que falhou: infla e espera."""
+        while not self.try_lock(h):
+            mon = h.monitor  # relido a cada volta: pode ter desinflado enquanto estávamos na fila
+            if mon is None:
+                mon = h.monitor = Monitor()
+                self.inflations += 1
+            mon.waiters.append(self.current)
+            yield from self.park()
+
+    def unlock(self, h) -> None:
+        if h.lock_owner != self.current.tid:
+            raise RuntimeError("IllegalMonitorStateException: lock não pertence à thread corrente")
+        h.lock_count -= 1
+        if h.lock_count == 0:
+            h.lock_owner = None
+            mon = h.monitor
+            if mon is not None:
+                if mon.waiters:
+                    self.unpark(mon.waiters.popleft())
+                else:
+                    h.monitor = None  # sem disputa: volta a ser thin
+
+    # ===== execução =====
+    def _finish(self, t: GreenThread, result, exc: Optional[BaseException]) -> None:
+        t.state = "terminated"
+        t.result, t.exc = result, exc
+        t.gen = None
+        if exc is not None and t.oid is not None:
+            self.uncaught.append(t)
+            sys.stderr.write(f'Exception in thread "{t.name}" {type(exc).__name__}: {exc}\n')
+        for j in t.joiners:
+            self.unpark(j)
+        t.joiners.clear()
+
+    def _slice(self, t: GreenThread) -> None:
+        """Roda `t` por um quantum (ou até bloquear/terminar)."""
+        self.current = t
+        t.left = self.quantum
+        try:
+            signal = t.gen.send(None)
+        except StopIteration as stop:
+            self._finish(t, stop.value, None)
+            return
+        except Exception as e:
+            self._finish(t, None, e)
+            return
+        finally:
+            self.current = None
+        if signal is PARK:
+            t.state = "blocked"
+            self.blocked[t.tid] = t
+        else:
+            self.switches += 1
+            self.ready.append(t)
+
+    def _deadlock(self) -> RuntimeError:
+        names = ", ".join(t.name for t in self.blocked.values())
+        return RuntimeError(f"deadlock: threads bloqueadas: {names}")
+
+    def run(self) -> None:
+        """Roda até todas as threads terminarem; RuntimeError se sobrarem só threads bloqueadas."""
+        ready = self.ready
+        timers = self._timers
+        while ready or timers:
+            if timers:
+                self._wake_sleepers()
+                if not ready:
+                    # só há threads dormindo: espera o prazo mais próximo
+                    time.sleep(max(0.0, timers[0][0] - time.monotonic()))
+                    continue
+            self._slice(ready.popleft())
+        if self.blocked:
+            raise self._deadlock()
+
+    def run_main(self, rc, code, frame):
+        """Executa o frame de entrada como a thread "main" e espera todas as threads."""
+        if self.current is not None or self.ready:
+            raise RuntimeError("escalonador de threads verdes já está rodando")
+        main = self.spawn(self.interp._green_run_frame(rc, code, frame), "main")
+        self.run()
+        if main.exc is not None:
+            raise main.exc
+        return main.result
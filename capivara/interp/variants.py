@@ -0,0 +1,73 @@
+"""
+Variantes especializadas do laço de despacho.
+
+O laço de `Interpreter._run_frame` é escrito uma única vez; pontos de
+instrumentação são marcados com comentários `# @hook: <nome>` (que não custam
+nada no laço normal). `specialize` recompila o mesmo fonte trocando cada
+marcador pela linha de código pedida, gerando um laço alternativo — p.ex.
+com contagem de bytecodes — sem nenhum `if` extra no caminho padrão.
+
+Cada trecho deve ser uma única linha (use `;` para várias instruções): assim
+os números de linha da variante coincidem com os de `loop.py` nos tracebacks.
+
+Com `calls`, a variante vira um gerador: cada chamada `f(...)` listada passa a
+ser `yield from g(...)` (p.ex. invocações Java delegando a outro frame
+gerador), e trechos de hook podem conter `yield` — é assim que as threads
+verdes suspendem um frame sem pilha Python por thread.
+"""
+from __future__ import annotations
+import inspect
+import re
+import textwrap
+from typing import Callable, Dict, Optional, Tuple
+
+_HOOK_RE = re.compile(r"^(\s*)# @hook: (\w+)\s*$")
+
+_cache: Dict[Tuple, Callable] = {}
+
+def hook_points(func: Callable) -> Tuple[str, ...]:
+    """Nomes dos marcadores presentes no fonte de `func`, na ordem."""
+    src = inspect.getsource(func)
+    return tuple(m.group(2) for m in map(_HOOK_RE.match, src.splitlines()) if m)
+
+def specialize(func: Callable, hooks: Dict[str, str], calls: Optional[Dict[str, str]] = None) -> Callable:
+    """
+    Recompila `func` com os marcadores de `hooks` substituídos (os demais
+    continuam comentários) e, se pedido, as chamadas de `calls` trocadas por
+    `yield from`. O resultado usa os globais do módulo de `func`.
+    """
+    calls = calls or {}
+    key = (func, tuple(sorted(hooks.items())), tuple(sorted(calls.items())))
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        lines, first = inspect.getsourcelines(func)
+    except OSError as e:
+        raise RuntimeError(f"fonte de {func.__qualname__} indisponível para especialização") from e
+    src = textwrap.dedent("".join(lines)).splitlines()
+    unknown = set(hooks)
+    for i, line in enumerate(src):
+        m = _HOOK_RE.match(line)
+        if m and m.group(2) in hooks:
+            snippet = hooks[m.group(2)]
+            if "\n" in snippet:
+                raise ValueError(f"trecho do hook '{m.group(2)}' deve ter uma única linha")
+            src[i] = m.group(1) + snippet
+            unknown.discard(m.group(2))
+    if unknown:
+        raise ValueError(f"hooks inexistentes em {func.__qualname__}: {sorted(unknown)}")
+    for old, new in calls.items():
+        body = "\n".join(src[1:])
+        if old + "(" not in body:
+            raise ValueError(f"chamada inexistente em {func.__qualname__}: {old}")
+        src[1:] = body.replace(old + "(", f"yield from {new}(").split("\n")
+
+    code = compile("\n" * (first - 1) + "\n".join(src) + "\n", inspect.getsourcefile(func) or "<variant>", "exec")
+    ns: Dict[str, object] = {}
+    exec(code, func.__globals__, ns)
+    out = ns[func.__name__]
+    out.__qualname__ = func.__qualname__
+    _cache[key] = out
+    return out
@@ -0,0 +1,120 @@
+"""
+API para embutir a CapivaraVM em programas Python.
+
+Um `VM` guarda o ClassLoader, o Interpreter e, por método chamado, a
+resolução já feita (classe inicializada, Code, conversores de argumentos e
+retorno, ver `capivara.interp.convert`). A primeira chamada de um método
+carrega e resolve; as seguintes só montam o frame e executam:
+
+    vm = VM(["build/classes"])
+    soma = vm.function("pkg/Main", "soma", "([I)I")
+    soma([1, 2, 3])         # -> 6
+    vm.call("pkg/Main", "eco", "([B)[B", b"abc")
+
+O estado Java (estáticos, heap) persiste entre chamadas, como numa JVM de
+longa duração. O heap ainda não tem coleta: arrays criados para argumentos
+ficam nele até o VM ser descartado.
+
+Num serviço asyncio, `await vm.call_async(...)` roda a chamada sem travar o
+event loop (ver `capivara.interp.aio`); a partir daí o VM fica no modo
+asyncio e `call` deixa de valer.
+
+Vários VMs isolados podem partilhar um `capivara.loader.store.ClassStore`
+(`VM.from_store`): cada um tem estáticos, heap e StringPool próprios, e os
+ClassFile parseados existem uma vez só no processo.
+"""
+from __future__ import annotations
+from typing import Callable, Dict, Sequence, Tuple
+
+from capivara.interp.convert import Signature, array_from_python, array_to_python
+from capivara.interp.loop import Interpreter
+from capivara.loader.loader import ClassLoader
+from capivara.runtime.frame import Frame
+from capivara.util import flags as FL
+
+class _Entry:
+    __slots__ = ("rc", "code", "sig")
+
+    def __init__(self, rc, code, sig: Signature):
+        self.rc = rc
+        self.code = code
+        self.sig = sig
+
+class VM:
+    def __init__(self, classpath: Sequence[str], lazy: bool = False, store=None):
+        if store is None:
+            self.loader = ClassLoader(list(classpath), lazy=lazy)
+        else:
+            self.loader = ClassLoader.from_store(store)
+        self.interp = Interpreter(self.loader)
+        self._entries: Dict[Tuple[str, str, str], _Entry] = {}
+        self.calls = 0
+
+    @classmethod
+    def from_store(cls, store) -> "VM":
+        """VM isolado sobre as classes já parseadas de `store` (ver `capivara.loader.store`)."""
+        return cls(store.classpath.entries, store.lazy, store=store)
+
+    def _entry(self, class_name: str, name: str, desc: str) -> _Entry:
+        key = (class_name, name, desc)
+        e = self._entries.get(key)
+        if e is None:
+            interp = self.interp
+            rc = self.loader.load_class(class_name.replace(".", "/"))
+            m = rc.find_method(name, desc)
+            if m is None or not (m.access_flags & FL.ACC_STATIC):
+                raise LookupError(f"método static não encontrado: {rc.name}.{name}{desc}")
+            sig = Signature(desc)  # descritor inválido falha antes de rodar o <clinit>
+            interp.initialize_class(rc)
+            code, _ = interp.prepare_method(rc, name, desc)
+            e = self._entries[key] = _Entry(rc, code, sig)
+        return e
+
+    def call(self, class_name: str, name: str, desc: str, *args):
+        """Chama um método static convertendo `args` e o retorno (ver `capivara.interp.convert`)."""
+        e = self._entries.get((class_name, name, desc)) or self._entry(class_name, name, desc)
+        return self._invoke(e, args)
+
+    def function(self, class_name: str, name: str, desc: str) -> Callable:
+        """Resolve agora e devolve uma função Python que chama o método (sem busca por chamada)."""
+        e = self._entry(class_name, name, desc)
+
+        def java_method(*args):
+            return self._invoke(e, args)
+        java_method.__name__ = name
+        java_method.__qualname__ = f"{class_name}.{name}"
+        return java_method
+
+    async def call_async(self, class_name: str, name: str, desc: str, *args):
+        """`call` como corrotina; liga o modo asyncio do intérprete na primeira vez."""
+        e = self._entries.get((class_name, name, desc)) or self._entry(class_name, name, desc)
+        if self.interp.green is None:
+            self.interp.enable_async()
+        frame = self._frame(e, args)
+        return e.sig.result(self.loader.heap, await self.interp.execute_frame_async(e.rc, e.code, frame))
+
+    def _frame(self, e: _Entry, args: tuple) -> Frame:
+        code = e.code
+        frame = Frame(max_locals=code.max_locals, max_stack=code.max_stack)
+        e.sig.load(frame, self.loader.heap, args)
+        self.calls += 1
+        return frame
+
+    def _invoke(self, e: _Entry, args: tuple):
+        frame = self._frame(e, args)
+        return e.sig.result(self.loader.heap, self.interp.execute_frame(e.rc, e.code, frame))
+
+    # ===== valores Java fora de uma chamada =====
+    def new_array(self, elem: str, values) -> int:
+        """Aloca no heap um array `[elem` (ex. "I") com `values`; devolve o id do objeto."""
+        return array_from_python(self.loader.heap, elem, values)
+
+    def to_python(self, oid: int):
+        """Converte o array `oid` do heap para list/bytes/str."""
+        return array_to_python(self.loader.heap, oid)
+
+    def get_static(self, class_name: str, field: str, desc: str):
+        """Valor de um estático primitivo (classe já carregada e inicializada sob demanda)."""
+        rc = self.loader.load_class(class_name.replace(".", "/"))
+        self.interp.initialize_class(rc)
+        return rc.statics[(field, desc)].value
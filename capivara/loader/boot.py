@@ -0,0 +1,83 @@
+"""
+Classes de boot da VM: classes `java/lang/*` que a CapivaraVM fornece sem
+JDK, geradas com o ClassBuilder e servidas pelo ClassLoader antes do
+classpath (como o bootstrap loader da JVM).
+
+Métodos que precisam da VM (threads, monitores...) têm corpo em bytecode que
+chama um intrínseco: `impdep1 <id>` (opcode reservado pela JVMS para a
+implementação), tratado por `Interpreter._intrinsic`. Argumentos e
+resultados passam pela pilha de operandos, como numa chamada comum.
+"""
+from __future__ import annotations
+from typing import Callable, Dict
+
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+# ids dos intrínsecos (operando u1 do impdep1)
+THREAD_START = 1   # (Thread) -> ()
+THREAD_JOIN = 2    # (Thread) -> ()
+THREAD_YIELD = 3   # () -> ()
+THREAD_SLEEP = 4   # (long ms) -> ()
+CHANNEL_READ = 5   # (int canal, byte[] buf) -> int
+CHANNEL_WRITE = 6  # (int canal, byte[] buf, int n) -> int
+
+INTRINSIC_NAMES = {THREAD_START: "Thread.start", THREAD_JOIN: "Thread.join", THREAD_YIELD: "Thread.yield",
+                   THREAD_SLEEP: "Thread.sleep", CHANNEL_READ: "Channel.read", CHANNEL_WRITE: "Channel.write"}
+# intrínsecos que podem bloquear: com threads verdes passam por `GreenScheduler.block_on`
+BLOCKING = frozenset((THREAD_SLEEP, CHANNEL_READ, CHANNEL_WRITE))
+
+def _thread() -> bytes:
+    """java/lang/Thread mínima: subclasses sobrescrevem run(); start/join/yield são intrínsecos."""
+    from capivara.classfile.writer import ClassBuilder  # só quando a classe é pedida
+    cb = ClassBuilder("java/lang/Thread")
+    for name in ("<init>", "run"):
+        c = cb.code(max_stack=1, max_locals=1)
+        c.op(OP.RETURN)
+        cb.add_method(name, "()V", c, access=FL.ACC_PUBLIC)
+    for name, iid in (("start", THREAD_START), ("join", THREAD_JOIN)):
+        c = cb.code(max_stack=1, max_locals=1)
+        c.aload(0).op(OP.IMPDEP1, iid).op(OP.RETURN)
+        cb.add_method(name, "()V", c, access=FL.ACC_PUBLIC)
+    c = cb.code(max_stack=1, max_locals=0)
+    c.op(OP.IMPDEP1, THREAD_YIELD).op(OP.RETURN)
+    cb.add_method("yield", "()V", c, access=FL.ACC_PUBLIC | FL.ACC_STATIC)
+    c = cb.code(max_stack=2, max_locals=2)
+    c.op(OP.LLOAD_0).op(OP.IMPDEP1, THREAD_SLEEP).op(OP.RETURN)
+    cb.add_method("sleep", "(J)V", c, access=FL.ACC_PUBLIC | FL.ACC_STATIC)
+    return cb.to_bytes()
+
+def _channel() -> bytes:
+    """
+    capivara/io/Channel: E/S nativa sobre canais que o programa hospedeiro
+    abre com `Interpreter.open_channel` (o id do canal chega ao Java como int).
+
+        static int read(int canal, byte[] buf)          // bytes lidos, -1 no fim
+        static int write(int canal, byte[] buf, int n)  // bytes escritos
+    """
+    from capivara.classfile.writer import ClassBuilder
+    cb = ClassBuilder("capivara/io/Channel")
+    c = cb.code(max_stack=2, max_locals=2)
+    c.iload(0).aload(1).op(OP.IMPDEP1, CHANNEL_READ).op(OP.IRETURN)
+    cb.add_method("read", "(I[B)I", c, access=FL.ACC_PUBLIC | FL.ACC_STATIC)
+    c = cb.code(max_stack=3, max_locals=3)
+    c.iload(0).aload(1).iload(2).op(OP.IMPDEP1, CHANNEL_WRITE).op(OP.IRETURN)
+    cb.add_method("write", "(I[BI)I", c, access=FL.ACC_PUBLIC | FL.ACC_STATIC)
+    return cb.to_bytes()
+
+BOOT_CLASSES: Dict[str, Callable[[], bytes]] = {
+    "java/lang/Thread": _thread,
+    "capivara/io/Channel": _channel,
+}
+
+_bytes_cache: Dict[str, bytes] = {}
+
+def boot_class_bytes(binary_name: str):
+    """Bytes da classe de boot `binary_name` (None se não for uma)."""
+    data = _bytes_cache.get(binary_name)
+    if data is None:
+        factory = BOOT_CLASSES.get(binary_name)
+        if factory is None:
+            return None
+        data = _bytes_cache[binary_name] = factory()
+    return data
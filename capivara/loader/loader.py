@@ -1,6 +1,10 @@
 from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass
 from typing import Dict, Optional, Tuple
 
+from capivara.loader.boot import boot_class_bytes
 from capivara.loader.classpath import ClassPath
 from capivara.classfile.reader import read_classfile
 from capivara.runtime.klass import RuntimeClass, _cp_class_name
@@ -8,40 +12,136 @@ from capivara.runtime.strings import StringPool
 from capivara.runtime.heap import Heap
 from capivara.util.flags import ACC_STATIC, ACC_FINAL
 from capivara.classfile.attributes import ConstantValueAttribute
+from capivara.interp.events import EventHooks, LOADER_EVENTS
+
+@dataclass(slots=True)
+class LoaderStats:
+    """Contadores baratos do carregamento (atualizados só quando uma classe é carregada)."""
+    classes_loaded: int = 0
+    bytes_read: int = 0
+    read_s: float = 0.0      # leitura dos bytes (disco/jar)
+    parse_s: float = 0.0     # read_classfile
+    link_s: float = 0.0      # link + binding de ConstantValue
+
+def read_class_bytes(classpath: ClassPath, binary_name: str) -> bytes:
+    """Bytes de `binary_name`: classes de boot primeiro, depois o classpath."""
+    b = boot_class_bytes(binary_name)
+    if b is None:
+        b = classpath.read_class_bytes(binary_name)
+    if b is None:
+        raise FileNotFoundError(f".class não encontrado no classpath: {binary_name}")
+    return b
 
 class ClassLoader:
     """
     ClassLoader simples baseado em diretórios. Cacheia classes carregadas.
     Mantém um Heap e um StringPool.
+    Com lazy=True, os .class são lidos em modo lazy (ver `read_classfile`).
+    Classes de boot (`capivara.loader.boot`) têm precedência sobre o classpath.
+    Eventos `class_load`/`class_link` em `hooks` (ver `capivara.interp.events`).
+
+    `load_class` pode ser chamado de várias threads Python: cada nome binário
+    tem o seu lock (como `getClassLoadingLock` da JVM), então classes
+    diferentes carregam em paralelo e a mesma nunca é lida duas vezes. Uma
+    classe só aparece em `loaded` depois de linkada; a superclasse é carregada
+    antes, então os locks são tomados na ordem da hierarquia.
+
+    Com `store` (ver `capivara.loader.store`), os ClassFile vêm já parseados
+    de um ClassStore compartilhado; o loader só cria as suas RuntimeClass.
     """
-    def __init__(self, classpath_entries: list[str]):
-        self.classpath = ClassPath(classpath_entries)
+    def __init__(self, classpath_entries: list[str], lazy: bool = False, store=None):
+        self.classpath = ClassPath(classpath_entries) if store is None else store.classpath
+        self.lazy = lazy
+        self.store = store
         self.loaded: Dict[str, RuntimeClass] = {}
+        self._defining: Dict[str, RuntimeClass] = {}  # em carga (visível só à thread dona do lock)
+        self._locks: Dict[str, threading.RLock] = {}
+        self._guard = threading.Lock()  # tabela de locks e `stats`
         self.string_pool = StringPool()
         self.heap = Heap()
+        self.hooks = EventHooks(LOADER_EVENTS)
+        self.stats = LoaderStats()
+        self.tracer = None  # capivara.util.trace.Tracer: load_class/read_classfile/link na timeline
+
+    @classmethod
+    def from_store(cls, store) -> "ClassLoader":
+        """Loader isolado (estáticos, Heap, StringPool próprios) sobre os ClassFile de `store`."""
+        return cls(store.classpath.entries, store.lazy, store=store)
 
     def _load_bytes(self, binary_name: str) -> bytes:
-        b = self.classpath.read_class_bytes(binary_name)
-        if b is None:
-            raise FileNotFoundError(f".class não encontrado no classpath: {binary_name}")
-        return b
+        return read_class_bytes(self.classpath, binary_name)
+
+    def _class_lock(self, binary_name: str) -> threading.RLock:
+        lock = self._locks.get(binary_name)
+        if lock is None:
+            with self._guard:
+                lock = self._locks.setdefault(binary_name, threading.RLock())
+        return lock
 
     def load_class(self, binary_name: str) -> RuntimeClass:
-        if binary_name in self.loaded:
-            return self.loaded[binary_name]
+        rc = self.loaded.get(binary_name)
+        if rc is not None:
+            return rc
+        with self._class_lock(binary_name):
+            # outra thread pode ter terminado enquanto esperávamos; reentrada da
+            # própria thread (hooks, hierarquia inválida) vê a classe em carga
+            rc = self.loaded.get(binary_name) or self._defining.get(binary_name)
+            if rc is not None:
+                return rc
+            return self._define(binary_name)
 
-        data = self._load_bytes(binary_name)
-        cf = read_classfile(data)
+    def _define(self, binary_name: str) -> RuntimeClass:
+        stats = self.stats
+        t0 = time.perf_counter()
+        if self.store is not None:
+            # leitura e parse contam nas estatísticas do store, uma vez por processo
+            cf = self.store.classfile(binary_name)
+            nbytes = 0
+            t1 = t2 = time.perf_counter()
+        else:
+            data = self._load_bytes(binary_name)
+            nbytes = len(data)
+            t1 = time.perf_counter()
+            cf = read_classfile(data, lazy=self.lazy)
+            t2 = time.perf_counter()
+        with self._guard:
+            stats.read_s += t1 - t0
+            stats.parse_s += t2 - t1
+            stats.bytes_read += nbytes
+            stats.classes_loaded += 1
         cp = cf.constant_pool
         this_name = _cp_class_name(cp, cf.this_class)
         super_name = _cp_class_name(cp, cf.super_class) if cf.super_class != 0 else None
 
         rc = RuntimeClass(name=this_name, super_name=super_name, cf=cf)
+        self._defining[this_name] = rc
+        try:
+            self.hooks.emit("class_load", rc)
+            if super_name and super_name != "java/lang/Object":
+                self.load_class(super_name)
+            t_link = self._link(rc)
+        finally:
+            del self._defining[this_name]
         self.loaded[this_name] = rc
 
-        if super_name and super_name != "java/lang/Object":
-            self.load_class(super_name)
+        t_end = time.perf_counter()
+        with self._guard:
+            stats.link_s += t_end - t_link
+        if self.tracer is not None:
+            tr = self.tracer
+            tr.complete("load_class", "loader", t0, t_end, {"class": this_name})
+            tr.complete("read_bytes", "loader", t0, t1, {"class": this_name, "bytes": nbytes})
+            tr.complete("read_classfile", "loader", t1, t2, {"class": this_name})
+            tr.complete("link", "loader", t_link, t_end, {"class": this_name})
+        self.hooks.emit("class_link", rc)
+        return rc
+
+    def _link(self, rc: RuntimeClass) -> float:
+        """Linka `rc` e liga os ConstantValue String ao StringPool; devolve o instante de início."""
+        cf = rc.cf
+        cp = cf.constant_pool
 
+        t_link = time.perf_counter()
         rc.link()
 
         # Bind ConstantValue String -> StringPool (se houver)
@@ -57,5 +157,4 @@ class ClassLoader:
                             key = (cp.get_utf8(f.name_index), cp.get_utf8(f.descriptor_index))
                             from capivara.runtime.values import make_ref
                             rc.statics[key] = make_ref(sid)
-
-        return rc
+        return t_link
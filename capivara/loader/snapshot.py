@@ -0,0 +1,140 @@
+"""
+Snapshot/restore do estado do ClassLoader (classes carregadas, linkadas e
+inicializadas, estáticos, Heap e StringPool) para partidas a quente, no
+espírito do CRaC: uma execução grava o estado depois dos <clinit>, as
+seguintes o restauram com uma única leitura e pulam carga, link e
+inicialização estática.
+
+Formato: MAGIC + HMAC-SHA256 (32 bytes) + cabeçalho pickle (versões,
+classpath) + payload pickle. Os ids da SYMBOLS são por processo: no restore
+cada Utf8 é reinternado e os caches indexados por id (tabelas de membros,
+refs resolvidas) são descartados e remontados sob demanda.
+
+Segurança: o payload é pickle, e desserializar um arquivo forjado executa
+código arbitrário. Por isso o restore só aceita snapshots assinados com a
+chave local (`snapshot_key_path`: arquivo 0600 criado no primeiro
+checkpoint, ou o caminho em $CAPIVARA_SNAPSHOT_KEY) e confere o HMAC antes
+de qualquer `pickle.load`. Ainda assim, trate snapshots como executáveis:
+só restaure arquivos que você mesmo gravou, e não os compartilhe entre
+usuários. O daemon (`capivara serve`) recusa --restore/--checkpoint.
+"""
+from __future__ import annotations
+import gc
+import hashlib
+import hmac
+import io
+import os
+import pickle
+from typing import Dict, List
+
+from capivara import __version__
+from capivara.classfile.constant_pool import CpUtf8
+from capivara.classfile.symbols import SYMBOLS
+
+MAGIC = b"CAPVSNAP"
+FORMAT = 2
+_MAC_LEN = 32
+
+def snapshot_key_path() -> str:
+    path = os.environ.get("CAPIVARA_SNAPSHOT_KEY")
+    if path:
+        return path
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "capivara", "snapshot.key")
+
+def _key(create: bool) -> bytes:
+    """Chave HMAC local; criada (0600) só ao gravar. Sem chave não há snapshot confiável."""
+    path = snapshot_key_path()
+    try:
+        with open(path, "rb") as f:
+            key = f.read()
+    except FileNotFoundError:
+        if not create:
+            raise ValueError(f"sem chave de snapshot em {path}: o arquivo não foi gravado por este usuário")
+        os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+        key = os.urandom(32)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:  # outro processo criou ao mesmo tempo
+            return _key(False)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+    if len(key) < 16:
+        raise ValueError(f"chave de snapshot inválida em {path}")
+    return key
+
+def _classpath(loader) -> List[str]:
+    return [os.path.abspath(p) for p in loader.classpath.entries]
+
+def save_snapshot(loader, path: str) -> int:
+    """Grava o estado de `loader` em `path` (escrita atômica); devolve o tamanho em bytes."""
+    busy = [rc.name for rc in loader.loaded.values() if rc.status == "initializing"]
+    if busy:
+        raise ValueError(f"snapshot durante a inicialização de: {', '.join(busy)}")
+    buf = io.BytesIO()
+    # um dump por objeto: cabeçalho e payload são lidos por loads independentes
+    for obj in ({"format": FORMAT, "capivara_version": __version__, "classpath": _classpath(loader)},
+                {"loaded": loader.loaded, "heap": loader.heap, "string_pool": loader.string_pool}):
+        pickle.dump(obj, buf, protocol=pickle.HIGHEST_PROTOCOL)
+    body = buf.getvalue()
+    data = MAGIC + hmac.new(_key(create=True), body, hashlib.sha256).digest() + body
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+def _rebind_symbols(loaded: Dict) -> None:
+    intern, name = SYMBOLS.intern, SYMBOLS.name
+    for rc in loaded.values():
+        cp = rc.cf.constant_pool
+        for e in cp.entries:
+            if isinstance(e, CpUtf8):
+                e.sid = intern(e.value)
+                e.value = name(e.sid)
+        cp._refs.clear()
+        rc.method_table = rc.field_table = None
+
+def _load(buf: io.BytesIO, path: str):
+    try:
+        return pickle.load(buf)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        raise ValueError(f"{path}: snapshot corrompido: {e}") from e
+
+def restore_snapshot(loader, path: str) -> int:
+    """
+    Restaura em `loader` (que ainda não pode ter classes) o estado gravado por
+    `save_snapshot`; devolve o nº de classes restauradas. ValueError se o
+    arquivo não for um snapshot compatível com esta versão e classpath.
+    """
+    if loader.loaded:
+        raise ValueError("restore requer um ClassLoader sem classes carregadas")
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path}: não é um snapshot da CapivaraVM")
+    start = len(MAGIC) + _MAC_LEN
+    mac, body = data[len(MAGIC):start], data[start:]
+    # antes de qualquer pickle.load: só desserializa o que foi assinado com a chave local
+    if not hmac.compare_digest(mac, hmac.new(_key(create=False), body, hashlib.sha256).digest()):
+        raise ValueError(f"{path}: snapshot corrompido ou não gravado com a chave local (HMAC inválido)")
+    buf = io.BytesIO(body)
+    header = _load(buf, path)
+    if header.get("format") != FORMAT or header.get("capivara_version") != __version__:
+        raise ValueError(f"{path}: snapshot de outra versão "
+                         f"(formato {header.get('format')}, CapivaraVM {header.get('capivara_version')})")
+    if header.get("classpath") != _classpath(loader):
+        raise ValueError(f"{path}: snapshot de outro classpath: {header.get('classpath')}")
+    # milhares de objetos pequenos: o GC no meio do unpickle só custa tempo
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        state = _load(buf, path)
+    finally:
+        if enabled:
+            gc.enable()
+    _rebind_symbols(state["loaded"])
+    loader.loaded.update(state["loaded"])  # in-place: variantes do laço guardam o dict
+    loader.heap = state["heap"]
+    loader.string_pool = state["string_pool"]
+    return len(state["loaded"])
@@ -0,0 +1,82 @@
+"""
+Store de classes compartilhado entre VMs isolados no mesmo processo
+(hospedagem multi-tenant).
+
+Um `ClassStore` lê e parseia cada .class uma única vez (`read_classfile`) e
+já decodifica os Utf8 pendentes (mesmo com lazy=True, que aqui só adia o
+trabalho para o store) e o Code de todos os métodos; daí em diante o
+ClassFile (constant pool, membros, Code) só é lido, e vários ClassLoader o
+usam ao mesmo tempo, inclusive de threads diferentes. A exceção é o cache
+de refs resolvidas do constant pool, preenchido sob demanda com valores
+idênticos para qualquer loader. Tudo o que muda na execução continua por
+loader: RuntimeClass (estáticos, status do <clinit>, sítios resolvidos,
+locks), Heap e StringPool.
+
+    store = ClassStore(["build/classes"])
+    a, b = VM.from_store(store), VM.from_store(store)  # estado Java independente
+"""
+from __future__ import annotations
+import threading
+import time
+from typing import Dict, Iterable
+
+from capivara.classfile.attributes import find_code_attribute
+from capivara.classfile.reader import ClassFile, read_classfile
+from capivara.loader.classpath import ClassPath
+from capivara.loader.loader import LoaderStats, read_class_bytes
+
+class ClassStore:
+    """ClassFile imutáveis por nome binário; `stats` conta leituras e parses (link fica por loader)."""
+    def __init__(self, classpath_entries: list[str], lazy: bool = False):
+        self.classpath = ClassPath(classpath_entries)
+        self.lazy = lazy
+        self.classes: Dict[str, ClassFile] = {}
+        self.stats = LoaderStats()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    def __contains__(self, binary_name: str) -> bool:
+        return binary_name in self.classes
+
+    def classfile(self, binary_name: str) -> ClassFile:
+        """ClassFile de `binary_name`, lido e parseado na primeira vez (uma só vez entre threads)."""
+        cf = self.classes.get(binary_name)
+        if cf is not None:
+            return cf
+        lock = self._locks.get(binary_name)
+        if lock is None:
+            with self._guard:
+                lock = self._locks.setdefault(binary_name, threading.Lock())
+        with lock:
+            cf = self.classes.get(binary_name)
+            if cf is None:
+                cf = self.classes[binary_name] = self._parse(binary_name)
+        return cf
+
+    def _parse(self, binary_name: str) -> ClassFile:
+        t0 = time.perf_counter()
+        data = read_class_bytes(self.classpath, binary_name)
+        t1 = time.perf_counter()
+        cf = read_classfile(data, lazy=self.lazy)
+        cp = cf.constant_pool
+        cp.materialize_all()  # o Utf8 lazy decodifica na 1ª leitura: não é seguro entre threads
+        for m in cf.methods:
+            # Code decodificado aqui, e não na 1ª invocação: objeto único para todos os loaders
+            find_code_attribute(m.attributes, cp)
+        t2 = time.perf_counter()
+        with self._guard:
+            st = self.stats
+            st.read_s += t1 - t0
+            st.parse_s += t2 - t1
+            st.bytes_read += len(data)
+            st.classes_loaded += 1
+        return cf
+
+    def preload(self, names: Iterable[str]) -> int:
+        """Parseia `names` (pontos ou barras) antes do primeiro VM; devolve quantas classes há no store."""
+        for name in names:
+            self.classfile(name.replace(".", "/"))
+        return len(self.classes)
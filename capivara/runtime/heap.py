@@ -1,10 +1,12 @@
 from __future__ import annotations
+import threading
 from dataclasses import dataclass, field
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 from capivara.runtime.values import VMValue
 from capivara.runtime.klass import RuntimeClass, _default_static_value
 from capivara.util import flags as FL
+from capivara.util.locking import LockedState
 
 @dataclass
 class VMObject:
@@ -12,10 +14,45 @@ class VMObject:
     fields: Dict[Tuple[str, str, str], VMValue] = field(default_factory=dict)
     # chave = (declaringClass, fieldName, fieldDesc)
 
-class Heap:
+    # cabeçalho de lock (ver `capivara.interp.threads`): thin lock = dono + contagem
+    # de reentradas; `monitor` só existe enquanto houver disputa
+    lock_owner: Optional[int] = field(default=None, repr=False)
+    lock_count: int = field(default=0, repr=False)
+    monitor: Optional[object] = field(default=None, repr=False)
+
+@dataclass
+class VMArray(VMObject):
+    """Array primitivo: `class_name` é o descritor ("[I", "[B"...); elementos em `data`."""
+    data: List = field(default_factory=list, repr=False)
+
+    @property
+    def elem(self) -> str:
+        return self.class_name[1:]
+
+# valor default dos elementos por descritor (boolean/byte/char/short guardados como int)
+_ARRAY_DEFAULTS = {"I": 0, "J": 0, "B": 0, "C": 0, "S": 0, "Z": 0, "F": 0.0, "D": 0.0}
+
+class Heap(LockedState):
+    """Objetos por id. A alocação de ids é protegida por lock: várias threads Python podem alocar."""
     def __init__(self):
         self._next_id: int = 1
         self._objs: Dict[int, VMObject] = {}
+        self._lock = threading.Lock()
+
+    def _new_id(self) -> int:
+        with self._lock:
+            oid = self._next_id
+            self._next_id = oid + 1
+        return oid
+
+    def __len__(self) -> int:
+        """Objetos vivos no heap."""
+        return len(self._objs)
+
+    @property
+    def allocated(self) -> int:
+        """Total de objetos já alocados."""
+        return self._next_id - 1
 
     def get(self, obj_id: int) -> VMObject:
         return self._objs[obj_id]
@@ -25,8 +62,6 @@ class Heap:
         Aloca objeto da classe 'rc', inicializando todos os campos de instância
         (da classe e superclasses) com valor default. Não tenta carregar java/lang/Object.
         """
-        oid = self._next_id
-        self._next_id += 1
         obj = VMObject(class_name=rc.name)
 
         cur: Optional[RuntimeClass] = rc
@@ -45,5 +80,14 @@ class Heap:
             else:
                 cur = loader.load_class(cur.super_name)
 
+        oid = self._new_id()
         self._objs[oid] = obj
+        return oid
+
+    def new_array(self, elem: str, length: int) -> int:
+        """Aloca um array primitivo de `length` elementos (descritor `elem`, ex. "I")."""
+        if length < 0:
+            raise RuntimeError(f"NegativeArraySizeException: {length}")
+        oid = self._new_id()
+        self._objs[oid] = VMArray(class_name="[" + elem, data=[_ARRAY_DEFAULTS[elem]] * length)
         return oid
\ No newline at end of file
@@ -5,9 +5,10 @@ from typing import Dict, Optional, Tuple, List
 from capivara.classfile.reader import ClassFile
 from capivara.classfile.constant_pool import ConstantPool, CpClass
 from capivara.classfile.attributes import (
-    AttributeInfo, CodeAttribute, ConstantValueAttribute
+    AttributeInfo, CodeAttribute, ConstantValueAttribute, find_code_attribute
 )
 from capivara.classfile.members import FieldInfo, MethodInfo
+from capivara.classfile.symbols import SYMBOLS
 from capivara.util.descriptors import parse_field_descriptor, BaseType, ObjectType, ArrayType
 from capivara.util import flags as FL
 from capivara.runtime.values import (
@@ -48,24 +49,71 @@ class RuntimeClass:
     clinit: Optional[MethodInfo] = None
     clinit_code: Optional[CodeAttribute] = None
 
-    # status simples (para futuro): "loaded" -> "linked" -> "initialized"
+    # "loaded" -> "linked" -> "initializing" -> "initialized" (ou "erroneous" se o <clinit> falhar)
     status: str = "loaded"
 
-    def find_method(self, name: str, desc: str) -> Optional[MethodInfo]:
+    # sítios GETSTATIC/PUTSTATIC/INVOKESTATIC/NEW já resolvidos, chave = índice no CP.
+    # Só entram aqui depois que a classe alvo está inicializada: o caminho com
+    # cache não tem verificação de inicialização (ver Interpreter.initialize_class).
+    sites: Dict[int, object] = field(default_factory=dict, repr=False)
+
+    # cabeçalho de lock dos métodos static synchronized (mesmo formato do VMObject)
+    lock_owner: Optional[int] = field(default=None, repr=False)
+    lock_count: int = field(default=0, repr=False)
+    monitor: Optional[object] = field(default=None, repr=False)
+
+    # membros declarados, chave = (name_id, desc_id) na SYMBOLS; montadas no 1º lookup
+    method_table: Optional[Dict[Tuple[int, int], MethodInfo]] = field(default=None, init=False, repr=False)
+    field_table: Optional[Dict[Tuple[int, int], FieldInfo]] = field(default=None, init=False, repr=False)
+
+    def _build_member_tables(self) -> None:
         cp = self.cf.constant_pool
-        for m in self.cf.methods:
-            n = cp.get_utf8(m.name_index)
-            d = cp.get_utf8(m.descriptor_index)
-            if n == name and d == desc:
-                return m
-        return None
+        self.method_table = {
+            (cp.get_symbol(m.name_index), cp.get_symbol(m.descriptor_index)): m
+            for m in self.cf.methods
+        }
+        self.field_table = {
+            (cp.get_symbol(f.name_index), cp.get_symbol(f.descriptor_index)): f
+            for f in self.cf.fields
+        }
+
+    def find_method_sym(self, name_id: int, desc_id: int) -> Optional[MethodInfo]:
+        if self.method_table is None:
+            self._build_member_tables()
+        return self.method_table.get((name_id, desc_id))
+
+    def find_field_sym(self, name_id: int, desc_id: int) -> Optional[FieldInfo]:
+        if self.field_table is None:
+            self._build_member_tables()
+        return self.field_table.get((name_id, desc_id))
+
+    def find_method(self, name: str, desc: str) -> Optional[MethodInfo]:
+        # intern (não lookup): em modo lazy o Utf8 pode ainda não ter sido visto
+        return self.find_method_sym(SYMBOLS.intern(name), SYMBOLS.intern(desc))
 
     def _extract_code(self, m: MethodInfo) -> Optional[CodeAttribute]:
-        for a in m.attributes:
-            if isinstance(a, CodeAttribute):
-                return a
+        return find_code_attribute(m.attributes, self.cf.constant_pool)
+
+    def method_for_code(self, code: CodeAttribute) -> Optional[MethodInfo]:
+        """
+        Método dono de um Code (por identidade); usado por relatórios/profilers.
+        Um Code já existe na lista de atributos do seu método (o placeholder
+        lazy é trocado ao resolvê-lo): os demais métodos não são parseados.
+        """
+        for m in self.cf.methods:
+            for a in m.attributes:
+                if a is code:
+                    return m
         return None
 
+    def method_label(self, code: CodeAttribute) -> str:
+        """`pkg/Cls.nome(desc)` do método dono de `code`."""
+        m = self.method_for_code(code)
+        if m is None:
+            return f"{self.name}.<desconhecido>"
+        cp = self.cf.constant_pool
+        return f"{self.name}.{cp.get_utf8(m.name_index)}{cp.get_utf8(m.descriptor_index)}"
+
     def link(self) -> None:
         """Linking mínimo: prepara estáticos com default e ConstantValue; detecta <clinit>."""
         if self.status != "loaded":
@@ -1,22 +1,30 @@
 from __future__ import annotations
+import threading
 from typing import Dict
 
-class StringPool:
+from capivara.util.locking import LockedState, insert_once
+
+class StringPool(LockedState):
     """
     Pool de strings (intern). Para agora, mapeia texto -> id inteiro estável.
     Em passos futuros, retornaremos objetos reais da heap Java.
+    Seguro entre threads: a busca não trava; a inserção é feita sob lock.
     """
     def __init__(self):
         self._s2id: Dict[str, int] = {}
         self._id2s: Dict[int, str] = {}
         self._next_id: int = 1
+        self._lock = threading.Lock()
 
     def intern(self, s: str) -> int:
-        if s in self._s2id:
-            return self._s2id[s]
+        i = self._s2id.get(s)
+        if i is not None:
+            return i
+        return insert_once(self._lock, self._s2id, s, self._add)
+
+    def _add(self, s: str) -> int:
         i = self._next_id
         self._next_id += 1
-        self._s2id[s] = i
         self._id2s[i] = s
         return i
 
@@ -0,0 +1,28 @@
+import json
+import unittest
+
+from capivara.bench.synth import PROFILES, synthetic_class
+from capivara.bench.parse import run_suite, STAGES
+from capivara.classfile.reader import read_classfile
+from capivara.classfile.attributes import find_code_attribute
+
+class TestSyntheticClassfiles(unittest.TestCase):
+    def test_profiles_parse(self):
+        for name, p in PROFILES.items():
+            cf = read_classfile(synthetic_class(f"t/{name}", p))
+            self.assertEqual(len(cf.methods), p.methods, name)
+            self.assertEqual(len(cf.fields), p.fields, name)
+            code = find_code_attribute(cf.methods[-1].attributes, cf.constant_pool)
+            self.assertEqual(code.code[-1], 0xb1)  # return
+
+    def test_report_is_machine_readable(self):
+        report = run_suite(["typical"], classes=2, repeat=1)
+        report = json.loads(json.dumps(report))
+        self.assertEqual(report["suite"], "parse")
+        self.assertEqual([r["stage"] for r in report["results"]], list(STAGES))
+        for r in report["results"]:
+            self.assertEqual(r["classes"], 2)
+            self.assertGreater(r["classes_per_sec"], 0)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,115 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from capivara.bench import regress
+from capivara.bench.stats import compare_samples, mean_ci, t_quantile, t_sf2, welch_t_test
+
+class TestStats(unittest.TestCase):
+    def test_t_distribution_table_values(self):
+        # valores críticos bilaterais de 5% da tabela t
+        for df, t in ((1, 12.706), (5, 2.571), (10, 2.228), (30, 2.042)):
+            self.assertAlmostEqual(t_sf2(t, df), 0.05, places=3)
+            self.assertAlmostEqual(t_quantile(0.95, df), t, places=2)
+
+    def test_mean_ci_contains_mean(self):
+        m, lo, hi = mean_ci([1.0, 1.1, 0.9, 1.05, 0.95])
+        self.assertAlmostEqual(m, 1.0)
+        self.assertLess(lo, m)
+        self.assertGreater(hi, m)
+
+    def test_welch_requires_two_samples(self):
+        with self.assertRaises(ValueError):
+            welch_t_test([1.0], [1.0, 2.0])
+
+    def test_verdicts(self):
+        base = [1.00, 1.01, 0.99, 1.02, 0.98]
+        slow = [x * 1.10 for x in base]
+        fast = [x * 0.90 for x in base]
+        noisy = [0.7, 1.4, 0.9, 1.3, 0.8]
+        self.assertEqual(compare_samples(base, slow)["verdict"], "regression")
+        self.assertEqual(compare_samples(base, fast)["verdict"], "improvement")
+        self.assertEqual(compare_samples(base, noisy)["verdict"], "unchanged")
+        # significativo, mas abaixo do limiar
+        self.assertEqual(compare_samples(base, slow, threshold=0.2)["verdict"], "unchanged")
+        lo, hi = compare_samples(base, slow)["rel_change_ci"]
+        self.assertLess(lo, 0.10)
+        self.assertGreater(hi, 0.10)
+
+class TestHistory(unittest.TestCase):
+    def _report(self, samples):
+        return {"suite": "interp", "scale": 1.0, "results": [
+            {"kernel": "int_loop", "samples_s": samples, "bytecodes": 10},
+            {"kernel": "array_scan", "skipped": "não suportado"},
+        ]}
+
+    def test_round_trip_and_pooling(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "hist", "bench.jsonl")
+            regress.append_history(path, regress.make_entry(self._report([1.0, 1.1]), "aaa"))
+            regress.append_history(path, regress.make_entry(self._report([0.9, 1.0]), "aaa"))
+            regress.append_history(path, regress.make_entry(self._report([2.0, 2.1]), "bbb"))
+            hist = regress.load_history(path)
+            self.assertEqual([e["rev"] for e in hist], ["aaa", "aaa", "bbb"])
+            self.assertNotIn("array_scan", hist[0]["kernels"])
+            self.assertEqual(regress.baseline_samples(hist, "aaa")["int_loop"], [1.0, 1.1, 0.9, 1.0])
+            self.assertEqual(regress.baseline_samples(hist, "last")["int_loop"], [2.0, 2.1])
+            self.assertIsNone(regress.baseline_samples(hist, "ccc"))
+            self.assertIsNone(regress.baseline_samples(hist, "aaa", scale=0.5))
+
+    def test_compare_report(self):
+        base = {"int_loop": [1.0, 1.01, 0.99, 1.0]}
+        rows = regress.compare_report(self._report([1.5, 1.51, 1.49, 1.5]), base, 0.05, 0.05)
+        self.assertEqual([r["kernel"] for r in rows], ["int_loop"])
+        self.assertEqual(rows[0]["verdict"], "regression")
+
+    def test_invalid_line(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.jsonl")
+            with open(path, "w") as f:
+                f.write("{não é json\n")
+            with self.assertRaises(ValueError):
+                regress.load_history(path)
+
+class TestCLIRegression(unittest.TestCase):
+    def _bench(self, *extra):
+        cmd = [sys.executable, "-m", "capivara.cli", "bench", "--scale", "0.01", "--repeat", "3",
+               "--kernel", "int_loop", *extra]
+        return subprocess.run(cmd, capture_output=True, text=True)
+
+    def test_history_and_regression_exit_code(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.jsonl")
+            r = self._bench("--history", path, "--rev", "r1")
+            self.assertEqual(r.returncode, 0, msg=r.stderr)
+            self.assertEqual(regress.load_history(path)[0]["rev"], "r1")
+
+            # baseline artificialmente rápida: a execução atual regride
+            regress.append_history(path, {"rev": "fast", "timestamp": 0.0, "suite": "interp", "scale": 0.01,
+                                          "kernels": {"int_loop": {"samples_s": [1e-6, 1.1e-6, 0.9e-6],
+                                                                   "bytecodes": 1}}})
+            r = self._bench("--history", path, "--rev", "r2", "--baseline", "fast", "--json")
+            self.assertEqual(r.returncode, 1, msg=r.stderr)
+            report = json.loads(r.stdout)
+            self.assertEqual(report["comparison"]["kernels"][0]["verdict"], "regression")
+            self.assertIn("REGRESSÃO", r.stderr)
+
+            # baseline artificialmente lenta: melhoria, sai com 0
+            regress.append_history(path, {"rev": "slow", "timestamp": 0.0, "suite": "interp", "scale": 0.01,
+                                          "kernels": {"int_loop": {"samples_s": [100.0, 101.0, 99.0],
+                                                                   "bytecodes": 1}}})
+            r = self._bench("--history", path, "--baseline", "slow")
+            self.assertEqual(r.returncode, 0, msg=r.stderr)
+            self.assertIn("improvement", r.stdout)
+
+    def test_baseline_errors(self):
+        self.assertEqual(self._bench("--baseline", "last").returncode, 64)
+        with tempfile.TemporaryDirectory() as tmp:
+            r = self._bench("--history", os.path.join(tmp, "nada.jsonl"), "--baseline", "last")
+            self.assertEqual(r.returncode, 66)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+
+from capivara.classfile.reader import read_classfile
+from capivara.classfile.attributes import (
+    CodeAttribute, LazyAttribute, LineNumberTableAttribute, ConstantValueAttribute,
+    find_code_attribute,
+)
+from capivara.classfile.writer import ClassBuilder
+from capivara.loader.loader import ClassLoader
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+def _cpdemo() -> bytes:
+    # como o fixtures/CPDemo.java: ConstantValue, constantes no pool e LineNumberTable em todo Code
+    cb = ClassBuilder("CPDemo")
+    cb.add_field("XI", "I", access=FL.ACC_STATIC | FL.ACC_FINAL, constant_value=42)
+    cb.cp.long_(1234567890123)
+    cb.cp.float_(3.14)
+    cb.cp.double(2.71828)
+    cb.cp.string("capivara")
+    i = cb.code(max_stack=1, max_locals=1)
+    i.line(1).aload(0).invokespecial("java/lang/Object", "<init>", "()V").op(OP.RETURN)
+    cb.add_method("<init>", "()V", i, access=FL.ACC_PUBLIC)
+    m = cb.code(max_stack=2, max_locals=2)
+    m.line(9).iconst(1).iconst(2).op(OP.IADD).istore(1).line(15).op(OP.RETURN)
+    cb.add_method("main", "([Ljava/lang/String;)V", m)
+    return cb.to_bytes()
+
+def _chain_calls() -> bytes:
+    # como o fixtures/ChainCalls.java: run() = mul3(add2(4)) = 18
+    cb = ClassBuilder("ChainCalls")
+    for name, body in (("add2", lambda c: c.iconst(2).op(OP.IADD)), ("mul3", lambda c: c.iconst(3).op(OP.IMUL))):
+        c = cb.code(max_stack=2, max_locals=1)
+        body(c.iload(0))
+        cb.add_method(name, "(I)I", c.op(OP.IRETURN), access=FL.ACC_STATIC)
+    r = cb.code(max_stack=1, max_locals=0)
+    r.iconst(4).invokestatic("ChainCalls", "add2", "(I)I").invokestatic("ChainCalls", "mul3", "(I)I").op(OP.IRETURN)
+    cb.add_method("run", "()I", r)
+    return cb.to_bytes()
+
+class TestLazyClassfile(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.build_dir = cls.tmp.name
+        cls.class_bytes = _cpdemo()
+        with open(os.path.join(cls.build_dir, "ChainCalls.class"), "wb") as f:
+            f.write(_chain_calls())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_methods_stay_unparsed(self):
+        cf = read_classfile(self.class_bytes, lazy=True)
+        for m in cf.methods:
+            self.assertTrue(all(isinstance(a, LazyAttribute) for a in m.attributes))
+        # ConstantValue continua eager (o linking precisa dele)
+        cvs = [a for f in cf.fields for a in f.attributes if isinstance(a, ConstantValueAttribute)]
+        self.assertTrue(cvs)
+
+    def test_utf8_decoded_on_demand(self):
+        cf = read_classfile(self.class_bytes, lazy=True)
+        cp = cf.constant_pool
+        eager = read_classfile(self.class_bytes).constant_pool
+        self.assertTrue(cp.find_utf8("capivara"))
+        self.assertEqual(cp.as_debug_list(), eager.as_debug_list())
+
+    def test_code_resolved_on_first_use(self):
+        cf = read_classfile(self.class_bytes, lazy=True)
+        cp = cf.constant_pool
+        eager = read_classfile(self.class_bytes)
+        for m, em in zip(cf.methods, eager.methods):
+            code = find_code_attribute(m.attributes, cp)
+            ecode = find_code_attribute(em.attributes, eager.constant_pool)
+            self.assertIsInstance(code, CodeAttribute)
+            self.assertEqual(code.code, ecode.code)
+            self.assertEqual(code.max_stack, ecode.max_stack)
+            # parse único: o placeholder é substituído na lista
+            self.assertIs(find_code_attribute(m.attributes, cp), code)
+            self.assertTrue(any(isinstance(a, LineNumberTableAttribute) for a in code.attributes))
+
+    def test_interpreter_with_lazy_loader(self):
+        from capivara.interp.loop import Interpreter
+        ld = ClassLoader([self.build_dir], lazy=True)
+        res = Interpreter(ld).execute_static_entry("ChainCalls", "run", "()I")
+        self.assertEqual(res.int_value, 18)
+
+    def test_method_label_does_not_parse_other_methods(self):
+        from capivara.interp.loop import Interpreter
+        ld = ClassLoader([self.build_dir], lazy=True)
+        rc = ld.load_class("ChainCalls")
+        code, _ = Interpreter(ld).prepare_method(rc, "run", "()I")
+        self.assertEqual(rc.method_label(code), "ChainCalls.run()I")
+        lazy = [m for m in rc.cf.methods if isinstance(m.attributes[0], LazyAttribute)]
+        self.assertEqual(len(lazy), 2)  # add2/mul3 continuam sem parse
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
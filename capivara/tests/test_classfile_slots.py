@@ -0,0 +1,31 @@
+import unittest
+
+from capivara.util import opcodes as OP
+from capivara.classfile.constant_pool import ConstantPool, CpUtf8, CpMethodref, CpPlaceholder
+from capivara.classfile.members import FieldInfo, MethodInfo
+from capivara.classfile.attributes import CodeAttribute, LineNumberEntry, UnknownAttribute
+
+class TestSlottedModel(unittest.TestCase):
+    def test_no_instance_dict(self):
+        objs = [
+            CpUtf8(OP.CP_Utf8, "x"),
+            CpMethodref(OP.CP_Methodref, 1, 2),
+            CpPlaceholder(OP.CP_Long),
+            FieldInfo(0, 1, 2, []),
+            MethodInfo(0, 1, 2, []),
+            CodeAttribute(1, 0, 1, 1, b"\xb1", [], []),
+            LineNumberEntry(0, 1),
+            UnknownAttribute(1, 0, b""),
+            ConstantPool(2),
+        ]
+        for o in objs:
+            self.assertFalse(hasattr(o, "__dict__"), type(o).__name__)
+
+    def test_dataclass_api_kept(self):
+        a = CpMethodref(OP.CP_Methodref, 3, 4)
+        self.assertEqual(a, CpMethodref(OP.CP_Methodref, 3, 4))
+        self.assertEqual(a.class_index, 3)
+        self.assertIn("name_and_type_index=4", repr(a))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,96 @@
+import tempfile
+import unittest
+
+from capivara.classfile.writer import ClassBuilder
+from capivara.classfile.reader import read_classfile
+from capivara.classfile.constant_pool import CpInteger, CpLong, CpString
+from capivara.classfile.attributes import (
+    CodeAttribute, ConstantValueAttribute, LineNumberTableAttribute,
+    SourceFileAttribute, UnknownAttribute,
+)
+from capivara.runtime.klass import _cp_class_name
+from capivara.loader.loader import ClassLoader
+from capivara.interp.loop import Interpreter
+from capivara.bench import workloads
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+class TestClassBuilderRoundTrip(unittest.TestCase):
+    def setUp(self):
+        cb = ClassBuilder("pkg/Demo", interfaces=["pkg/Iface"])
+        cb.add_field("XI", "I", FL.ACC_STATIC | FL.ACC_FINAL, constant_value=-42)
+        cb.add_field("XJ", "J", FL.ACC_STATIC | FL.ACC_FINAL, constant_value=1 << 40)
+        cb.add_field("XS", "Ljava/lang/String;", FL.ACC_STATIC | FL.ACC_FINAL, constant_value="capivara")
+        c = cb.code(max_stack=2, max_locals=1)
+        c.line(10).iconst(0).istore(0)
+        c.label("top").iinc(0, 1).iload(0).iconst(5).branch(OP.IF_ICMPLT, "top")
+        c.line(11).iload(0).op(OP.IRETURN)
+        cb.add_method("run", "()I", c, attributes=[("Custom", b"\x01\x02")])
+        cb.add_default_constructor()
+        cb.set_source_file("Demo.java")
+        self.data = cb.to_bytes()
+
+    def test_read_back(self):
+        cf = read_classfile(self.data)
+        cp = cf.constant_pool
+        self.assertEqual(cf.major_version, 52)
+        self.assertEqual(_cp_class_name(cp, cf.this_class), "pkg/Demo")
+        self.assertEqual(_cp_class_name(cp, cf.super_class), "java/lang/Object")
+        self.assertEqual([_cp_class_name(cp, i) for i in cf.interfaces], ["pkg/Iface"])
+
+        cvs = {cp.get_utf8(f.name_index): cp.get(f.attributes[0].constantvalue_index) for f in cf.fields}
+        self.assertIsInstance(cvs["XI"], CpInteger)
+        self.assertEqual(cvs["XI"].value, -42)
+        self.assertIsInstance(cvs["XJ"], CpLong)
+        self.assertEqual(cvs["XJ"].value, 1 << 40)
+        self.assertIsInstance(cvs["XS"], CpString)
+        self.assertTrue(all(isinstance(f.attributes[0], ConstantValueAttribute) for f in cf.fields))
+
+        run = cf.methods[0]
+        self.assertEqual(cp.get_utf8(run.name_index), "run")
+        code, custom = run.attributes
+        self.assertIsInstance(code, CodeAttribute)
+        self.assertIsInstance(custom, UnknownAttribute)
+        self.assertEqual(custom.info, b"\x01\x02")
+        self.assertIs(type(custom.info), bytes)  # cópia: não prende o buffer do .class
+        lnt = code.attributes[0]
+        self.assertIsInstance(lnt, LineNumberTableAttribute)
+        self.assertEqual([(e.start_pc, e.line_number) for e in lnt.line_numbers], [(0, 10), (10, 11)])
+        sf = cf.attributes[0]
+        self.assertIsInstance(sf, SourceFileAttribute)
+        self.assertEqual(cp.get_utf8(sf.sourcefile_index), "Demo.java")
+
+    def test_executes(self):
+        w = workloads.Workload("pkg/Demo", {"pkg/Demo": self.data})
+        with tempfile.TemporaryDirectory() as tmp:
+            workloads.write_classes(w, tmp)
+            res = Interpreter(ClassLoader([tmp])).execute_static_entry("pkg/Demo", "run", "()I")
+        self.assertEqual(res.int_value, 5)
+
+class TestWorkloads(unittest.TestCase):
+    def test_workloads_run(self):
+        cases = [
+            workloads.hot_loop(40_000),
+            workloads.call_chain(depth=4, n=50),
+            workloads.alloc_storm(50),
+            workloads.virtual_dispatch(50),
+            workloads.field_access(50),
+            workloads.synchronized_access(50),
+        ]
+        for w in cases:
+            with tempfile.TemporaryDirectory() as tmp:
+                workloads.write_classes(w, tmp)
+                res = Interpreter(ClassLoader([tmp])).execute_static_entry(w.name, w.entry, w.desc)
+                self.assertEqual(res.int_value, w.expected, w.name)
+
+    def test_rejects_operands_that_need_wide(self):
+        c = ClassBuilder("t/Wide").code(max_stack=1, max_locals=300)
+        c.iload(255).iinc(255, -128).iinc(0, 127)
+        for bad in (lambda: c.iload(256), lambda: c.astore(-1), lambda: c.iinc(256, 1),
+                    lambda: c.iinc(1, 128), lambda: c.iinc(1, -129)):
+            with self.assertRaisesRegex(ValueError, "wide"):
+                bad()
+        self.assertEqual(bytes(c.code), bytes([OP.ILOAD, 255, OP.IINC, 255, 0x80, OP.IINC, 0, 127]))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,35 @@
+import json
+import subprocess
+import sys
+import unittest
+
+class TestCLIBench(unittest.TestCase):
+    def _bench(self, *extra):
+        cmd = [sys.executable, "-m", "capivara.cli", "bench", "--scale", "0.01", "--repeat", "2", *extra]
+        return subprocess.run(cmd, capture_output=True, text=True)
+
+    def test_json_report(self):
+        r = self._bench("--kernel", "int_loop", "--kernel", "recursive_calls", "--kernel", "array_scan", "--json")
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        report = json.loads(r.stdout)
+        self.assertEqual(report["suite"], "interp")
+        by_name = {k["kernel"]: k for k in report["results"]}
+        for name in ("int_loop", "recursive_calls", "array_scan"):
+            k = by_name[name]
+            self.assertGreater(k["bytecodes"], 0)
+            self.assertGreater(k["bytecodes_per_sec"], 0)
+            self.assertGreater(k["calls_per_sec"], 0)
+        self.assertGreater(report["score_bytecodes_per_sec"], 0)
+
+    def test_text_report(self):
+        r = self._bench("--kernel", "allocation")
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        self.assertIn("allocation", r.stdout)
+        self.assertIn("score", r.stdout)
+
+    def test_invalid_scale(self):
+        r = self._bench("--scale", "0")
+        self.assertEqual(r.returncode, 64)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
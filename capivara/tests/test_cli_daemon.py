@@ -0,0 +1,94 @@
+import os
+import signal
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from capivara.classfile.writer import ClassBuilder
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+def _classes(path: str) -> None:
+    # Main.<clinit>: N++; run() = N * 10 + 2  (N == 1 em toda execução isolada)
+    cb = ClassBuilder("dm/Main")
+    cb.add_field("N", "I")
+    c = cb.code(max_stack=2, max_locals=0)
+    c.getstatic("dm/Main", "N", "I").iconst(1).op(OP.IADD).putstatic("dm/Main", "N", "I").op(OP.RETURN)
+    cb.add_method("<clinit>", "()V", c, access=FL.ACC_STATIC)
+    r = cb.code(max_stack=2, max_locals=0)
+    r.getstatic("dm/Main", "N", "I").iconst(10).op(OP.IMUL).iconst(2).op(OP.IADD).op(OP.IRETURN)
+    cb.add_method("run", "()I", r)
+    out = os.path.join(path, "dm", "Main.class")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "wb") as f:
+        f.write(cb.to_bytes())
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cp = os.path.join(self.tmp.name, "classes")
+        _classes(self.cp)
+        self.sock = os.path.join(self.tmp.name, "vm.sock")
+
+    def _start(self) -> subprocess.Popen:
+        srv = subprocess.Popen([sys.executable, "-m", "capivara.cli", "serve", "--socket", self.sock,
+                                "--cp", self.cp, "--preload", "dm.Main", "--workers", "2"],
+                               stderr=subprocess.PIPE, text=True)
+        self.addCleanup(srv.wait, 10)
+        self.addCleanup(srv.send_signal, signal.SIGTERM)
+        deadline = time.monotonic() + 10
+        while not os.path.exists(self.sock):
+            self.assertIsNone(srv.poll(), "daemon morreu ao iniciar")
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.02)
+        return srv
+
+    def _client(self, *extra: str) -> subprocess.Popen:
+        return subprocess.Popen([sys.executable, "-m", "capivara.cli", "run", "dm.Main", "--cp", self.cp,
+                                 "--entry", "run", "--desc", "()I", "--daemon", self.sock, *extra],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+    def test_runs_are_isolated_and_concurrent(self):
+        srv = self._start()
+        self.assertEqual(stat.S_IMODE(os.stat(self.sock).st_mode), 0o600)
+        # a classe pré-carregada não é relida do disco
+        os.remove(os.path.join(self.cp, "dm", "Main.class"))
+        clients = [self._client() for _ in range(4)]
+        for c in clients:
+            out, err = c.communicate(timeout=30)
+            self.assertEqual(c.returncode, 0, msg=err)
+            self.assertEqual(out, "RET: 12\n")
+        out, err = self._client("--startup-report").communicate(timeout=30)
+        self.assertIn("startup (ms)", err)
+        r = self._client("--entry", "nada").communicate(timeout=30)
+        self.assertIn("nada", r[1])
+        for flag in ("--restore", "--checkpoint"):
+            c = self._client(flag, os.path.join(self.tmp.name, "x.snap"))
+            _, err = c.communicate(timeout=30)
+            self.assertEqual(c.returncode, 64)
+            self.assertIn("não são aceitos via daemon", err)
+        srv.send_signal(signal.SIGTERM)
+        self.assertEqual(srv.wait(10), 0)
+        self.assertFalse(os.path.exists(self.sock))
+
+    def test_refuses_path_that_is_not_our_socket(self):
+        with open(self.sock, "w") as f:
+            f.write("não é socket")
+        r = subprocess.run([sys.executable, "-m", "capivara.cli", "serve", "--socket", self.sock, "--cp", self.cp],
+                           capture_output=True, text=True, timeout=30)
+        self.assertEqual(r.returncode, 69)
+        self.assertIn("não é um socket deste usuário", r.stderr)
+        self.assertTrue(os.path.isfile(self.sock))
+
+    def test_client_without_daemon(self):
+        c = self._client()
+        _, err = c.communicate(timeout=30)
+        self.assertEqual(c.returncode, 69)
+        self.assertIn("daemon indisponível", err)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
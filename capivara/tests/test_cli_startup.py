@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from capivara.bench import workloads as W
+from capivara.classfile.writer import ClassBuilder
+from capivara.cli.__main__ import _format_result
+from capivara.interp.loop import ExecResult
+from capivara.runtime.heap import Heap
+from capivara.util import opcodes as OP
+
+class TestCLIStartup(unittest.TestCase):
+    def _cli(self, *argv):
+        return subprocess.run([sys.executable, "-m", "capivara.cli", *argv], capture_output=True, text=True)
+
+    def test_version_skips_interpreter_import(self):
+        code = ("import sys\n"
+                "from capivara.cli.__main__ import main\n"
+                "try:\n"
+                "    main(['--version'])\n"
+                "except SystemExit:\n"
+                "    pass\n"
+                "heavy = [m for m in ('capivara.interp.loop', 'capivara.loader.loader', 'capivara.bench.interp', 'logging')"
+                " if m in sys.modules]\n"
+                "print(heavy, file=sys.stderr)\n")
+        r = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        self.assertEqual(r.stderr.strip(), "[]")
+
+    def test_startup_report(self):
+        w = W.hot_loop(10)
+        with tempfile.TemporaryDirectory() as tmp:
+            W.write_classes(w, tmp)
+            r = self._cli("run", w.name, "--cp", tmp, "--entry", w.entry, "--desc", w.desc,
+                          "--log", "WARNING", "--startup-report")
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        self.assertIn(f"RET: {w.expected}", r.stdout)
+        for phase in ("interpreter_import", "validate_classpath", "main_class_load",
+                      "leitura+parse", "link", "1º bytecode", "execute"):
+            self.assertIn(phase, r.stderr)
+
+    def test_run_prints_non_int_returns(self):
+        cb = ClassBuilder("rt/Ret")
+        sq = cb.code(max_stack=4, max_locals=1)  # squares(): int[3] com i*i
+        sq.iconst(3).op(OP.NEWARRAY, 10).astore(0)
+        for i in (1, 2):
+            sq.aload(0).iconst(i).iconst(i * i).op(OP.IASTORE)
+        sq.aload(0).op(OP.ARETURN)
+        cb.add_method("squares", "()[I", sq)
+        nl = cb.code(max_stack=1, max_locals=0)
+        nl.op(OP.ACONST_NULL).op(OP.ARETURN)
+        cb.add_method("nothing", "()[B", nl)
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "rt"))
+            with open(os.path.join(tmp, "rt", "Ret.class"), "wb") as f:
+                f.write(cb.to_bytes())
+            for entry, desc, out in (("squares", "()[I", "RET: [0, 1, 4]"), ("nothing", "()[B", "RET: null")):
+                r = self._cli("run", "rt.Ret", "--cp", tmp, "--entry", entry, "--desc", desc, "--log", "WARNING")
+                self.assertEqual(r.returncode, 0, msg=r.stderr)
+                self.assertEqual(r.stdout.strip(), out)
+        heap = Heap()
+        self.assertEqual(_format_result(ExecResult("long", value=-(1 << 40)), heap), str(-(1 << 40)))
+        self.assertEqual(_format_result(ExecResult("double", value=0.5), heap), "0.5")
+        self.assertEqual(_format_result(ExecResult("ref", value=heap.new_array("C", 2)), heap), repr("\0\0"))
+
+    def test_bench_startup_json(self):
+        r = self._cli("bench", "--startup", "--kernel", "cli_version", "--repeat", "2", "--warmup", "0", "--json")
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        report = json.loads(r.stdout)
+        self.assertEqual(report["suite"], "startup")
+        (k,) = report["results"]
+        self.assertEqual(k["kernel"], "cli_version")
+        self.assertEqual(len(k["samples_s"]), 2)
+
+    def test_bench_unknown_kernel(self):
+        r = self._cli("bench", "--startup", "--kernel", "int_loop")
+        self.assertEqual(r.returncode, 64)
+        self.assertIn("cli_version", r.stderr)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
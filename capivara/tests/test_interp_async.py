@@ -0,0 +1,165 @@
+import asyncio
+import io
+import os
+import socket
+import tempfile
+import time
+import unittest
+
+from capivara.classfile.writer import ClassBuilder
+from capivara.interp.aio import StreamChannel
+from capivara.interp.loop import Interpreter
+from capivara.interp.vm import VM
+from capivara.loader.loader import ClassLoader
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+W = "as/Work"
+S = "as/SelfJoin"
+
+def _classes(path: str) -> None:
+    cb = ClassBuilder(W)
+    # spin(n): soma 0..n-1
+    c = cb.code(max_stack=2, max_locals=3)
+    c.iconst(0).istore(1).iconst(0).istore(2)
+    c.label("loop").iload(2).iload(0).branch(OP.IF_ICMPGE, "end")
+    c.iload(1).iload(2).op(OP.IADD).istore(1).iinc(2, 1).branch(OP.GOTO, "loop")
+    c.label("end").iload(1).op(OP.IRETURN)
+    cb.add_method("spin", "(I)I", c)
+    # nap(ms): Thread.sleep(ms); return 7
+    n = cb.code(max_stack=2, max_locals=2)
+    n.op(OP.LLOAD_0).invokestatic("java/lang/Thread", "sleep", "(J)V").iconst(7).op(OP.IRETURN)
+    cb.add_method("nap", "(J)I", n)
+    # echo(in, out): copia `in` para `out` em blocos de 4 bytes; devolve o total
+    e = cb.code(max_stack=3, max_locals=5)
+    e.iconst(4).op(OP.NEWARRAY, 8).astore(2).iconst(0).istore(4)
+    e.label("loop").iload(0).aload(2).invokestatic("capivara/io/Channel", "read", "(I[B)I").istore(3)
+    e.iload(3).branch(OP.IFLT, "end")
+    e.iload(1).aload(2).iload(3).invokestatic("capivara/io/Channel", "write", "(I[BI)I").op(OP.POP)
+    e.iload(4).iload(3).op(OP.IADD).istore(4).branch(OP.GOTO, "loop")
+    e.label("end").iload(4).op(OP.IRETURN)
+    cb.add_method("echo", "(II)I", e)
+    # stuck(): inicia um SelfJoin e o espera; ele espera a si mesmo (deadlock)
+    s = cb.code(max_stack=2, max_locals=1)
+    s.new(S).op(OP.DUP).invokespecial(S, "<init>", "()V").astore(0)
+    s.aload(0).invokevirtual(S, "start", "()V").aload(0).invokevirtual(S, "join", "()V").iconst(1).op(OP.IRETURN)
+    cb.add_method("stuck", "()I", s)
+    sj = ClassBuilder(S, super_name="java/lang/Thread")
+    sj.add_default_constructor()
+    r = sj.code(max_stack=1, max_locals=1)
+    r.aload(0).invokevirtual(S, "join", "()V").op(OP.RETURN)
+    sj.add_method("run", "()V", r, access=FL.ACC_PUBLIC)
+    for builder in (cb, sj):
+        out = os.path.join(path, builder.name + ".class")
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        with open(out, "wb") as f:
+            f.write(builder.to_bytes())
+
+class _Ticker:
+    """Tarefa que só avança se o event loop não estiver travado."""
+    def __init__(self):
+        self.ticks = 0
+        self.task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        while True:
+            self.ticks += 1
+            await asyncio.sleep(0)
+
+    def stop(self) -> int:
+        self.task.cancel()
+        return self.ticks
+
+class TestAsync(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        _classes(self.tmp.name)
+
+    def test_long_call_yields_to_event_loop(self):
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        sched = interp.enable_async(quantum=500)
+
+        async def main():
+            ticker = _Ticker()
+            res = await interp.execute_static_entry_async(W, "spin", "(I)I", [20_000])
+            return res, ticker.stop()
+
+        res, ticks = asyncio.run(main())
+        self.assertEqual(res.int_value, sum(range(20_000)))
+        self.assertGreater(sched.switches, 100)
+        self.assertGreater(ticks, 100)
+        with self.assertRaisesRegex(RuntimeError, "execute_frame_async"):
+            interp.execute_static_entry(W, "spin", "(I)I", [1])
+
+    def test_concurrent_calls_interleave(self):
+        vm = VM([self.tmp.name])
+        vm.interp.enable_async(quantum=200)
+
+        async def main():
+            return await asyncio.gather(vm.call_async(W, "spin", "(I)I", 5_000),
+                                        vm.call_async(W, "spin", "(I)I", 10))
+
+        self.assertEqual(asyncio.run(main()), [sum(range(5_000)), 45])
+        self.assertEqual(vm.interp.green.threads, 2)
+        self.assertEqual(vm.calls, 2)
+
+    def test_blocking_natives_park_only_the_java_thread(self):
+        vm = VM([self.tmp.name])
+        interp = vm.interp
+        src, dst = io.BytesIO(b"capivara!"), io.BytesIO()
+        files = (interp.open_channel(src), interp.open_channel(dst))
+
+        async def main():
+            ticker = _Ticker()
+            t0 = time.monotonic()
+            naps = await asyncio.gather(*(vm.call_async(W, "nap", "(J)I", 50) for _ in range(3)))
+            slept = time.monotonic() - t0
+            copied = await vm.call_async(W, "echo", "(II)I", *files)  # read/write num executor
+            s1, s2 = socket.socketpair()
+            r1, w1 = await asyncio.open_connection(sock=s1)
+            r2, w2 = await asyncio.open_connection(sock=s2)
+            sock = interp.open_channel(StreamChannel(r1, w1))
+            w2.write(b"pela rede")
+            w2.write_eof()
+            echoed = await vm.call_async(W, "echo", "(II)I", sock, sock)
+            back = await r2.readexactly(9)
+            for w in (w1, w2):
+                w.close()
+            return naps, slept, copied, echoed, back, ticker.stop()
+
+        naps, slept, copied, echoed, back, ticks = asyncio.run(main())
+        self.assertEqual(naps, [7, 7, 7])
+        self.assertLess(slept, 0.14)  # as três dormem juntas
+        self.assertEqual((copied, dst.getvalue()), (9, b"capivara!"))
+        self.assertEqual((echoed, back), (9, b"pela rede"))
+        self.assertGreater(ticks, 10)
+        self.assertGreaterEqual(interp.green.io_waits, 3 + 2 * 4)
+
+    def test_deadlock_fails_waiters_and_resets(self):
+        vm = VM([self.tmp.name])
+
+        async def main():
+            with self.assertRaisesRegex(RuntimeError, "deadlock"):
+                await vm.call_async(W, "stuck", "()I")
+            return await vm.call_async(W, "spin", "(I)I", 10)
+
+        self.assertEqual(asyncio.run(main()), 45)
+        self.assertFalse(vm.interp.green.blocked)
+
+    def test_channels_without_async(self):
+        vm = VM([self.tmp.name])
+        interp = vm.interp
+        dst = io.BytesIO()
+        src, out = interp.open_channel(io.BytesIO(b"abcdefghij")), interp.open_channel(dst)
+        self.assertEqual(vm.call(W, "echo", "(II)I", src, out), 10)
+        self.assertEqual(dst.getvalue(), b"abcdefghij")
+        self.assertEqual(vm.call(W, "nap", "(J)I", 0), 7)
+        interp.close_channel(src)
+        with self.assertRaisesRegex(RuntimeError, "IOException: canal 1"):
+            vm.call(W, "echo", "(II)I", src, out)
+        with self.assertRaisesRegex(RuntimeError, "enable_async"):
+            asyncio.run(interp.execute_static_entry_async(W, "spin", "(I)I", [1]))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
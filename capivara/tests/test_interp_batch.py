@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from capivara.classfile.writer import ClassBuilder
+from capivara.interp.batch import parse_arg_lines, run_batch
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+def _classes(path: str) -> None:
+    # Sweep.<clinit>: OFF = 1000; f(a, b) = a * b + OFF; g(a) = 10 / a; nop(a): void
+    cb = ClassBuilder("batch/Sweep")
+    cb.add_field("OFF", "I")
+    c = cb.code(max_stack=1, max_locals=0)
+    c.iconst(1000).putstatic("batch/Sweep", "OFF", "I").op(OP.RETURN)
+    cb.add_method("<clinit>", "()V", c, access=FL.ACC_STATIC)
+    f = cb.code(max_stack=2, max_locals=2)
+    f.iload(0).iload(1).op(OP.IMUL).getstatic("batch/Sweep", "OFF", "I").op(OP.IADD).op(OP.IRETURN)
+    cb.add_method("f", "(II)I", f)
+    g = cb.code(max_stack=2, max_locals=1)
+    g.iconst(10).iload(0).op(OP.IDIV).op(OP.IRETURN)
+    cb.add_method("g", "(I)I", g)
+    v = cb.code(max_stack=1, max_locals=1)
+    v.op(OP.RETURN)
+    cb.add_method("nop", "(I)V", v)
+    out = os.path.join(path, "batch", "Sweep.class")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "wb") as fh:
+        fh.write(cb.to_bytes())
+
+class TestRunBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        _classes(self.tmp.name)
+        self.cp = [self.tmp.name]
+
+    def test_results_in_input_order(self):
+        sets = [(a, b) for a in range(20) for b in range(15)]
+        for workers in (1, 3):
+            with self.subTest(workers=workers):
+                res = list(run_batch(self.cp, "batch/Sweep", "f", "(II)I", iter(sets), workers=workers, chunksize=7))
+                self.assertEqual([r.args for r in res], sets)
+                self.assertEqual([r.value for r in res], [a * b + 1000 for a, b in sets])
+
+    def test_call_errors_do_not_stop_the_batch(self):
+        res = list(run_batch(self.cp, "batch/Sweep", "g", "(I)I", [(5,), (0,), (1, 2), (2,)], workers=2))
+        self.assertEqual([r.value for r in res], [2, None, None, 5])
+        self.assertIn("divisão por zero", res[1].error)
+        self.assertIn("esperava 1", res[2].error)
+        with self.assertRaisesRegex(ValueError, "só parâmetros int"):
+            run_batch(self.cp, "batch/Sweep", "h", "(J)I", [])
+
+    def test_parse_arg_lines(self):
+        lines = ["1 2", "", "# comentário", "3,4", "[5, -6]", "0x10"]
+        self.assertEqual(list(parse_arg_lines(lines)), [(1, 2), (3, 4), (5, -6), (16,)])
+        with self.assertRaisesRegex(ValueError, "linha 2"):
+            list(parse_arg_lines(["1", "x"]))
+
+    def test_cli(self):
+        base = [sys.executable, "-m", "capivara.cli", "run-batch", "batch.Sweep", "--cp", self.tmp.name,
+                "--workers", "2"]
+        r = subprocess.run(base + ["--entry", "f", "--desc", "(II)I"], input="1 2\n3 4\n",
+                           capture_output=True, text=True)
+        self.assertEqual((r.returncode, r.stdout), (0, "1002\n1012\n"), msg=r.stderr)
+        r = subprocess.run(base + ["--entry", "g", "--desc", "(I)I", "--json"], input="5\n0\n",
+                           capture_output=True, text=True)
+        rows = [json.loads(line) for line in r.stdout.splitlines()]
+        self.assertEqual(r.returncode, 70)
+        self.assertEqual(rows[0], {"args": [5], "ret": 2})
+        self.assertIn("error", rows[1])
+        r = subprocess.run(base + ["--entry", "nop", "--desc", "(I)V"], input="1\noops\n",
+                           capture_output=True, text=True)
+        self.assertEqual((r.returncode, r.stdout), (65, "void\n"))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
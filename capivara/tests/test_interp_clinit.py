@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+from capivara.classfile.writer import ClassBuilder
+from capivara.interp.loop import Interpreter
+from capivara.loader.loader import ClassLoader
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+def _write(path: str, cb: ClassBuilder) -> None:
+    out = os.path.join(path, cb.name + ".class")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "wb") as f:
+        f.write(cb.to_bytes())
+
+def _clinit(cb: ClassBuilder, body) -> None:
+    c = cb.code(max_stack=3, max_locals=0)
+    body(c)
+    c.op(OP.RETURN)
+    cb.add_method("<clinit>", "()V", c, access=FL.ACC_STATIC)
+
+class TestClassInit(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.interp = Interpreter(ClassLoader([self.tmp.name]))
+
+    def _classes(self) -> None:
+        # Base.<clinit>: B = 10; INITS++
+        base = ClassBuilder("ci/Base")
+        base.add_field("B", "I")
+        base.add_field("INITS", "I")
+        _clinit(base, lambda c: c.iconst(10).putstatic("ci/Base", "B", "I")
+                .getstatic("ci/Base", "INITS", "I").iconst(1).op(OP.IADD).putstatic("ci/Base", "INITS", "I"))
+        _write(self.tmp.name, base)
+        # Sub.<clinit>: S = Base.B + peek()  (peek lê S durante a própria inicialização: 0)
+        sub = ClassBuilder("ci/Sub", super_name="ci/Base")
+        sub.add_field("S", "I")
+        _clinit(sub, lambda c: c.getstatic("ci/Base", "B", "I").invokestatic("ci/Sub", "peek", "()I")
+                .op(OP.IADD).putstatic("ci/Sub", "S", "I"))
+        p = sub.code(max_stack=1, max_locals=0)
+        p.getstatic("ci/Sub", "S", "I").op(OP.IRETURN)
+        sub.add_method("peek", "()I", p)
+        _write(self.tmp.name, sub)
+        # Main.run() = Sub.S + Base.INITS
+        main = ClassBuilder("ci/Main")
+        r = main.code(max_stack=2, max_locals=0)
+        r.getstatic("ci/Sub", "S", "I").getstatic("ci/Base", "INITS", "I").op(OP.IADD).op(OP.IRETURN)
+        main.add_method("run", "()I", r)
+        _write(self.tmp.name, main)
+
+    def test_superclass_first_and_once(self):
+        self._classes()
+        ld = self.interp.loader
+        self.assertEqual(self.interp.execute_static_entry("ci/Main", "run", "()I").int_value, 11)
+        self.assertEqual(self.interp.execute_static_entry("ci/Main", "run", "()I").int_value, 11)
+        for name in ("ci/Main", "ci/Base", "ci/Sub"):
+            self.assertEqual(ld.loaded[name].status, "initialized")
+
+    def test_sites_cached_only_after_init(self):
+        self._classes()
+        ld = self.interp.loader
+        self.interp.execute_static_entry("ci/Main", "run", "()I")
+        sub = ld.loaded["ci/Sub"]
+        # no <clinit> de Sub só o sítio de Base.B (já inicializada) foi para o cache;
+        # invokestatic peek e o getstatic S dentro de peek ficaram de fora
+        (cell, is_int), = sub.sites.values()
+        self.assertIs(cell, ld.loaded["ci/Base"].statics[("B", "I")])
+        self.assertEqual(len(ld.loaded["ci/Main"].sites), 2)
+        # fora da inicialização o sítio passa a ir direto para a célula do estático
+        self.interp.execute_static_entry("ci/Sub", "peek", "()I")
+        cells = [site[0] for site in sub.sites.values()]
+        self.assertTrue(any(c is sub.statics[("S", "I")] for c in cells))
+
+    def test_failed_init_is_erroneous(self):
+        bad = ClassBuilder("ci/Bad")
+        bad.add_field("X", "I")
+        _clinit(bad, lambda c: c.iconst(1).iconst(0).op(OP.IDIV).putstatic("ci/Bad", "X", "I"))
+        r = bad.code(max_stack=1, max_locals=0)
+        r.getstatic("ci/Bad", "X", "I").op(OP.IRETURN)
+        bad.add_method("run", "()I", r)
+        _write(self.tmp.name, bad)
+        with self.assertRaisesRegex(RuntimeError, "ExceptionInInitializerError") as cm:
+            self.interp.execute_static_entry("ci/Bad", "run", "()I")
+        self.assertIsInstance(cm.exception.__cause__, ZeroDivisionError)
+        self.assertEqual(self.interp.loader.loaded["ci/Bad"].status, "erroneous")
+        with self.assertRaisesRegex(RuntimeError, "NoClassDefFoundError"):
+            self.interp.execute_static_entry("ci/Bad", "run", "()I")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
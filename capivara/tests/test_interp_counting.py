@@ -0,0 +1,118 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from capivara.bench import workloads as W
+from capivara.interp.counting import CostModel
+from capivara.interp.loop import Interpreter
+from capivara.interp.variants import hook_points, specialize
+from capivara.loader.loader import ClassLoader
+from capivara.util import opcodes as OP
+
+class TestCountingMode(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _interp(self, w: W.Workload) -> Interpreter:
+        path = os.path.join(self.tmp.name, w.name.replace("/", "_"))
+        W.write_classes(w, path)
+        return Interpreter(ClassLoader([path]))
+
+    def test_counts_match_workload_analysis(self):
+        for w in (W.hot_loop(500), W.call_chain(4, 50), W.recursive_fib(8),
+                  W.alloc_storm(60), W.virtual_dispatch(70), W.field_access(80),
+                  W.synchronized_access(90), W.array_scan(100)):
+            with self.subTest(workload=w.name):
+                interp = self._interp(w)
+                counters = interp.enable_counting()
+                res = interp.execute_static_entry(w.name, w.entry, w.desc)
+                self.assertEqual(res.int_value, w.expected)
+                self.assertEqual(counters.bytecodes, w.bytecodes)
+                self.assertEqual(counters.invocations, w.calls)
+
+    def test_per_method_counts_and_loads(self):
+        w = W.alloc_storm(25)
+        interp = self._interp(w)
+        counters = interp.enable_counting()
+        interp.execute_static_entry(w.name, w.entry, w.desc)
+        rep = counters.report()
+        by_name = {m["method"]: m for m in rep["methods"]}
+        run = by_name[f"{w.name}.run()I"]
+        init = by_name[f"{w.name}$Cell.<init>()V"]
+        self.assertEqual(run["allocations"], 25)
+        self.assertEqual(init["invocations"], 25)
+        self.assertEqual(run["class_loads"], 1)           # Cell, no primeiro NEW
+        self.assertEqual(by_name["<vm>"]["class_loads"], 1)  # classe de entrada
+        self.assertEqual(rep["class_loads"], 2)
+        self.assertEqual(rep["opcodes"]["NEW"], 25)
+
+    def test_deterministic_and_disable_restores_plain_loop(self):
+        w = W.call_chain(3, 20)
+        interp = self._interp(w)
+        costs = CostModel.from_mnemonics({"default": 2, "invokestatic": 10})
+        c1 = interp.enable_counting()
+        interp.execute_static_entry(w.name, w.entry, w.desc)
+        self.assertIs(interp.disable_counting(), c1)
+        self.assertNotIn("_run_frame", interp.__dict__)
+        self.assertNotIn("load_class", interp.loader.__dict__)
+        self.assertIsNone(interp.counters)
+        c2 = interp.enable_counting()
+        interp.execute_static_entry(w.name, w.entry, w.desc)
+        self.assertEqual(c1.report(costs)["cost"], c2.report(costs)["cost"])
+        ops = c1.opcode_counts()
+        self.assertEqual(c1.report(costs)["cost"], 2 * sum(ops) + 8 * ops[OP.INVOKESTATIC])
+        with self.assertRaises(RuntimeError):
+            interp.enable_counting()
+
+    def test_cost_model_validation(self):
+        with self.assertRaises(ValueError):
+            CostModel.from_mnemonics({"nao_existe": 1})
+        with self.assertRaises(ValueError):
+            CostModel.from_mnemonics({"iadd": -1})
+
+class TestVariants(unittest.TestCase):
+    def test_hook_points(self):
+        self.assertEqual(hook_points(Interpreter._run_frame)[:2], ("enter", "op"))
+
+    def test_unknown_hook_rejected(self):
+        with self.assertRaises(ValueError):
+            specialize(Interpreter._run_frame, {"nao_existe": "pass"})
+        with self.assertRaises(ValueError):
+            specialize(Interpreter._run_frame, {"op": "a = 1\nb = 2"})
+
+    def test_cached(self):
+        hooks = {"op": "pass"}
+        self.assertIs(specialize(Interpreter._run_frame, hooks), specialize(Interpreter._run_frame, hooks))
+
+class TestCLICount(unittest.TestCase):
+    def test_run_count_json(self):
+        w = W.call_chain(3, 10)
+        with tempfile.TemporaryDirectory() as tmp:
+            W.write_classes(w, tmp)
+            out = os.path.join(tmp, "count.json")
+            cmd = [sys.executable, "-m", "capivara.cli", "run", w.name, "--cp", tmp,
+                   "--entry", "run", "--desc", "()I", "--count", "--count-json", out]
+            r = subprocess.run(cmd, capture_output=True, text=True)
+            self.assertEqual(r.returncode, 0, msg=r.stderr)
+            self.assertIn(f"RET: {w.expected}", r.stdout)
+            self.assertIn("invocações", r.stderr)
+            with open(out) as f:
+                rep = json.load(f)
+            self.assertEqual(rep["bytecodes"], w.bytecodes)
+            self.assertEqual(rep["invocations"], w.calls)
+
+    def test_bench_count(self):
+        cmd = [sys.executable, "-m", "capivara.cli", "bench", "--count", "--scale", "0.01",
+               "--kernel", "static_calls", "--json"]
+        r = subprocess.run(cmd, capture_output=True, text=True)
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        rep = json.loads(r.stdout)
+        self.assertEqual(rep["suite"], "interp-count")
+        self.assertEqual(rep["results"][0]["cost"], rep["results"][0]["bytecodes"])
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
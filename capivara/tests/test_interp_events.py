@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+
+from capivara.bench import workloads as W
+from capivara.classfile.writer import ClassBuilder
+from capivara.interp.events import EventHooks
+from capivara.interp.loop import Interpreter
+from capivara.loader.loader import ClassLoader
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+def _div_class(path: str) -> None:
+    # run() -> div(7, 0): idiv por zero no pc 2 de div
+    cb = ClassBuilder("ev/Div")
+    d = cb.code(max_stack=2, max_locals=2)
+    d.iload(0).iload(1).op(OP.IDIV).op(OP.IRETURN)
+    cb.add_method("div", "(II)I", d, access=FL.ACC_STATIC)
+    r = cb.code(max_stack=2, max_locals=0)
+    r.iconst(7).iconst(0).invokestatic("ev/Div", "div", "(II)I").op(OP.IRETURN)
+    cb.add_method("run", "()I", r)
+    os.makedirs(os.path.join(path, "ev"), exist_ok=True)
+    with open(os.path.join(path, "ev", "Div.class"), "wb") as f:
+        f.write(cb.to_bytes())
+
+def _arr_class(path: str) -> None:
+    # run(): int[3] e byte[2]; devolve a soma dos comprimentos
+    cb = ClassBuilder("ev/Arr")
+    r = cb.code(max_stack=2, max_locals=0)
+    r.iconst(3).op(OP.NEWARRAY, 10).op(OP.ARRAYLENGTH)
+    r.iconst(2).op(OP.NEWARRAY, 8).op(OP.ARRAYLENGTH).op(OP.IADD).op(OP.IRETURN)
+    cb.add_method("run", "()I", r)
+    os.makedirs(os.path.join(path, "ev"), exist_ok=True)
+    with open(os.path.join(path, "ev", "Arr.class"), "wb") as f:
+        f.write(cb.to_bytes())
+
+class TestEventHooks(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _interp(self) -> Interpreter:
+        return Interpreter(ClassLoader([self.tmp.name]))
+
+    def test_registry(self):
+        hooks = EventHooks()
+        self.assertFalse(hooks)
+        cb = hooks.add("allocation", lambda *a: None)
+        self.assertTrue(hooks.has("allocation"))
+        with self.assertRaises(ValueError):
+            hooks.add("nao_existe", cb)
+        hooks.remove("allocation", cb)
+        self.assertFalse(hooks)
+        with self.assertRaises(ValueError):
+            hooks.remove("allocation", cb)
+
+    def test_method_alloc_and_class_events(self):
+        w = W.alloc_storm(4)
+        W.write_classes(w, self.tmp.name)
+        interp = self._interp()
+        log = []
+        interp.add_hook("class_load", lambda rc: log.append(("load", rc.name)))
+        interp.add_hook("class_link", lambda rc: log.append(("link", rc.name)))
+        interp.add_hook("allocation", lambda rc, oid: log.append(("alloc", rc.name)))
+        interp.add_hook("method_entry", lambda rc, code, frame: log.append(("entry", rc.method_label(code))))
+        interp.add_hook("method_exit", lambda rc, code, res, exc: log.append(("exit", rc.method_label(code), exc)))
+        self.assertEqual(interp.execute_static_entry(w.name, w.entry, w.desc).int_value, 4)
+
+        cell = w.name + "$Cell"
+        self.assertEqual(log[:3], [("load", w.name), ("link", w.name), ("entry", f"{w.name}.run()I")])
+        self.assertEqual(log[3:6], [("load", cell), ("link", cell), ("alloc", cell)])
+        self.assertEqual(sum(1 for e in log if e[0] == "alloc"), 4)
+        self.assertEqual(sum(1 for e in log if e == ("entry", f"{cell}.<init>()V")), 4)
+        self.assertEqual(log[-1], ("exit", f"{w.name}.run()I", None))
+
+    def test_array_allocations(self):
+        _arr_class(self.tmp.name)
+        interp = self._interp()
+        heap = interp.loader.heap
+        allocs = []
+        cb = interp.add_hook("allocation", lambda rc, oid: allocs.append((rc, heap.get(oid).elem)))
+        self.assertEqual(interp.execute_static_entry("ev/Arr", "run", "()I").int_value, 5)
+        self.assertEqual(allocs, [(None, "I"), (None, "B")])
+        interp.remove_hook("allocation", cb)
+        counters = interp.enable_counting()
+        interp.execute_static_entry("ev/Arr", "run", "()I")
+        self.assertEqual(counters.allocations, 2)
+        self.assertEqual(counters.report()["opcodes"]["NEWARRAY"], 2)
+
+    def test_exception_throw_once_at_origin(self):
+        _div_class(self.tmp.name)
+        interp = self._interp()
+        thrown, exits = [], []
+        interp.add_hook("exception_throw", lambda rc, code, pc, exc: thrown.append((rc.method_label(code), pc, type(exc))))
+        interp.add_hook("method_exit", lambda rc, code, res, exc: exits.append((rc.method_label(code), type(exc))))
+        with self.assertRaises(ZeroDivisionError):
+            interp.execute_static_entry("ev/Div", "run", "()I")
+        self.assertEqual(thrown, [("ev/Div.div(II)I", 2, ZeroDivisionError)])
+        self.assertEqual(exits, [("ev/Div.div(II)I", ZeroDivisionError), ("ev/Div.run()I", ZeroDivisionError)])
+
+    def test_no_hooks_means_plain_loop(self):
+        w = W.hot_loop(10)
+        W.write_classes(w, self.tmp.name)
+        interp = self._interp()
+        cb = interp.add_hook("method_entry", lambda *a: None)
+        self.assertIn("_run_frame", interp.__dict__)
+        with self.assertRaises(RuntimeError):
+            interp.enable_counting()
+        interp.remove_hook("method_entry", cb)
+        self.assertNotIn("_run_frame", interp.__dict__)
+        interp.enable_counting()
+        self.assertEqual(interp.execute_static_entry(w.name, w.entry, w.desc).int_value, w.expected)
+        with self.assertRaisesRegex(RuntimeError, "contagem/profiling"):
+            interp.add_hook("method_entry", cb)
+        self.assertFalse(interp.hooks)
+        interp.disable_counting()
+        interp.enable_green_threads()
+        with self.assertRaisesRegex(RuntimeError, "threads verdes"):
+            interp.add_hook("allocation", cb)
+        interp.add_hook("class_load", cb)  # eventos do loader valem em qualquer modo
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
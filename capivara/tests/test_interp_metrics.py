@@ -0,0 +1,102 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from capivara.bench import workloads as W
+from capivara.interp.loop import Interpreter
+from capivara.interp.metrics import GCMonitor, MetricsExporter, snapshot, to_prometheus
+from capivara.loader.loader import ClassLoader
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.w = W.alloc_storm(40)
+        W.write_classes(self.w, self.tmp.name)
+
+    def test_snapshot_counts(self):
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        interp.enable_metrics()
+        interp.execute_static_entry(self.w.name, self.w.entry, self.w.desc)
+        snap = snapshot(interp)
+        self.assertEqual(snap["bytecodes_executed"], self.w.bytecodes)
+        self.assertEqual(snap["method_invocations"], self.w.calls)
+        self.assertEqual(snap["classes_loaded"], 2)
+        self.assertEqual(snap["heap_allocations"], 40)
+        self.assertEqual(snap["heap_live_objects"], 40)
+        self.assertGreater(snap["class_parse_seconds"], 0)
+        self.assertGreater(snap["class_bytes_read"], 0)
+        interp.disable_metrics()
+        self.assertNotIn("_run_frame", interp.__dict__)
+        self.assertNotIn("bytecodes_executed", snapshot(interp))
+
+    def test_metrics_with_green_threads(self):
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        interp.enable_green_threads(7)
+        interp.enable_metrics()
+        interp.execute_static_entry(self.w.name, self.w.entry, self.w.desc)
+        snap = snapshot(interp)
+        self.assertEqual(snap["bytecodes_executed"], self.w.bytecodes)
+        self.assertEqual(snap["method_invocations"], self.w.calls)
+        self.assertGreater(interp.green.switches, 0)
+        with self.assertRaises(RuntimeError):
+            interp.enable_metrics()
+        interp.disable_metrics()
+        self.assertEqual(interp.execute_static_entry(self.w.name, self.w.entry, self.w.desc).int_value, 40)
+        self.assertNotIn("bytecodes_executed", snapshot(interp))
+
+    def test_counting_mode_feeds_metrics(self):
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        interp.enable_counting()
+        interp.execute_static_entry(self.w.name, self.w.entry, self.w.desc)
+        self.assertEqual(snapshot(interp)["bytecodes_executed"], self.w.bytecodes)
+
+    def test_prometheus_format(self):
+        text = to_prometheus({"classes_loaded": 3, "heap_live_objects": 7})
+        self.assertIn("# TYPE capivara_classes_loaded_total counter\ncapivara_classes_loaded_total 3\n", text)
+        self.assertIn("# TYPE capivara_heap_live_objects gauge\ncapivara_heap_live_objects 7\n", text)
+        self.assertNotIn("bytecodes", text)
+
+    def test_gc_monitor(self):
+        import gc
+        mon = GCMonitor().start()
+        try:
+            gc.collect()
+        finally:
+            mon.stop()
+        self.assertGreaterEqual(mon.collections, 1)
+        self.assertGreater(mon.pause_s, 0)
+
+    def test_exporter_writes_at_stop(self):
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        path = os.path.join(self.tmp.name, "m.json")
+        ex = MetricsExporter(interp, path, "json", interval=0.01).start()
+        interp.execute_static_entry(self.w.name, self.w.entry, self.w.desc)
+        ex.stop()
+        with open(path) as f:
+            snap = json.load(f)
+        self.assertEqual(snap["heap_allocations"], 40)
+        self.assertIn("gc_collections", snap)
+        with self.assertRaises(ValueError):
+            MetricsExporter(interp, path, "xml")
+
+    def test_cli_metrics_out(self):
+        path = os.path.join(self.tmp.name, "m.prom")
+        cmd = [sys.executable, "-m", "capivara.cli", "run", self.w.name, "--cp", self.tmp.name,
+               "--entry", "run", "--desc", "()I", "--metrics-out", path, "--metrics-format", "prometheus"]
+        r = subprocess.run(cmd, capture_output=True, text=True)
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        with open(path) as f:
+            text = f.read()
+        self.assertIn(f"capivara_bytecodes_executed_total {self.w.bytecodes}\n", text)
+        self.assertIn("capivara_classes_loaded_total 2\n", text)
+        r = subprocess.run(cmd + ["--green-threads"], capture_output=True, text=True)
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        with open(path) as f:
+            self.assertIn(f"capivara_bytecodes_executed_total {self.w.bytecodes}\n", f.read())
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
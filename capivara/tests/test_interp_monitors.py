@@ -0,0 +1,146 @@
+import os
+import tempfile
+import unittest
+
+from capivara.classfile.writer import ClassBuilder
+from capivara.interp.loop import Interpreter
+from capivara.loader.loader import ClassLoader
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+W = "mon/Worker"
+
+def _write(path: str, cb: ClassBuilder) -> None:
+    out = os.path.join(path, cb.name + ".class")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "wb") as f:
+        f.write(cb.to_bytes())
+
+def _bump(cb: ClassBuilder, name: str, access: int) -> None:
+    # t = C; Thread.yield(); C = t + 1  (sem lock, o yield no meio perde incrementos)
+    c = cb.code(max_stack=2, max_locals=1)
+    c.getstatic(W, "C", "I").istore(0).invokestatic("java/lang/Thread", "yield", "()V")
+    c.iload(0).iconst(1).op(OP.IADD).putstatic(W, "C", "I").op(OP.RETURN)
+    cb.add_method(name, "()V", c, access=access)
+
+def _classes(path: str) -> None:
+    """
+    Worker(n).run(): n vezes um incremento de C conforme MODE
+    (0 = bloco synchronized(LOCK), 1 = static synchronized, 2 = sem lock); DONE++ no fim.
+    Worker.depth(k) é synchronized e recursivo (reentrada no mesmo objeto).
+    """
+    cb = ClassBuilder(W, super_name="java/lang/Thread")
+    for f in ("C", "MODE", "DONE"):
+        cb.add_field(f, "I")
+    cb.add_field("LOCK", "Ljava/lang/Object;")
+    cb.add_field("n", "I", access=0)
+    c = cb.code(max_stack=2, max_locals=2)
+    c.aload(0).invokespecial("java/lang/Thread", "<init>", "()V")
+    c.aload(0).iload(1).putfield(W, "n", "I").op(OP.RETURN)
+    cb.add_method("<init>", "(I)V", c, access=FL.ACC_PUBLIC)
+    _bump(cb, "bumpSync", FL.ACC_STATIC | FL.ACC_SYNCHRONIZED)
+    _bump(cb, "bumpRaw", FL.ACC_STATIC)
+
+    r = cb.code(max_stack=2, max_locals=3)
+    r.iconst(0).istore(1)
+    r.label("loop").iload(1).aload(0).getfield(W, "n", "I").branch(OP.IF_ICMPGE, "end")
+    r.getstatic(W, "MODE", "I").branch(OP.IFNE, "notblock")
+    r.getstatic(W, "LOCK", "Ljava/lang/Object;").op(OP.MONITORENTER)
+    r.getstatic(W, "C", "I").istore(2).invokestatic("java/lang/Thread", "yield", "()V")
+    r.iload(2).iconst(1).op(OP.IADD).putstatic(W, "C", "I")
+    r.getstatic(W, "LOCK", "Ljava/lang/Object;").op(OP.MONITOREXIT).branch(OP.GOTO, "next")
+    r.label("notblock").getstatic(W, "MODE", "I").iconst(1).branch(OP.IF_ICMPNE, "raw")
+    r.invokestatic(W, "bumpSync", "()V").branch(OP.GOTO, "next")
+    r.label("raw").invokestatic(W, "bumpRaw", "()V")
+    r.label("next").iinc(1, 1).branch(OP.GOTO, "loop")
+    r.label("end").getstatic(W, "DONE", "I").iconst(1).op(OP.IADD).putstatic(W, "DONE", "I").op(OP.RETURN)
+    cb.add_method("run", "()V", r, access=FL.ACC_PUBLIC)
+
+    d = cb.code(max_stack=3, max_locals=2)
+    d.iload(1).branch(OP.IFNE, "rec").iconst(0).op(OP.IRETURN)
+    d.label("rec").aload(0).iload(1).iconst(1).op(OP.ISUB).invokevirtual(W, "depth", "(I)I")
+    d.iconst(1).op(OP.IADD).op(OP.IRETURN)
+    cb.add_method("depth", "(I)I", d, access=FL.ACC_PUBLIC | FL.ACC_SYNCHRONIZED)
+    _write(path, cb)
+
+    m = ClassBuilder("mon/Main")
+    # spawn(k, n, mode): LOCK = new Worker(0); k workers; espera DONE == k; devolve C
+    c = m.code(max_stack=3, max_locals=4)
+    c.iload(2).putstatic(W, "MODE", "I")
+    c.new(W).op(OP.DUP).iconst(0).invokespecial(W, "<init>", "(I)V").putstatic(W, "LOCK", "Ljava/lang/Object;")
+    c.iconst(0).istore(3)
+    c.label("spawn").iload(3).iload(0).branch(OP.IF_ICMPGE, "wait")
+    c.new(W).op(OP.DUP).iload(1).invokespecial(W, "<init>", "(I)V").invokevirtual(W, "start", "()V")
+    c.iinc(3, 1).branch(OP.GOTO, "spawn")
+    c.label("wait").getstatic(W, "DONE", "I").iload(0).branch(OP.IF_ICMPGE, "done")
+    c.invokestatic("java/lang/Thread", "yield", "()V").branch(OP.GOTO, "wait")
+    c.label("done").getstatic(W, "C", "I").op(OP.IRETURN)
+    m.add_method("spawn", "(III)I", c)
+    # depth(k): new Worker(0).depth(k)
+    d = m.code(max_stack=3, max_locals=1)
+    d.new(W).op(OP.DUP).iconst(0).invokespecial(W, "<init>", "(I)V").iload(0).invokevirtual(W, "depth", "(I)I")
+    d.op(OP.IRETURN)
+    m.add_method("depth", "(I)I", d)
+    # badExit(): monitorexit de um lock que ninguém tem
+    b = m.code(max_stack=3, max_locals=0)
+    b.new(W).op(OP.DUP).iconst(0).invokespecial(W, "<init>", "(I)V").op(OP.MONITOREXIT).iconst(0).op(OP.IRETURN)
+    m.add_method("badExit", "()I", b)
+    # nullEnter(): monitorenter(null)
+    e = m.code(max_stack=1, max_locals=0)
+    e.op(OP.ACONST_NULL).op(OP.MONITORENTER).iconst(0).op(OP.IRETURN)
+    m.add_method("nullEnter", "()I", e)
+    _write(path, m)
+
+class TestMonitors(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        _classes(self.tmp.name)
+
+    def _call(self, interp, name: str, desc: str, *args: int) -> int:
+        rc = interp.loader.load_class("mon/Main")
+        interp.initialize_class(rc)
+        code, frame = interp.prepare_method(rc, name, desc)
+        for i, v in enumerate(args):
+            frame.set_local_int(i, v)
+        return interp.execute_frame(rc, code, frame).int_value
+
+    def _green(self, quantum: int = 50):
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        return interp, interp.enable_green_threads(quantum)
+
+    def _lock_header(self, interp):
+        ld = interp.loader
+        return ld.heap.get(ld.loaded[W].statics[("LOCK", "Ljava/lang/Object;")].value)
+
+    def test_contended_locks_are_mutually_exclusive(self):
+        interp, _ = self._green()
+        self.assertLess(self._call(interp, "spawn", "(III)I", 4, 30, 2), 120)  # controle: sem lock perde incrementos
+        for mode in (0, 1):
+            interp, sched = self._green()
+            self.assertEqual(self._call(interp, "spawn", "(III)I", 4, 30, mode), 120)
+            self.assertGreater(sched.inflations, 0)
+            # disputa acabou: locks soltos e desinflados
+            h = self._lock_header(interp) if mode == 0 else interp.loader.loaded[W]
+            self.assertEqual((h.lock_owner, h.lock_count, h.monitor), (None, 0, None))
+
+    def test_reentrant_synchronized_method(self):
+        interp, sched = self._green()
+        self.assertEqual(self._call(interp, "depth", "(I)I", 25), 25)
+        self.assertEqual(sched.inflations, 0)
+
+    def test_elided_without_green_threads(self):
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        self.assertEqual(self._call(interp, "depth", "(I)I", 25), 25)
+        self.assertEqual(self._call(interp, "spawn", "(III)I", 0, 0, 0), 0)
+        self.assertIsNone(self._lock_header(interp).lock_owner)
+        with self.assertRaisesRegex(RuntimeError, "NullPointerException"):
+            self._call(interp, "nullEnter", "()I")
+
+    def test_exit_without_owner(self):
+        interp, _ = self._green()
+        with self.assertRaisesRegex(RuntimeError, "IllegalMonitorStateException"):
+            self._call(interp, "badExit", "()I")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
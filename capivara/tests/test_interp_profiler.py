@@ -0,0 +1,115 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from capivara.bench import workloads as W
+from capivara.classfile.writer import ClassBuilder
+from capivara.interp.loop import Interpreter
+from capivara.interp.profiler import format_profile
+from capivara.loader.loader import ClassLoader
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+def _loop_class(path: str) -> None:
+    # run(): laço de 50 iterações nas linhas 10-12, chama helper() na linha 11
+    cb = ClassBuilder("prof/Loop")
+    h = cb.code(max_stack=1, max_locals=0)
+    h.line(20).iconst(1).op(OP.IRETURN)
+    cb.add_method("helper", "()I", h, access=FL.ACC_STATIC)
+    c = cb.code(max_stack=2, max_locals=2)
+    c.line(10).iconst(0).istore(0).iconst(0).istore(1)
+    c.label("top").line(11).iload(1).invokestatic("prof/Loop", "helper", "()I").op(OP.IADD).istore(1)
+    c.line(12).iinc(0, 1).iload(0).iconst(50).branch(OP.IF_ICMPLT, "top")
+    c.line(13).iload(1).op(OP.IRETURN)
+    cb.add_method("run", "()I", c)
+    with open(os.path.join(path, "prof", "Loop.class"), "wb") as f:
+        f.write(cb.to_bytes())
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _interp(self, w: W.Workload) -> Interpreter:
+        W.write_classes(w, self.tmp.name)
+        return Interpreter(ClassLoader([self.tmp.name]))
+
+    def test_counts_and_times(self):
+        w = W.call_chain(3, 40)
+        interp = self._interp(w)
+        prof = interp.enable_profiling()
+        res = interp.execute_static_entry(w.name, w.entry, w.desc)
+        self.assertIs(interp.disable_profiling(), prof)
+        self.assertNotIn("_run_frame", interp.__dict__)
+        self.assertEqual(res.int_value, w.expected)
+
+        rep = prof.report(top=10)
+        self.assertEqual(rep["bytecodes"], w.bytecodes)
+        self.assertEqual(rep["invocations"], w.calls)
+        by_name = {m["method"]: m for m in rep["methods"]}
+        run = by_name[f"{w.name}.run()I"]
+        c0 = by_name[f"{w.name}.c0(I)I"]
+        self.assertEqual(c0["invocations"], 40)
+        # inclusivo de run cobre toda a execução; self de cada método <= inclusivo
+        self.assertAlmostEqual(run["inclusive_s"], rep["total_s"], delta=rep["total_s"] * 0.01 + 1e-6)
+        for m in rep["methods"]:
+            self.assertLessEqual(m["self_s"], m["inclusive_s"] + 1e-9)
+        self.assertLessEqual(c0["inclusive_s"], run["inclusive_s"])
+        self.assertEqual(rep["opcodes"]["INVOKESTATIC"], 40 * 3)
+
+    def test_recursive_inclusive_not_double_counted(self):
+        w = W.recursive_fib(12)
+        interp = self._interp(w)
+        prof = interp.enable_profiling()
+        interp.execute_static_entry(w.name, w.entry, w.desc)
+        rep = prof.report()
+        fib = next(m for m in rep["methods"] if m["method"].endswith(".fib(I)I"))
+        self.assertLessEqual(fib["inclusive_s"], rep["total_s"] + 1e-9)
+        self.assertEqual(rep["methods"][0]["method"], fib["method"])  # o mais quente
+
+    def test_hot_offsets_with_lines(self):
+        os.makedirs(os.path.join(self.tmp.name, "prof"))
+        _loop_class(self.tmp.name)
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        prof = interp.enable_profiling()
+        interp.execute_static_entry("prof/Loop", "run", "()I")
+        rep = prof.report(top=1, offsets=3)
+        self.assertEqual(len(rep["methods"]), 1)
+        hot = rep["methods"][0]["hot_offsets"]
+        self.assertEqual(len(hot), 3)
+        self.assertTrue(all(h["line"] in (10, 11, 12, 13) for h in hot))
+        self.assertGreaterEqual(hot[0]["count"], hot[-1]["count"])
+        self.assertIn("prof/Loop", format_profile(rep))
+
+    def test_modes_are_exclusive(self):
+        interp = self._interp(W.hot_loop(10))
+        interp.enable_profiling()
+        with self.assertRaises(RuntimeError):
+            interp.enable_counting()
+
+class TestCLIProfile(unittest.TestCase):
+    def test_run_profile(self):
+        w = W.virtual_dispatch(50)
+        with tempfile.TemporaryDirectory() as tmp:
+            W.write_classes(w, tmp)
+            out = os.path.join(tmp, "prof.json")
+            cmd = [sys.executable, "-m", "capivara.cli", "run", w.name, "--cp", tmp, "--entry", "run",
+                   "--desc", "()I", "--profile", "--profile-top", "2", "--profile-json", out]
+            r = subprocess.run(cmd, capture_output=True, text=True)
+            self.assertEqual(r.returncode, 0, msg=r.stderr)
+            self.assertIn(f"RET: {w.expected}", r.stdout)
+            self.assertIn("self%", r.stderr)
+            with open(out) as f:
+                rep = json.load(f)
+            self.assertEqual(len(rep["methods"]), 2)
+            self.assertEqual(rep["invocations"], w.calls)
+
+            cmd += ["--count"]
+            r = subprocess.run(cmd, capture_output=True, text=True)
+            self.assertEqual(r.returncode, 64)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+from capivara.bench import workloads as W
+from capivara.classfile.writer import ClassBuilder
+from capivara.interp.loop import Interpreter
+from capivara.interp.sampler import SamplingProfiler
+from capivara.loader.loader import ClassLoader
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+def _spin_class(path: str, n: int) -> None:
+    # run() chama spin(n) (linha 5), que gira num laço nas linhas 20-21
+    cb = ClassBuilder("samp/Spin")
+    s = cb.code(max_stack=2, max_locals=2)
+    s.line(20).iconst(0).istore(1)
+    s.label("top").line(21).iinc(1, 1).iload(1).iload(0).branch(OP.IF_ICMPLT, "top")
+    s.line(22).iload(1).op(OP.IRETURN)
+    cb.add_method("spin", "(I)I", s, access=FL.ACC_STATIC)
+    r = cb.code(max_stack=2, max_locals=0)
+    r.line(5).iconst(30000).iconst(3).op(OP.IMUL).invokestatic("samp/Spin", "spin", "(I)I").op(OP.IRETURN)
+    cb.add_method("run", "()I", r)
+    os.makedirs(os.path.join(path, "samp"), exist_ok=True)
+    with open(os.path.join(path, "samp", "Spin.class"), "wb") as f:
+        f.write(cb.to_bytes())
+
+class TestSamplingProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        _spin_class(self.tmp.name, 90000)
+
+    def test_collapsed_java_stacks(self):
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        sp = SamplingProfiler(hz=500)
+        with sp:
+            for _ in range(20):
+                self.assertEqual(interp.execute_static_entry("samp/Spin", "run", "()I").int_value, 90000)
+                if sp.stacks:
+                    break
+        self.assertGreater(sp.samples, 0)
+        self.assertTrue(sp.stacks)
+        for stack in sp.stacks:
+            self.assertEqual(stack[0], "samp.Spin.run:5")
+            if len(stack) > 1:
+                self.assertIn(stack[1], ("samp.Spin.spin:20", "samp.Spin.spin:21", "samp.Spin.spin:22"))
+        for line in sp.collapsed().splitlines():
+            frames, count = line.rsplit(" ", 1)
+            self.assertTrue(frames.startswith("samp.Spin.run:5"))
+            self.assertGreater(int(count), 0)
+
+    def test_no_java_frames(self):
+        sp = SamplingProfiler(hz=100, thread_id=threading.get_ident())
+        sp._loop_file = Interpreter._run_frame.__code__.co_filename
+        sp.sample()
+        self.assertEqual((sp.samples, sp.empty_samples), (1, 1))
+        self.assertEqual(sp.collapsed(), "")
+
+    def test_invalid_hz(self):
+        with self.assertRaises(ValueError):
+            SamplingProfiler(hz=0)
+
+    def test_cli_sample_out(self):
+        out = os.path.join(self.tmp.name, "out.folded")
+        cmd = [sys.executable, "-m", "capivara.cli", "run", "samp.Spin", "--cp", self.tmp.name,
+               "--entry", "run", "--desc", "()I", "--sample-out", out, "--sample-hz", "1000"]
+        r = subprocess.run(cmd, capture_output=True, text=True)
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        self.assertIn("RET: 90000", r.stdout)
+        self.assertTrue(os.path.exists(out))
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
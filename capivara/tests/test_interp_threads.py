@@ -0,0 +1,157 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from capivara.classfile.writer import ClassBuilder
+from capivara.interp.loop import Interpreter
+from capivara.loader.loader import ClassLoader
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+W = "th/Worker"
+
+def _write(path: str, cb: ClassBuilder) -> None:
+    out = os.path.join(path, cb.name + ".class")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "wb") as f:
+        f.write(cb.to_bytes())
+
+def _worker(path: str) -> None:
+    """
+    Worker(id, n) extends Thread; run(): n vezes { SUM++; if (LAST != id) { SWITCHES++; LAST = id } }; DONE++
+    SELFJOIN != 0 faz run() começar com this.join() (bloqueia para sempre).
+    """
+    cb = ClassBuilder(W, super_name="java/lang/Thread")
+    for f in ("SUM", "LAST", "SWITCHES", "DONE", "SELFJOIN"):
+        cb.add_field(f, "I")
+    cb.add_field("id", "I", access=0)
+    cb.add_field("n", "I", access=0)
+    c = cb.code(max_stack=2, max_locals=3)
+    c.aload(0).invokespecial("java/lang/Thread", "<init>", "()V")
+    c.aload(0).iload(1).putfield(W, "id", "I").aload(0).iload(2).putfield(W, "n", "I").op(OP.RETURN)
+    cb.add_method("<init>", "(II)V", c, access=FL.ACC_PUBLIC)
+
+    r = cb.code(max_stack=2, max_locals=3)
+    r.getstatic(W, "SELFJOIN", "I").branch(OP.IFEQ, "go").aload(0).invokevirtual(W, "join", "()V")
+    r.label("go").aload(0).getfield(W, "n", "I").istore(2).iconst(0).istore(1)
+    r.label("loop").iload(1).iload(2).branch(OP.IF_ICMPGE, "end")
+    r.getstatic(W, "SUM", "I").iconst(1).op(OP.IADD).putstatic(W, "SUM", "I")
+    r.getstatic(W, "LAST", "I").aload(0).getfield(W, "id", "I").branch(OP.IF_ICMPEQ, "same")
+    r.getstatic(W, "SWITCHES", "I").iconst(1).op(OP.IADD).putstatic(W, "SWITCHES", "I")
+    r.aload(0).getfield(W, "id", "I").putstatic(W, "LAST", "I")
+    r.label("same").iinc(1, 1).branch(OP.GOTO, "loop")
+    r.label("end").getstatic(W, "DONE", "I").iconst(1).op(OP.IADD).putstatic(W, "DONE", "I").op(OP.RETURN)
+    cb.add_method("run", "()V", r, access=FL.ACC_PUBLIC)
+    _write(path, cb)
+
+def _main(path: str) -> None:
+    cb = ClassBuilder("th/Main")
+    # spawn(k, n): k workers (ids 1..k) de n passos; espera com Thread.yield() até DONE == k; devolve SUM
+    c = cb.code(max_stack=4, max_locals=3)
+    c.iconst(1).istore(2)
+    c.label("spawn").iload(2).iload(0).branch(OP.IF_ICMPGT, "wait")
+    c.new(W).op(OP.DUP).iload(2).iload(1).invokespecial(W, "<init>", "(II)V").invokevirtual(W, "start", "()V")
+    c.iinc(2, 1).branch(OP.GOTO, "spawn")
+    c.label("wait").getstatic(W, "DONE", "I").iload(0).branch(OP.IF_ICMPGE, "done")
+    c.invokestatic("java/lang/Thread", "yield", "()V").branch(OP.GOTO, "wait")
+    c.label("done").getstatic(W, "SUM", "I").op(OP.IRETURN)
+    cb.add_method("spawn", "(II)I", c)
+    # joinOne(n): t = new Worker(1, n); t.start(); t.join(); return SUM
+    j = cb.code(max_stack=4, max_locals=2)
+    j.new(W).op(OP.DUP).iconst(1).iload(0).invokespecial(W, "<init>", "(II)V").astore(1)
+    j.aload(1).invokevirtual(W, "start", "()V").aload(1).invokevirtual(W, "join", "()V")
+    j.getstatic(W, "SUM", "I").op(OP.IRETURN)
+    cb.add_method("joinOne", "(I)I", j)
+    # napWhileWorking(ms): inicia Worker(1, 300), dorme ms e devolve DONE
+    n = cb.code(max_stack=4, max_locals=2)
+    n.new(W).op(OP.DUP).iconst(1).iconst(300).invokespecial(W, "<init>", "(II)V").invokevirtual(W, "start", "()V")
+    n.op(OP.LLOAD_0).invokestatic("java/lang/Thread", "sleep", "(J)V").getstatic(W, "DONE", "I").op(OP.IRETURN)
+    cb.add_method("napWhileWorking", "(J)I", n)
+    d = cb.code(max_stack=2, max_locals=0)
+    d.iconst(4).iconst(50).invokestatic("th/Main", "spawn", "(II)I").op(OP.IRETURN)
+    cb.add_method("demo", "()I", d)
+    _write(path, cb)
+
+class TestGreenThreads(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        _worker(self.tmp.name)
+        _main(self.tmp.name)
+
+    def _call(self, quantum: int, name: str, *args: int):
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        sched = interp.enable_green_threads(quantum)
+        rc = interp.loader.load_class("th/Main")
+        interp.initialize_class(rc)
+        code, frame = interp.prepare_method(rc, name, "(" + "I" * len(args) + ")I")
+        for i, v in enumerate(args):
+            frame.set_local_int(i, v)
+        return interp.execute_frame(rc, code, frame).int_value, interp, sched
+
+    def _static(self, interp, name: str) -> int:
+        return interp.loader.loaded[W].statics[(name, "I")].value
+
+    def test_time_slicing_interleaves(self):
+        total, interp, sched = self._call(20, "spawn", 3, 200)
+        self.assertEqual(total, 600)
+        self.assertGreater(self._static(interp, "SWITCHES"), 10)
+        self.assertGreater(sched.switches, 10)
+        # quantum grande: cada worker roda inteiro de uma vez
+        total, interp, _ = self._call(1_000_000, "spawn", 3, 200)
+        self.assertEqual((total, self._static(interp, "SWITCHES")), (600, 3))
+
+    def test_join_parks_until_done(self):
+        total, _, sched = self._call(10, "joinOne", 500)
+        self.assertEqual(total, 500)
+        self.assertGreaterEqual(sched.parks, 1)
+
+    def test_sleep_parks_only_the_sleeper(self):
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        sched = interp.enable_green_threads(10)
+        rc = interp.loader.load_class("th/Main")
+        code, frame = interp.prepare_method(rc, "napWhileWorking", "(J)I")
+        frame.set_local_long(0, 60)
+        t0 = time.monotonic()
+        # o worker termina enquanto a main dorme
+        self.assertEqual(interp.execute_frame(rc, code, frame).int_value, 1)
+        self.assertGreaterEqual(time.monotonic() - t0, 0.06)
+        self.assertGreater(sched.switches, 10)
+        self.assertFalse(sched.blocked)
+
+    def test_thousands_of_threads(self):
+        total, _, sched = self._call(5, "spawn", 2000, 3)
+        self.assertEqual(total, 6000)
+        self.assertEqual(sched.threads, 2001)
+
+    def _join_one(self, interp):
+        rc = interp.loader.load_class("th/Main")
+        code, frame = interp.prepare_method(rc, "joinOne", "(I)I")
+        frame.set_local_int(0, 1)
+        return interp.execute_frame(rc, code, frame)
+
+    def test_deadlock_detected(self):
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        interp.enable_green_threads(100)
+        interp.loader.load_class(W).statics[("SELFJOIN", "I")].value = 1
+        with self.assertRaisesRegex(RuntimeError, "deadlock"):
+            self._join_one(interp)
+
+    def test_start_requires_green_threads(self):
+        with self.assertRaisesRegex(RuntimeError, "threads verdes"):
+            self._join_one(Interpreter(ClassLoader([self.tmp.name])))
+
+    def test_cli_green_threads(self):
+        cmd = [sys.executable, "-m", "capivara.cli", "run", "th.Main", "--cp", self.tmp.name,
+               "--entry", "demo", "--desc", "()I", "--green-threads", "--thread-quantum", "7"]
+        r = subprocess.run(cmd, capture_output=True, text=True)
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        self.assertIn("RET: 200", r.stdout)
+        r = subprocess.run(cmd + ["--count"], capture_output=True, text=True)
+        self.assertEqual(r.returncode, 64)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+
+from capivara.classfile.writer import ClassBuilder
+from capivara.interp.vm import VM
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+K = "emb/Kit"
+
+def _classes(path: str) -> None:
+    cb = ClassBuilder(K)
+    cb.add_field("CALLS", "I")
+    # sum(int[] a): soma dos elementos
+    c = cb.code(max_stack=3, max_locals=3)
+    c.iconst(0).istore(1).iconst(0).istore(2)
+    c.label("loop").iload(2).aload(0).op(OP.ARRAYLENGTH).branch(OP.IF_ICMPGE, "end")
+    c.iload(1).aload(0).iload(2).op(OP.IALOAD).op(OP.IADD).istore(1).iinc(2, 1).branch(OP.GOTO, "loop")
+    c.label("end").iload(1).op(OP.IRETURN)
+    cb.add_method("sum", "([I)I", c)
+    # reverse(char[] s): novo char[] invertido
+    r = cb.code(max_stack=5, max_locals=3)
+    r.aload(0).op(OP.ARRAYLENGTH).op(OP.NEWARRAY, 5).astore(1).iconst(0).istore(2)
+    r.label("loop").iload(2).aload(0).op(OP.ARRAYLENGTH).branch(OP.IF_ICMPGE, "end")
+    r.aload(1).aload(0).op(OP.ARRAYLENGTH).iconst(1).op(OP.ISUB).iload(2).op(OP.ISUB)
+    r.aload(0).iload(2).op(OP.CALOAD).op(OP.CASTORE).iinc(2, 1).branch(OP.GOTO, "loop")
+    r.label("end").aload(1).op(OP.ARETURN)
+    cb.add_method("reverse", "([C)[C", r)
+    # bump(byte[] b, int i): b[i] += 1 (com overflow de byte); devolve b
+    b = cb.code(max_stack=4, max_locals=2)
+    b.aload(0).iload(1).aload(0).iload(1).op(OP.BALOAD).iconst(1).op(OP.IADD).op(OP.BASTORE).aload(0).op(OP.ARETURN)
+    cb.add_method("bump", "([BI)[B", b)
+    # setFlag(boolean[] f, int v): f[0] = v via bastore; devolve f
+    sf = cb.code(max_stack=3, max_locals=2)
+    sf.aload(0).iconst(0).iload(1).op(OP.BASTORE).aload(0).op(OP.ARETURN)
+    cb.add_method("setFlag", "([ZI)[Z", sf)
+    # squares(n): int[n] com i*i
+    s = cb.code(max_stack=4, max_locals=2)
+    s.iload(0).op(OP.NEWARRAY, 10).astore(1).iconst(0).istore(0)
+    s.label("loop").iload(0).aload(1).op(OP.ARRAYLENGTH).branch(OP.IF_ICMPGE, "end")
+    s.aload(1).iload(0).iload(0).iload(0).op(OP.IMUL).op(OP.IASTORE).iinc(0, 1).branch(OP.GOTO, "loop")
+    s.label("end").aload(1).op(OP.ARETURN)
+    cb.add_method("squares", "(I)[I", s)
+    # idLong(long, int): devolve o long; idDouble(int, double): devolve o double
+    lj = cb.code(max_stack=2, max_locals=3)
+    lj.op(OP.LLOAD_0).op(OP.LRETURN)
+    cb.add_method("idLong", "(JI)J", lj)
+    dd = cb.code(max_stack=2, max_locals=3)
+    dd.op(OP.DLOAD, 1).op(OP.DRETURN)
+    cb.add_method("idDouble", "(ID)D", dd)
+    # positive(i): boolean; letter(i): char 'a' + i
+    p = cb.code(max_stack=1, max_locals=1)
+    p.iload(0).branch(OP.IFLE, "no").iconst(1).op(OP.IRETURN).label("no").iconst(0).op(OP.IRETURN)
+    cb.add_method("positive", "(I)Z", p)
+    lt = cb.code(max_stack=2, max_locals=1)
+    lt.iconst(97).iload(0).op(OP.IADD).op(OP.IRETURN)
+    cb.add_method("letter", "(I)C", lt)
+    # chamadas Java -> Java com arrays, long e double nos args e retornos
+    i = cb.code(max_stack=1, max_locals=1)
+    i.aload(0).invokespecial("java/lang/Object", "<init>", "()V").op(OP.RETURN)
+    cb.add_method("<init>", "()V", i, access=FL.ACC_PUBLIC)
+    tt = cb.code(max_stack=1, max_locals=1)  # total(n) = sum(squares(n))
+    tt.iload(0).invokestatic(K, "squares", "(I)[I").invokestatic(K, "sum", "([I)I").op(OP.IRETURN)
+    cb.add_method("total", "(I)I", tt)
+    pl = cb.code(max_stack=3, max_locals=2)  # passLong(j) = idLong(j, 0)
+    pl.op(OP.LLOAD_0).iconst(0).invokestatic(K, "idLong", "(JI)J").op(OP.LRETURN)
+    cb.add_method("passLong", "(J)J", pl)
+    pk = cb.code(max_stack=2, max_locals=5)  # pick(j, d) de instância: devolve d
+    pk.op(OP.DLOAD, 3).op(OP.DRETURN)
+    cb.add_method("pick", "(JD)D", pk, access=FL.ACC_PUBLIC)
+    wr = cb.code(max_stack=1, max_locals=2)  # wrap(n) privado: squares(n)
+    wr.iload(1).invokestatic(K, "squares", "(I)[I").op(OP.ARETURN)
+    cb.add_method("wrap", "(I)[I", wr, access=FL.ACC_PRIVATE)
+    vo = cb.code(max_stack=6, max_locals=5)  # viaObject(j, d) = new Kit().pick(j, d)
+    vo.new(K).op(OP.DUP).invokespecial(K, "<init>", "()V").astore(4)
+    vo.aload(4).op(OP.LLOAD_0).op(OP.DLOAD, 2).invokevirtual(K, "pick", "(JD)D").op(OP.DRETURN)
+    cb.add_method("viaObject", "(JD)D", vo)
+    ws = cb.code(max_stack=3, max_locals=1)  # wrapped(n) = sum(new Kit().wrap(n))
+    ws.new(K).op(OP.DUP).invokespecial(K, "<init>", "()V").iload(0)
+    ws.invokespecial(K, "wrap", "(I)[I").invokestatic(K, "sum", "([I)I").op(OP.IRETURN)
+    cb.add_method("wrapped", "(I)I", ws)
+    # tick(): ++CALLS
+    t = cb.code(max_stack=2, max_locals=0)
+    t.getstatic(K, "CALLS", "I").iconst(1).op(OP.IADD).op(OP.DUP).putstatic(K, "CALLS", "I").op(OP.IRETURN)
+    cb.add_method("tick", "()I", t)
+    out = os.path.join(path, K + ".class")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "wb") as f:
+        f.write(cb.to_bytes())
+
+class TestVM(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        _classes(self.tmp.name)
+        self.vm = VM([self.tmp.name])
+
+    def test_marshalling(self):
+        vm = self.vm
+        self.assertEqual(vm.call(K, "sum", "([I)I", [1, 2, 3, -4]), 2)
+        self.assertEqual(vm.call(K, "sum", "([I)I", ()), 0)
+        self.assertEqual(vm.call(K, "reverse", "([C)[C", "capivara"), "aravipac")
+        # char[] são unidades UTF-16: fora do BMP, par substituto (invertê-lo o quebra, como em Java)
+        self.assertEqual(vm.to_python(vm.new_array("C", "a😀")), "a😀")
+        self.assertEqual(len(vm.loader.heap.get(vm.new_array("C", "😀")).data), 2)
+        self.assertEqual(vm.call(K, "reverse", "([C)[C", "😀a"), "a\ude00\ud83d")
+        self.assertEqual(vm.call(K, "bump", "([BI)[B", b"\x01\x7f\xff", 1), b"\x01\x80\xff")
+        # bastore em boolean[] fica só com o bit baixo
+        self.assertEqual([vm.call(K, "setFlag", "([ZI)[Z", [True, True], v) for v in (2, 3, -2)],
+                         [[False, True], [True, True], [False, True]])
+        self.assertEqual(vm.call(K, "squares", "(I)[I", 5), [0, 1, 4, 9, 16])
+        self.assertEqual(vm.call(K, "idLong", "(JI)J", -(1 << 40), 7), -(1 << 40))
+        self.assertEqual(vm.call(K, "idDouble", "(ID)D", 1, 2.5), 2.5)
+        self.assertIs(vm.call(K, "positive", "(I)Z", 3), True)
+        self.assertEqual(vm.call(K, "letter", "(I)C", 2), "c")
+        self.assertEqual(vm.to_python(vm.new_array("I", [7, 8])), [7, 8])
+
+    def test_java_calls_with_non_int_values(self):
+        vm = self.vm
+        self.assertEqual(vm.call(K, "total", "(I)I", 4), 0 + 1 + 4 + 9)
+        self.assertEqual(vm.call(K, "passLong", "(J)J", 1 << 40), 1 << 40)
+        self.assertEqual(vm.call(K, "viaObject", "(JD)D", -3, 0.25), 0.25)
+        self.assertEqual(vm.call(K, "wrapped", "(I)I", 3), 5)
+
+    def test_state_and_caches_stay_warm(self):
+        tick = self.vm.function(K, "tick", "()I")
+        loads = self.vm.loader.stats.classes_loaded
+        self.assertEqual([tick() for _ in range(3)], [1, 2, 3])
+        self.assertEqual(self.vm.call(K, "tick", "()I"), 4)
+        self.assertEqual(self.vm.get_static(K, "CALLS", "I"), 4)
+        self.assertEqual(self.vm.loader.stats.classes_loaded, loads)
+        self.assertEqual(self.vm.calls, 4)
+
+    def test_errors(self):
+        vm = self.vm
+        with self.assertRaises(TypeError):
+            vm.call(K, "sum", "([I)I", "abc")
+        with self.assertRaises(OverflowError):
+            vm.call(K, "positive", "(I)Z", 1 << 31)
+        with self.assertRaisesRegex(TypeError, "espera 2"):
+            vm.call(K, "bump", "([BI)[B", b"x")
+        with self.assertRaisesRegex(RuntimeError, "ArrayIndexOutOfBoundsException"):
+            vm.call(K, "bump", "([BI)[B", b"x", 1)
+        with self.assertRaisesRegex(LookupError, "não encontrado"):
+            vm.call(K, "nada", "()V")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
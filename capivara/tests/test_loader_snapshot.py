@@ -0,0 +1,125 @@
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from capivara.classfile.writer import ClassBuilder
+from capivara.interp.loop import Interpreter
+from capivara.loader.loader import ClassLoader
+from capivara.loader.snapshot import MAGIC, restore_snapshot, save_snapshot
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+def _write(path: str, cb: ClassBuilder) -> None:
+    out = os.path.join(path, cb.name + ".class")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "wb") as f:
+        f.write(cb.to_bytes())
+
+def _classes(path: str) -> None:
+    box = ClassBuilder("snap/Box")
+    box.add_field("v", "I", access=0)
+    box.add_default_constructor()
+    _write(path, box)
+    # Main.<clinit>: INITS++; BOX = new Box(); BOX.v = 7
+    main = ClassBuilder("snap/Main")
+    main.add_field("INITS", "I")
+    main.add_field("BOX", "Lsnap/Box;")
+    c = main.code(max_stack=3, max_locals=0)
+    c.getstatic("snap/Main", "INITS", "I").iconst(1).op(OP.IADD).putstatic("snap/Main", "INITS", "I")
+    c.new("snap/Box").op(OP.DUP).invokespecial("snap/Box", "<init>", "()V").putstatic("snap/Main", "BOX", "Lsnap/Box;")
+    c.getstatic("snap/Main", "BOX", "Lsnap/Box;").iconst(7).putfield("snap/Box", "v", "I")
+    c.op(OP.RETURN)
+    main.add_method("<clinit>", "()V", c, access=FL.ACC_STATIC)
+    # run() = INITS * 100 + BOX.v
+    r = main.code(max_stack=3, max_locals=0)
+    r.getstatic("snap/Main", "INITS", "I").iconst(100).op(OP.IMUL)
+    r.getstatic("snap/Main", "BOX", "Lsnap/Box;").getfield("snap/Box", "v", "I").op(OP.IADD).op(OP.IRETURN)
+    main.add_method("run", "()I", r)
+    _write(path, main)
+
+class _Boom:
+    ran = False
+
+    def __reduce__(self):
+        return (setattr, (_Boom, "ran", True))
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cp = os.path.join(self.tmp.name, "classes")
+        _classes(self.cp)
+        self.snap = os.path.join(self.tmp.name, "vm.snap")
+        key = mock.patch.dict(os.environ, {"CAPIVARA_SNAPSHOT_KEY": os.path.join(self.tmp.name, "key")})
+        key.start()  # os subprocessos da CLI herdam
+        self.addCleanup(key.stop)
+
+    def _remove_classes(self) -> None:
+        for name in ("Main", "Box"):
+            os.remove(os.path.join(self.cp, "snap", name + ".class"))
+
+    def test_roundtrip_skips_load_and_clinit(self):
+        interp = Interpreter(ClassLoader([self.cp]))
+        self.assertEqual(interp.execute_static_entry("snap/Main", "run", "()I").int_value, 107)
+        save_snapshot(interp.loader, self.snap)
+        self._remove_classes()
+
+        ld = ClassLoader([self.cp])
+        self.assertEqual(restore_snapshot(ld, self.snap), 2)
+        self.assertEqual(ld.loaded["snap/Main"].status, "initialized")
+        self.assertEqual((len(ld.heap), ld.stats.classes_loaded), (1, 0))
+        # INITS continua 1: o <clinit> não rodou de novo
+        self.assertEqual(Interpreter(ld).execute_static_entry("snap/Main", "run", "()I").int_value, 107)
+
+    def test_rejects_bad_files(self):
+        save_snapshot(ClassLoader([self.cp]), self.snap)
+        with self.assertRaisesRegex(ValueError, "classpath"):
+            restore_snapshot(ClassLoader([self.tmp.name]), self.snap)
+        ld = ClassLoader([self.cp])
+        ld.load_class("snap/Box")
+        with self.assertRaisesRegex(ValueError, "sem classes"):
+            restore_snapshot(ld, self.snap)
+        with open(self.snap, "r+b") as f:
+            f.truncate(20)
+        with self.assertRaisesRegex(ValueError, "corrompido"):
+            restore_snapshot(ClassLoader([self.cp]), self.snap)
+        with open(self.snap, "wb") as f:
+            f.write(b"nada")
+        with self.assertRaisesRegex(ValueError, "não é um snapshot"):
+            restore_snapshot(ClassLoader([self.cp]), self.snap)
+
+    def test_forged_snapshot_is_not_unpickled(self):
+        save_snapshot(ClassLoader([self.cp]), self.snap)
+        with open(self.snap, "rb") as f:
+            data = f.read()
+        body = data[len(MAGIC) + 32:]
+        evil = pickle.dumps(_Boom())
+        for forged in (data[:len(MAGIC)] + b"\0" * 32 + body, data[:len(MAGIC) + 32] + evil + body):
+            with open(self.snap, "wb") as f:
+                f.write(forged)
+            with self.assertRaisesRegex(ValueError, "HMAC"):
+                restore_snapshot(ClassLoader([self.cp]), self.snap)
+        self.assertFalse(_Boom.ran)
+        os.remove(os.environ["CAPIVARA_SNAPSHOT_KEY"])
+        with self.assertRaisesRegex(ValueError, "sem chave"):
+            restore_snapshot(ClassLoader([self.cp]), self.snap)
+
+    def test_cli_checkpoint_restore(self):
+        base = [sys.executable, "-m", "capivara.cli", "run", "snap.Main", "--cp", self.cp,
+                "--entry", "run", "--desc", "()I"]
+        r = subprocess.run(base + ["--checkpoint", self.snap], capture_output=True, text=True)
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        self._remove_classes()
+        r = subprocess.run(base + ["--restore", self.snap, "--startup-report"], capture_output=True, text=True)
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        self.assertIn("RET: 107", r.stdout)
+        self.assertIn("restore", r.stderr)
+        r = subprocess.run(base + ["--restore", os.path.join(self.tmp.name, "x.snap")], capture_output=True, text=True)
+        self.assertEqual(r.returncode, 66)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
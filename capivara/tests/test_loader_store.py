@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from capivara.classfile.attributes import CodeAttribute
+from capivara.classfile.writer import ClassBuilder
+from capivara.interp.vm import VM
+from capivara.loader.store import ClassStore
+from capivara.util import opcodes as OP
+from capivara.util import flags as FL
+
+T = "mt/Tenant"
+
+def _classes(path: str) -> None:
+    base = ClassBuilder("mt/Base")
+    base.add_field("SEED", "I")
+    c = base.code(max_stack=1, max_locals=0)
+    c.iconst(100).putstatic("mt/Base", "SEED", "I").op(OP.RETURN)
+    base.add_method("<clinit>", "()V", c, access=FL.ACC_STATIC)
+    cb = ClassBuilder(T, super_name="mt/Base")
+    cb.add_field("N", "I")
+    # bump(k): N += k; devolve SEED + N
+    b = cb.code(max_stack=2, max_locals=1)
+    b.getstatic(T, "N", "I").iload(0).op(OP.IADD).putstatic(T, "N", "I")
+    b.getstatic("mt/Base", "SEED", "I").getstatic(T, "N", "I").op(OP.IADD).op(OP.IRETURN)
+    cb.add_method("bump", "(I)I", b)
+    # fill(n): novo int[n]
+    f = cb.code(max_stack=1, max_locals=1)
+    f.iload(0).op(OP.NEWARRAY, 10).op(OP.ARETURN)
+    cb.add_method("fill", "(I)[I", f)
+    for name, builder in (("mt/Base", base), (T, cb)):
+        out = os.path.join(path, name + ".class")
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        with open(out, "wb") as fh:
+            fh.write(builder.to_bytes())
+
+class TestClassStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        _classes(self.tmp.name)
+
+    def test_vms_share_classfiles_but_not_state(self):
+        store = ClassStore([self.tmp.name], lazy=True)
+        a, b = VM.from_store(store), VM.from_store(store)
+        self.assertEqual([a.call(T, "bump", "(I)I", 1) for _ in range(3)], [101, 102, 103])
+        self.assertEqual(b.call(T, "bump", "(I)I", 10), 110)
+        self.assertEqual((a.get_static(T, "N", "I"), b.get_static(T, "N", "I")), (3, 10))
+        self.assertEqual(a.call(T, "fill", "(I)[I", 2), [0, 0])
+        self.assertEqual(len(b.loader.heap), 0)
+        ra, rb = a.loader.loaded[T], b.loader.loaded[T]
+        self.assertIsNot(ra, rb)
+        self.assertIs(ra.cf, rb.cf)
+        code_a, _ = a.interp.prepare_method(ra, "bump", "(I)I")
+        code_b, _ = b.interp.prepare_method(rb, "bump", "(I)I")
+        self.assertIs(code_a, code_b)
+        self.assertIsInstance(ra.cf.methods[0].attributes[0], CodeAttribute)  # já decodificado no store
+        self.assertEqual(store.stats.classes_loaded, 2)
+        self.assertEqual((a.loader.stats.classes_loaded, a.loader.stats.bytes_read), (2, 0))
+
+    def test_tenants_in_threads_parse_once(self):
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy):
+                self._tenants_in_threads(ClassStore([self.tmp.name], lazy=lazy))
+
+    def _tenants_in_threads(self, store: ClassStore):
+        self.assertEqual(store.preload(["mt.Base"]), 1)
+        cp = store.classfile("mt/Base").constant_pool
+        self.assertFalse(cp._utf8_spans)  # nada decodifica sob demanda entre threads
+        self.assertIsNone(cp._data)
+
+        def tenant(k: int) -> int:
+            vm = VM.from_store(store)
+            return sum(vm.call(T, "bump", "(I)I", k) for _ in range(50))
+
+        with ThreadPoolExecutor(4) as ex:
+            got = list(ex.map(tenant, range(1, 9)))
+        self.assertEqual(got, [sum(100 + k * i for i in range(1, 51)) for k in range(1, 9)])
+        self.assertEqual(store.stats.classes_loaded, 2)
+        self.assertIn(T, store)
+        with self.assertRaises(FileNotFoundError):
+            store.classfile("mt/Nada")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
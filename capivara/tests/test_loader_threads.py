@@ -0,0 +1,112 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from capivara.classfile.symbols import SymbolTable
+from capivara.classfile.writer import ClassBuilder
+from capivara.loader.loader import ClassLoader
+from capivara.runtime.heap import Heap
+from capivara.runtime.strings import StringPool
+
+def _write(path: str, name: str, super_name: str = "java/lang/Object") -> None:
+    cb = ClassBuilder(name, super_name=super_name)
+    cb.add_field("X", "I")
+    out = os.path.join(path, name + ".class")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "wb") as f:
+        f.write(cb.to_bytes())
+
+class TestLoaderThreads(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        # cadeia C <- B <- A e classes independentes I0..I3
+        _write(self.tmp.name, "mt/C")
+        _write(self.tmp.name, "mt/B", "mt/C")
+        _write(self.tmp.name, "mt/A", "mt/B")
+        for i in range(4):
+            _write(self.tmp.name, f"mt/I{i}")
+        self.loader = ClassLoader([self.tmp.name])
+        self.reads = Counter()
+        base = self.loader.classpath.read_class_bytes
+
+        def slow_read(binary_name: str):
+            self.reads[binary_name] += 1
+            time.sleep(0.05)  # solta o GIL: alarga a janela de corrida
+            return base(binary_name)
+        self.loader.classpath.read_class_bytes = slow_read
+
+    def test_same_class_is_parsed_once(self):
+        barrier = threading.Barrier(8)
+
+        def load(name):
+            barrier.wait()
+            return self.loader.load_class(name)
+
+        with ThreadPoolExecutor(8) as ex:
+            got = list(ex.map(load, ["mt/A", "mt/B", "mt/C", "mt/A"] * 2))
+        self.assertEqual(len({id(rc) for rc in got}), 3)
+        self.assertEqual(self.reads, Counter({"mt/A": 1, "mt/B": 1, "mt/C": 1}))
+        self.assertEqual(self.loader.stats.classes_loaded, 3)
+        self.assertIs(self.loader.loaded["mt/A"], got[0])
+        self.assertIn(("X", "I"), got[0].statics)
+
+    def test_different_classes_load_in_parallel(self):
+        t0 = time.monotonic()
+        with ThreadPoolExecutor(4) as ex:
+            list(ex.map(self.loader.load_class, [f"mt/I{i}" for i in range(4)]))
+        self.assertLess(time.monotonic() - t0, 0.15)  # em série seriam 0.2 s
+        self.assertEqual(self.loader.stats.classes_loaded, 4)
+
+    def test_failed_load_is_not_published(self):
+        os.remove(os.path.join(self.tmp.name, "mt", "C.class"))
+        with self.assertRaises(FileNotFoundError):
+            self.loader.load_class("mt/A")
+        self.assertNotIn("mt/A", self.loader.loaded)
+        self.assertNotIn("mt/B", self.loader.loaded)
+
+class TestHeapThreads(unittest.TestCase):
+    def test_concurrent_allocation_and_interning(self):
+        heap, pool = Heap(), StringPool()
+
+        def work(_):
+            ids = [heap.new_array("I", 1) for _ in range(2000)]
+            sids = [pool.intern(f"s{i % 50}") for i in range(2000)]
+            return ids, sids
+
+        with ThreadPoolExecutor(8) as ex:
+            results = list(ex.map(work, range(8)))
+        ids = [i for r, _ in results for i in r]
+        self.assertEqual(len(set(ids)), 8 * 2000)
+        self.assertEqual(heap.allocated, 8 * 2000)
+        self.assertEqual(len(heap), 8 * 2000)
+        self.assertTrue(all(s == results[0][1] for _, s in results))
+        self.assertEqual(len(set(results[0][1])), 50)
+        self.assertEqual(pool.get(pool.intern("s7")), "s7")
+
+    def test_concurrent_symbol_interning(self):
+        old = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # troca de thread a todo momento: expõe corridas
+        self.addCleanup(sys.setswitchinterval, old)
+        for _ in range(5):
+            table = SymbolTable()
+            names = [f"n{i}" for i in range(3000)]
+
+            def work(k):
+                return [table.intern(n) for n in (names if k % 2 else reversed(names))]
+
+            with ThreadPoolExecutor(8) as ex:
+                results = list(ex.map(work, range(8)))
+            self.assertEqual(len(table), 3000)
+            self.assertEqual(sorted(results[1]), list(range(3000)))
+            for k, sids in enumerate(results):
+                order = names if k % 2 else list(reversed(names))
+                self.assertEqual([table.name(sid) for sid in sids], order)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -11,6 +11,12 @@ from capivara.runtime.frame import Frame, StackOverflowError, StackUnderflowErro
 from capivara.runtime.values import TOP
 from capivara.runtime.strings import StringPool
 from capivara.classfile.reader import read_classfile
+from capivara.util.bytesio import ByteStream, U2U2
+from capivara.util import opcodes as OP
+from capivara.classfile.symbols import SymbolTable, SYMBOLS
+from capivara.classfile.constant_pool import (
+    ConstantPool, CpClass, CpNameAndType, CpMethodref, make_utf8
+)
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 FIXTURES = PROJECT_ROOT / "capivara" / "tests" / "fixtures"
@@ -123,6 +129,66 @@ class TestStringPool(unittest.TestCase):
         self.assertNotEqual(a, c)
         self.assertEqual(pool.get(a), "capivara")
 
+class TestSymbolTable(unittest.TestCase):
+    def test_ids_are_stable(self):
+        st = SymbolTable()
+        a = st.intern("<init>")
+        self.assertEqual(st.intern("<init>"), a)
+        self.assertNotEqual(st.intern("()V"), a)
+        self.assertEqual(st.name(a), "<init>")
+        self.assertIsNone(st.lookup("nunca"))
+
+    def test_utf8_entries_share_canonical_str(self):
+        # strings montadas em runtime (não literais) para não depender do intern do CPython
+        u1 = make_utf8(b"java/lang/" + b"Object")
+        u2 = make_utf8(memoryview(b"java/lang/Object"))
+        self.assertIs(u1.value, u2.value)
+        self.assertEqual(u1.sid, u2.sid)
+        self.assertEqual(SYMBOLS.name(u1.sid), "java/lang/Object")
+
+    def test_resolve_ref_cached(self):
+        cp = ConstantPool(7)
+        cp.set(1, make_utf8(b"Demo"))
+        cp.set(2, CpClass(OP.CP_Class, 1))
+        cp.set(3, make_utf8(b"run"))
+        cp.set(4, make_utf8(b"()I"))
+        cp.set(5, CpNameAndType(OP.CP_NameAndType, 3, 4))
+        cp.set(6, CpMethodref(OP.CP_Methodref, 2, 5))
+        ref = cp.resolve_ref(6)
+        self.assertEqual((ref.owner, ref.name, ref.desc), ("Demo", "run", "()I"))
+        self.assertEqual(ref.name_id, cp.get_symbol(3))
+        self.assertIs(cp.resolve_ref(6), ref)
+        with self.assertRaises(TypeError):
+            cp.resolve_ref(2)
+
+class TestByteStream(unittest.TestCase):
+    def test_scalar_and_bulk_reads(self):
+        data = bytes([0x01, 0x00, 0x02, 0xCA, 0xFE, 0xBA, 0xBE,
+                      0x00, 0x03, 0x00, 0x04, 0x00, 0x05, 0x00, 0x06, 0x41, 0x42])
+        bs = ByteStream(data)
+        self.assertEqual(bs.read_u1(), 1)
+        self.assertEqual(bs.read_u2(), 2)
+        self.assertEqual(bs.read_u4(), 0xCAFEBABE)
+        self.assertEqual(bs.read_u2_array(2), [3, 4])
+        self.assertEqual(list(bs.iter_table(U2U2, 1)), [(5, 6)])
+        v = bs.read_view(2)
+        self.assertIsInstance(v, memoryview)
+        self.assertEqual(bytes(v), b"AB")
+        self.assertEqual(bs.tell(), len(data))
+
+    def test_eof(self):
+        bs = ByteStream(b"\x00\x01\x02")
+        bs.read_u2()
+        with self.assertRaises(EOFError):
+            bs.read_u2()
+        with self.assertRaises(EOFError):
+            bs.read_u2_array(4)
+        with self.assertRaises(EOFError):
+            bs.iter_table(U2U2, 1)
+        self.assertEqual(bs.read_u1(), 2)
+        with self.assertRaises(EOFError):
+            bs.read_u1()
+
 class TestDescriptorFromClass(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -0,0 +1,87 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from capivara.bench import workloads as W
+from capivara.interp.loop import Interpreter
+from capivara.loader.loader import ClassLoader
+from capivara.util.trace import Tracer, trace_invocations
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.w = W.virtual_dispatch(30)
+        W.write_classes(self.w, self.tmp.name)
+
+    def _spans(self, tracer, cat=None):
+        return [e for e in tracer.events if e["ph"] == "X" and (cat is None or e["cat"] == cat)]
+
+    def test_span_and_format(self):
+        tr = Tracer()
+        with tr.span("fase", cat="cli", detalhe=1):
+            pass
+        tr.instant("marco", "cli")
+        (ev,) = self._spans(tr)
+        self.assertEqual((ev["name"], ev["cat"], ev["args"]), ("fase", "cli", {"detalhe": 1}))
+        self.assertGreaterEqual(ev["dur"], 0)
+        d = tr.to_dict()
+        self.assertIn("traceEvents", d)
+        self.assertTrue(any(e["ph"] == "M" and e["name"] == "process_name" for e in d["traceEvents"]))
+
+    def test_loader_spans_nest(self):
+        tr = Tracer()
+        ld = ClassLoader([self.tmp.name])
+        ld.tracer = tr
+        ld.load_class(self.w.name + "$Derived")  # carrega Base como superclasse
+        loads = [e for e in self._spans(tr, "loader") if e["name"] == "load_class"]
+        self.assertEqual([e["args"]["class"] for e in loads],
+                         [self.w.name + "$Base", self.w.name + "$Derived"])
+        base, derived = loads
+        # a carga da superclasse fica dentro da carga da subclasse
+        self.assertGreaterEqual(base["ts"], derived["ts"])
+        self.assertLessEqual(base["ts"] + base["dur"], derived["ts"] + derived["dur"] + 1e-3)
+        names = {e["name"] for e in self._spans(tr, "loader")}
+        self.assertEqual(names, {"load_class", "read_bytes", "read_classfile", "link"})
+
+    def test_method_threshold(self):
+        interp = Interpreter(ClassLoader([self.tmp.name]))
+        tr = Tracer()
+        remove = trace_invocations(interp, tr, 0.0)
+        interp.execute_static_entry(self.w.name, self.w.entry, self.w.desc)
+        remove()
+        self.assertNotIn("_run_frame", interp.__dict__)
+        java = self._spans(tr, "java")
+        self.assertEqual(len(java), self.w.calls)
+        self.assertIn(f"{self.w.name}.run()I", {e["name"] for e in java})
+
+        tr2 = Tracer()
+        trace_invocations(interp, tr2, 3600.0)
+        interp.execute_static_entry(self.w.name, self.w.entry, self.w.desc)
+        self.assertEqual(self._spans(tr2, "java"), [])
+
+    def test_cli_trace_out(self):
+        out = os.path.join(self.tmp.name, "trace.json")
+        cmd = [sys.executable, "-m", "capivara.cli", "run", self.w.name, "--cp", self.tmp.name,
+               "--entry", "run", "--desc", "()I", "--trace-out", out, "--trace-methods-us", "0"]
+        r = subprocess.run(cmd, capture_output=True, text=True)
+        self.assertEqual(r.returncode, 0, msg=r.stderr)
+        with open(out) as f:
+            events = json.load(f)["traceEvents"]
+        by_cat = {}
+        for e in events:
+            by_cat.setdefault(e.get("cat"), set()).add(e["name"])
+        self.assertTrue({"validate_classpath", "setup", "execute"} <= by_cat["cli"])
+        self.assertIn("load_class", by_cat["loader"])
+        self.assertIn(f"{self.w.name}.run()I", by_cat["java"])
+        for extra in ("--count", "--profile"):
+            r = subprocess.run(cmd + [extra], capture_output=True, text=True)
+            self.assertEqual(r.returncode, 64, msg=r.stderr)
+            self.assertIn("--trace-methods-us não combina", r.stderr)
+            self.assertNotIn("Traceback", r.stderr)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
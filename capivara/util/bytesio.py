@@ -1,56 +1,85 @@
 from __future__ import annotations
 import struct
+from typing import Iterator, List, Tuple
+
+# Structs pré-compilados (evita re-parse do formato a cada leitura)
+U2 = struct.Struct(">H")
+U4 = struct.Struct(">I")
+U8 = struct.Struct(">Q")
+F4 = struct.Struct(">f")
+F8 = struct.Struct(">d")
+S4 = struct.Struct(">i")
+S8 = struct.Struct(">q")
+U2U2 = struct.Struct(">HH")
+U2U4 = struct.Struct(">HI")
 
 class ByteStream:
     """
     Leitor binário big-endian para .class.
     Mantém um cursor interno (self.pos) e expõe métodos u1/u2/u4/u8/bytes.
+
+    Lê sobre um memoryview do buffer original: `read_view` não copia, e o
+    limite do buffer é checado pelo próprio struct (sem `_need` por leitura);
+    o erro é convertido em EOFError.
     """
-    __slots__ = ("data", "pos", "size")
+    __slots__ = ("data", "view", "pos", "size")
 
     def __init__(self, data: bytes):
         self.data = data
+        self.view = memoryview(data)
         self.pos = 0
         self.size = len(data)
 
+    def _eof(self, n: int) -> EOFError:
+        return EOFError(f"ByteStream: tentativa de ler {n} bytes além do fim (pos={self.pos}, size={self.size})")
+
     def _need(self, n: int) -> None:
         if self.pos + n > self.size:
-            raise EOFError(f"ByteStream: tentativa de ler {n} bytes além do fim (pos={self.pos}, size={self.size})")
+            raise self._eof(n)
 
     def read_u1(self) -> int:
-        self._need(1)
-        b = self.data[self.pos]
+        try:
+            b = self.data[self.pos]
+        except IndexError:
+            raise self._eof(1) from None
         self.pos += 1
         return b
 
-    def read_u2(self) -> int:
-        self._need(2)
-        v = struct.unpack_from(">H", self.data, self.pos)[0]
-        self.pos += 2
+    def peek_u1(self) -> int:
+        try:
+            return self.data[self.pos]
+        except IndexError:
+            raise self._eof(1) from None
+
+    def read_struct(self, st: struct.Struct) -> Tuple:
+        """Lê um registro inteiro (vários campos) com um único unpack."""
+        try:
+            v = st.unpack_from(self.data, self.pos)
+        except struct.error:
+            raise self._eof(st.size) from None
+        self.pos += st.size
         return v
 
+    def read_u2(self) -> int:
+        return self.read_struct(U2)[0]
+
     def read_u4(self) -> int:
-        self._need(4)
-        v = struct.unpack_from(">I", self.data, self.pos)[0]
-        self.pos += 4
-        return v
+        return self.read_struct(U4)[0]
 
     def read_u8(self) -> int:
-        self._need(8)
-        hi, lo = struct.unpack_from(">II", self.data, self.pos)
-        self.pos += 8
-        return (hi << 32) | lo
+        return self.read_struct(U8)[0]
 
     def read_f4(self) -> float:
-        self._need(4)
-        v = struct.unpack_from(">f", self.data, self.pos)[0]
-        self.pos += 4
-        return v
+        return self.read_struct(F4)[0]
 
     def read_f8(self) -> float:
-        self._need(8)
-        v = struct.unpack_from(">d", self.data, self.pos)[0]
-        self.pos += 8
+        return self.read_struct(F8)[0]
+
+    def read_view(self, n: int) -> memoryview:
+        """Fatia sem cópia do buffer original."""
+        self._need(n)
+        v = self.view[self.pos:self.pos+n]
+        self.pos += n
         return v
 
     def read_bytes(self, n: int) -> bytes:
@@ -59,10 +88,32 @@ class ByteStream:
         self.pos += n
         return b
 
+    # ===== Leitores em bloco (tabelas inteiras num único unpack) =====
+    def read_u2_array(self, count: int) -> List[int]:
+        if count == 0:
+            return []
+        n = 2 * count
+        self._need(n)
+        v = struct.unpack_from(f">{count}H", self.data, self.pos)
+        self.pos += n
+        return list(v)
+
+    def iter_table(self, st: struct.Struct, count: int) -> Iterator[Tuple]:
+        """Itera `count` registros de formato `st` (ex.: exception_table)."""
+        n = st.size * count
+        self._need(n)
+        v = self.view[self.pos:self.pos+n]
+        self.pos += n
+        return st.iter_unpack(v)
+
+    def skip(self, n: int) -> None:
+        self._need(n)
+        self.pos += n
+
     def tell(self) -> int:
         return self.pos
 
     def seek(self, new_pos: int) -> None:
         if not (0 <= new_pos <= self.size):
             raise ValueError("seek fora do range")
-        self.pos = new_pos
\ No newline at end of file
+        self.pos = new_pos
@@ -0,0 +1,35 @@
+"""
+Peças de concorrência das tabelas da VM que várias threads Python usam ao
+mesmo tempo (SymbolTable, StringPool, Heap).
+"""
+from __future__ import annotations
+import threading
+from typing import Callable, Dict, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+def insert_once(lock: threading.Lock, table: Dict[K, V], key: K, make: Callable[[K], V]) -> V:
+    """
+    Caminho lento de um intern com busca sem lock: devolve `table[key]`,
+    criando-o com `make(key)` uma única vez entre threads. `make` roda sob o
+    lock e deve gravar os índices reversos (id -> valor) antes de retornar:
+    só depois o valor é publicado em `table`, e quem o achar lá sem travar
+    também acha o resto.
+    """
+    with lock:
+        v = table.get(key)  # outra thread pode ter inserido enquanto esperávamos
+        if v is None:
+            v = table[key] = make(key)
+    return v
+
+class LockedState:
+    """Mixin para objetos com `self._lock`: o pickle (snapshots) leva o estado e o lock é recriado."""
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]  # locks não são serializáveis
+        return state
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
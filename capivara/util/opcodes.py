@@ -40,11 +40,24 @@ ILOAD_0    = 0x1a
 ILOAD_1    = 0x1b
 ILOAD_2    = 0x1c
 ILOAD_3    = 0x1d
+LLOAD_0    = 0x1e   # lload_<n>, fload_<n>, dload_<n>: 0x1e..0x29, 4 de cada
+FLOAD_0    = 0x22
+DLOAD_0    = 0x26
+DLOAD_3    = 0x29
 ALOAD_0    = 0x2a
 ALOAD_1    = 0x2b
 ALOAD_2    = 0x2c
 ALOAD_3    = 0x2d
 
+IALOAD     = 0x2e   # i, l, f, d, a, b, c, s: 0x2e..0x35
+LALOAD     = 0x2f
+FALOAD     = 0x30
+DALOAD     = 0x31
+AALOAD     = 0x32
+BALOAD     = 0x33
+CALOAD     = 0x34
+SALOAD     = 0x35
+
 ISTORE     = 0x36
 ISTORE_0   = 0x3b
 ISTORE_1   = 0x3c
@@ -56,6 +69,15 @@ ASTORE_1   = 0x4c
 ASTORE_2   = 0x4d
 ASTORE_3   = 0x4e
 
+IASTORE    = 0x4f   # mesma ordem dos *ALOAD: 0x4f..0x56
+LASTORE    = 0x50
+FASTORE    = 0x51
+DASTORE    = 0x52
+AASTORE    = 0x53
+BASTORE    = 0x54
+CASTORE    = 0x55
+SASTORE    = 0x56
+
 POP        = 0x57
 DUP        = 0x59
 
@@ -100,3 +122,18 @@ INVOKESTATIC  = 0xb8
 INVOKEINTERFACE = 0xb9
 
 NEW        = 0xbb
+NEWARRAY   = 0xbc
+ARRAYLENGTH = 0xbe
+
+MONITORENTER = 0xc2
+MONITOREXIT  = 0xc3
+
+# reservado pela JVMS para a implementação: intrínsecos das classes de boot
+IMPDEP1    = 0xfe
+
+# newarray atype -> descritor do elemento
+NEWARRAY_TYPES = {4: "Z", 5: "C", 6: "F", 7: "D", 8: "B", 9: "S", 10: "I", 11: "J"}
+
+# opcode -> mnemônico (para relatórios)
+OPCODE_NAMES = {v: k for k, v in list(globals().items())
+                if k.isupper() and not k.startswith("CP_") and isinstance(v, int)}
@@ -0,0 +1,94 @@
+"""
+Timeline no formato Chrome trace-event (JSON), visível no Perfetto
+(ui.perfetto.dev) e em chrome://tracing.
+
+Cada intervalo vira um evento completo (`"ph": "X"`, início + duração, em µs
+desde a criação do tracer). Uso:
+
+    tracer = Tracer()
+    with tracer.span("fase", cat="cli"):
+        ...
+    tracer.write("trace.json")
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+class Tracer:
+    def __init__(self, process_name: str = "CapivaraVM", origin: Optional[float] = None):
+        # origin: instante (perf_counter) tratado como ts=0; default: agora
+        self.origin = time.perf_counter() if origin is None else origin
+        self.pid = os.getpid()
+        self.events: List[Dict] = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0, "args": {"name": process_name}},
+        ]
+        self._threads: Dict[int, bool] = {}
+
+    def _tid(self) -> int:
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = True
+            self.events.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+                                "args": {"name": threading.current_thread().name}})
+        return tid
+
+    def complete(self, name: str, cat: str, start: float, end: float, args: Optional[Dict] = None) -> None:
+        """Intervalo [start, end] em segundos de `time.perf_counter()`."""
+        ev = {"name": name, "cat": cat, "ph": "X", "pid": self.pid, "tid": self._tid(),
+              "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6}
+        if args:
+            ev["args"] = args
+        self.events.append(ev)
+
+    def instant(self, name: str, cat: str, args: Optional[Dict] = None) -> None:
+        ev = {"name": name, "cat": cat, "ph": "i", "s": "t", "pid": self.pid, "tid": self._tid(),
+              "ts": (time.perf_counter() - self.origin) * 1e6}
+        if args:
+            ev["args"] = args
+        self.events.append(ev)
+
+    @contextmanager
+    def span(self, name: str, cat: str = "vm", **args) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.complete(name, cat, t0, time.perf_counter(), args or None)
+
+    def to_dict(self) -> Dict:
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+def trace_invocations(interp, tracer: Tracer, min_duration_s: float = 0.0):
+    """
+    Registra no `tracer` as invocações Java que durarem pelo menos
+    `min_duration_s` (via hooks method_entry/method_exit). Devolve uma função
+    que remove os hooks.
+    """
+    starts: List[float] = []
+    clock = time.perf_counter
+
+    def on_entry(rc, code, frame) -> None:
+        starts.append(clock())
+
+    def on_exit(rc, code, result, exc) -> None:
+        end = clock()
+        t0 = starts.pop()
+        if end - t0 >= min_duration_s:
+            tracer.complete(rc.method_label(code), "java", t0, end,
+                            {"exception": type(exc).__name__} if exc is not None else None)
+
+    interp.add_hook("method_entry", on_entry)
+    interp.add_hook("method_exit", on_exit)
+
+    def remove() -> None:
+        interp.remove_hook("method_entry", on_entry)
+        interp.remove_hook("method_exit", on_exit)
+    return remove